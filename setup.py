@@ -5,6 +5,7 @@ setup(name='tec',
       author='Joshua Ryan Smith',
       author_email='joshua.r.smith@gmail.com',
       packages=['tec','tec/models'],
+      package_data={'tec/models': ['kleynen_langmuir.dat']},
       url='https://github.com/jrsmith3/tec',
       description='A python package for simulating vacuum thermionic energy conversion devices.',
       install_requires=[
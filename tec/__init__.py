@@ -8,4 +8,5 @@ Base Library (:mod:`tec`)
 """
 
 from base import *
+from ensemble import ElectrodeArray, TECArray
 import models
@@ -1,7 +1,6 @@
+import functools
 import numpy as np
-from scipy import interpolate, optimize
-import matplotlib.pyplot as plt
-import matplotlib
+from scipy import interpolate, optimize, special
 
 physical_constants = {"boltzmann": 1.3806488e-23,
                       "permittivity0": 8.85418781762e-12,
@@ -10,6 +9,58 @@ physical_constants = {"boltzmann": 1.3806488e-23,
                       "sigma0": 5.67050e-8}
 
 
+def memoized(*params):
+  """
+  Decorator caching the value of a method which takes no arguments until a parameter it depends on changes.
+
+  :param params: Names of the Electrode parameters the value depends on, e.g. "temp". For methods of :class:`TECBase` a change to the parameter of either Electrode counts.
+
+  The value is stored under the name of the method in the :class:`DerivedCache` returned by the object's get_derived() method.
+  """
+  depends_on = frozenset(params)
+  def decorator(calculator):
+    name = calculator.__name__
+    @functools.wraps(calculator)
+    def wrapper(self):
+      derived = self.get_derived()
+      if name not in derived:
+        derived.store(name, calculator(self), depends_on)
+      return derived[name]
+    return wrapper
+  return decorator
+
+class DerivedCache(dict):
+  """
+  Dictionary of memoized values keyed on the names of the methods which calculate them; see :func:`memoized`.
+
+  Each item remembers the parameters it depends on, and :meth:`invalidate` discards exactly the items which depend on a changed parameter.
+  """
+  def __init__(self):
+    dict.__init__(self)
+    self.depends_on = {}
+
+  def store(self, key, item, depends_on):
+    """
+    Store item under key, noting the names of the parameters it depends on.
+    """
+    self[key] = item
+    self.depends_on[key] = depends_on
+
+  def invalidate(self, changed):
+    """
+    Discard the items depending on any of the parameters named in changed.
+    """
+    for key in [key for key, params in self.depends_on.items() if not params.isdisjoint(changed)]:
+      del self[key]
+      del self.depends_on[key]
+
+  def clear(self):
+    """
+    Discard every item.
+    """
+    dict.clear(self)
+    self.depends_on.clear()
+
 class Electrode(dict):
   """
   Thermionic electrode.
@@ -39,6 +90,13 @@ class Electrode(dict):
   The user can set either temp or richardson equal to zero to "switch off" the 
   electrode -- the :meth:`calc_saturation_current_density` method will return a value 
   of zero in either case.
+
+  The values of the calc_* methods are memoized in the "derived" attribute, a
+  :class:`DerivedCache`, and recalculated only after a parameter they depend on
+  is set.
+
+  An Electrode belonging to a :class:`TECBase` has that object as its "owner"
+  attribute and tells it when a parameter changes; otherwise owner is None.
                                            
   Example:
 
@@ -57,6 +115,9 @@ class Electrode(dict):
    'temp': 1000.0,
    'voltage': 0.0}
   """
+
+  # Parameters which affect motive.
+  motive_params = ("temp","richardson","barrier","voltage","position","nea")
   
   def __init__(self,input_params):
     # Ensure input_params is of type dict.
@@ -76,57 +137,76 @@ class Electrode(dict):
     if "nea" in input_param_keys:
       req_fields.append("nea")
 
+    self.__changed_params = set()
+    self.derived = DerivedCache()
+    self.owner = None
+
     # Try to set the object's attributes:
     for key in req_fields:
       self[key] = input_params[key]
-      
-    self.__param_changed = False
 
   
   def __setitem__(self,key,item):
     """
     Sets attribute values according to constraints.
     """
+    for key, item in self.checked_params({key:item}):
+      self.set_si_value(key, item)
 
-    # Check to see if the argument is numeric.
-    try:
-      item = float(item)
-    except ValueError:
-      raise TypeError("Argument must be of real numeric type.")
-    
-    # Check to see if constraints are met.
-    if key == "temp" and item < 0:
-      raise ValueError("temp must be greater than or equal to zero.")
-    if key == "barrier" and item < 0:
-      raise ValueError("barrier must be non-negative.")
-    if key == "richardson" and item < 0:
-      raise ValueError("richardson must be non-negative.")
-    if key == "emissivity" and not (0 < item < 1):
-      raise ValueError("emissivity must be between 0 and 1.")
-    if key == "nea" and item < 0:
-      raise ValueError("nea must be non-negative.")
-    
-    # Convert the pertinant values to SI:
-    if key is "barrier":
-      # Update to J
-      item = 1.60217646e-19 * item
-    if key is "nea":
-      # Update to J
-      item = 1.60217646e-19 * item
-    if key is "position":
-      # Update to m
-      item = 1e-6 * item
-    if key is "richardson":
-      # Update to A m^{-2} K^{-2}
-      item = 1e4 * item
-      
-    # Check to see if the Electrode already has the attribute set. If so, add the flag.
-    if key in ["temp","richardson","barrier","voltage","position","nea"]:
-      if key in self.keys():
-        self.__param_changed = True
+  def update(self, params):
+    """
+    Set several parameters at once.
+
+    :param dict params: Maps parameter names to values in the units listed above.
+
+    Every value is checked against its constraints before any is set, so if one raises an exception the Electrode is left unchanged.
+    """
+    for key, item in self.checked_params(params):
+      self.set_si_value(key, item)
+
+  def checked_params(self, params):
+    """
+    Check parameter values against their constraints and return a list of (key, value) pairs in SI units.
+
+    :param dict params: Maps parameter names to values in the units listed above.
+    """
+    converted = []
+    for key, item in params.items():
+      # Check to see if the argument is numeric.
+      try:
+        item = float(item)
+      except ValueError:
+        raise TypeError("Argument must be of real numeric type.")
+      converted.append((key, electrode_param_to_si(key, item)))
+    return converted
+
+  def set_si_value(self, key, item):
+    """
+    Set a parameter from a value already in SI units, without checking it.
+
+    Like :meth:`__setitem__`, the change is recorded, the owner is notified and the memoized values depending on the parameter are discarded. Used to put back values previously read from the Electrode.
+    """
+    # Check to see if the Electrode already has the attribute set. If so, record that it changed and tell the owner.
+    if key in self.motive_params or key == "emissivity":
+      if key in self:
+        self.__changed_params.add(key)
+        if self.owner is not None:
+          self.owner.params_changed = True
+    self.derived.invalidate([key])
       
     # Set value.
     dict.__setitem__(self,key,item)
+
+  def __delitem__(self,key):
+    """
+    Delete a parameter, discarding the memoized values which depend on it.
+
+    Like adding a parameter, removing one is not recorded as a change.
+    """
+    self.derived.invalidate([key])
+    if self.owner is not None:
+      self.owner.derived.invalidate([key])
+    dict.__delitem__(self,key)
     
   def param_changed_and_reset(self):
     """
@@ -134,13 +214,22 @@ class Electrode(dict):
 
     Parameters which affect motive are temp, barrier, voltage, position, richardson, and nea.
     """
-    if self.__param_changed:
-      self.__param_changed = False
-      return True
-    else:
-      return False
+    return len(self.changed_params_and_reset()) > 0
+
+  def changed_params_and_reset(self, params = motive_params):
+    """
+    Return the set of parameters changed since the last call, and reset it.
+
+    :param params: Names of the parameters to report; by default those affecting motive (see :meth:`param_changed_and_reset`). Changes to emissivity are only reported if it is named, but are reset all the same.
+    """
+    if not self.__changed_params:
+      return set()
+    changed = self.__changed_params
+    self.__changed_params = set()
+    return changed.intersection(params)
   
   # Methods
+  @memoized("temp","richardson","barrier")
   def calc_saturation_current_density(self):
     """
     Saturation current in A m^{-2} calculated according to Richardson-Dushman.
@@ -155,6 +244,7 @@ class Electrode(dict):
     
     return saturation_current
 
+  @memoized("barrier","nea")
   def calc_vacuum_energy(self):
     """
     Position of the vacuum energy relative to Fermi energy in J.
@@ -169,20 +259,83 @@ class Electrode(dict):
     else:
       return self["barrier"]
       
+  @memoized("barrier","voltage")
   def calc_barrier_ht(self):
     """
     Value of barrier height in J relative to ground.
     """
     return self["barrier"] + physical_constants["electron_charge"] * self["voltage"]
       
+  @memoized("barrier","nea","voltage")
   def calc_motive_bc(self):
     """
     Motive boundary condition in J relative to ground.
     """
     return self.calc_vacuum_energy() + \
       physical_constants["electron_charge"] * self["voltage"]
+
+  def get_derived(self):
+    """
+    Return the :class:`DerivedCache` of memoized values.
+    """
+    return self.derived
+
+  def __reduce__(self):
+    """
+    Pickle only the parameters; the memoized values, the record of changes and the owner are dropped.
+    """
+    return (electrode_from_si, (dict(self),))
+
+def electrode_from_si(params):
+  """
+  Return an Electrode whose parameters are the items of params, already in SI units and not checked again.
+
+  Used to unpickle Electrodes and to rebuild them from values previously read from an Electrode.
+  """
+  El = Electrode.__new__(Electrode)
+  El._Electrode__changed_params = set()
+  El.derived = DerivedCache()
+  El.owner = None
+  dict.update(El, params)
+  return El
     
 
+def electrode_param_to_si(key, item):
+  """
+  Check an Electrode parameter against its constraints and convert it to SI units.
+
+  :param str key: Name of the parameter, e.g. "barrier".
+  :param item: Value in the units listed in :class:`Electrode`. Can be a float or numpy array; the constraints must hold for every element.
+  :returns: The value in SI units.
+  """
+  # Check to see if constraints are met.
+  if key == "temp" and np.any(item < 0):
+    raise ValueError("temp must be greater than or equal to zero.")
+  if key == "barrier" and np.any(item < 0):
+    raise ValueError("barrier must be non-negative.")
+  if key == "richardson" and np.any(item < 0):
+    raise ValueError("richardson must be non-negative.")
+  if key == "emissivity" and not np.all((0 < item) & (item < 1)):
+    raise ValueError("emissivity must be between 0 and 1.")
+  if key == "nea" and np.any(item < 0):
+    raise ValueError("nea must be non-negative.")
+  
+  # Convert the pertinant values to SI:
+  if key == "barrier":
+    # Update to J
+    item = 1.60217646e-19 * item
+  if key == "nea":
+    # Update to J
+    item = 1.60217646e-19 * item
+  if key == "position":
+    # Update to m
+    item = 1e-6 * item
+  if key == "richardson":
+    # Update to A m^{-2} K^{-2}
+    item = 1e4 * item
+
+  return item
+
 def max_value(calculator):
   """
   Decorator method to calculate the max value, etc. of the requested method.
@@ -236,6 +389,142 @@ def max_value(calculator):
 
   return wrapper
 
+class MotiveData(dict):
+  """
+  Dictionary of motive (meta)data whose items are calculated on first access.
+
+  :param owner: Object which calculates the items, usually a :class:`TECBase`.
+  :param dict calculators: Maps each key to the name of a method of owner which takes no arguments and returns that item.
+
+  Reading a missing key calls the corresponding method of owner, stores the result and returns it. Items are then cached like those of an ordinary dict until they are removed with :meth:`invalidate` or :meth:`clear`. Keys without a calculator raise KeyError as usual.
+
+  Note that membership tests, get(), keys(), etc. only see the items calculated so far.
+  """
+  def __init__(self, owner, calculators):
+    dict.__init__(self)
+    self.owner = owner
+    self.calculators = calculators
+
+  def __missing__(self, key):
+    """
+    Calculate, store and return the item for key.
+    """
+    if key not in self.calculators:
+      raise KeyError(key)
+    item = getattr(self.owner, self.calculators[key])()
+    self[key] = item
+    return item
+
+  def invalidate(self, keys):
+    """
+    Discard the cached items for keys so they are recalculated on next access.
+    """
+    for key in keys:
+      self.pop(key, None)
+
+def no_space_charge_current_density(emitter, collector, output_voltage):
+  """
+  Output current density in A m^{-2} of the TECBase model, vectorized over devices and voltages.
+
+  :param emitter: Mapping with keys "temp", "barrier", "richardson" and optionally "nea" in the SI units stored by :class:`Electrode`. An Electrode works, as does a dict of numpy arrays describing many devices.
+  :param collector: Mapping like emitter for the collector.
+  :param output_voltage: Output voltage [V]; broadcast against the electrode parameters.
+
+  Relative to the emitter Fermi level the maximum motive is the greater of the two vacuum levels. Forward emission is therefore saturated until the output voltage lifts the collector vacuum level past the emitter barrier, and back emission until the output voltage lowers the collector barrier past the emitter vacuum level. Beyond those knees each falls off with the Boltzmann factor of its emitting electrode.
+  """
+  em_sat, co_sat, forward_knee, back_knee = _no_space_charge_params(emitter, collector)
+  shift = physical_constants["electron_charge"] * np.asarray(output_voltage, dtype=float)
+
+  with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+    forward = np.where(em_sat > 0, em_sat * np.exp(-np.maximum(0, shift - forward_knee) / \
+      (physical_constants["boltzmann"] * emitter["temp"])), 0)
+    back = np.where(co_sat > 0, co_sat * np.exp(-np.maximum(0, back_knee - shift) / \
+      (physical_constants["boltzmann"] * collector["temp"])), 0)
+
+  return forward - back
+
+def max_power_pt(emitter, collector, numeric = False):
+  """
+  Maximum power point of the TECBase model, vectorized over devices.
+
+  :param emitter: Mapping with keys "temp", "barrier", "richardson" and optionally "nea" in the SI units stored by :class:`Electrode`, e.g. a dict of numpy arrays.
+  :param collector: Mapping like emitter for the collector.
+  :param bool numeric: If True, maximize :func:`no_space_charge_current_density` times voltage with fminbound one device at a time instead. Useful for verification.
+  :returns: Dictionary with keys "output_voltage" [V], "output_current_density" [A m^-2] and "output_power_density" [W m^-2], each an array broadcast over the inputs.
+
+  The output voltage is restricted to the range searched by :func:`max_value`, from 0 to the sum of the barriers. Between the back and forward knees (see :func:`no_space_charge_current_density`) both currents are saturated and the power rises linearly. Below the back knee the power is greatest where J_E = J_C (1 + eV/kT_C) exp((eV - s_b)/kT_C), and above the forward knee where J_E (1 - eV/kT_E) exp(-(eV - s_f)/kT_E) = J_C. Both stationary points are Lambert W expressions. Each is clipped to its region, and the best of these and the forward knee is returned.
+  """
+  em_sat, co_sat, forward_knee, back_knee = _no_space_charge_params(emitter, collector)
+  kT_em = physical_constants["boltzmann"] * np.asarray(emitter["temp"], dtype=float)
+  kT_co = physical_constants["boltzmann"] * np.asarray(collector["temp"], dtype=float)
+  e = physical_constants["electron_charge"]
+  em_sat, co_sat, forward_knee, back_knee, kT_em, kT_co = \
+    np.broadcast_arrays(em_sat, co_sat, forward_knee, back_knee, kT_em, kT_co)
+  hi = (np.asarray(emitter["barrier"]) + np.asarray(collector["barrier"])) / e
+  hi = np.broadcast_to(hi, em_sat.shape)
+
+  if numeric:
+    output_voltage = np.empty(em_sat.shape)
+    for indx in np.ndindex(em_sat.shape):
+      em = dict((key, np.broadcast_to(emitter[key], em_sat.shape)[indx]) for key in emitter)
+      co = dict((key, np.broadcast_to(collector[key], em_sat.shape)[indx]) for key in collector)
+      output_voltage[indx] = optimize.fminbound( \
+        lambda v: -v * no_space_charge_current_density(em, co, v), 0, hi[indx], xtol=1e-9)
+  else:
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+      # Below the back knee. z = 1 + eV/kT_C solves z exp(z) = J_E/J_C exp(1 + s_b/kT_C).
+      z = _lambertw_exp(np.log(em_sat) - np.log(co_sat) + 1 + back_knee/kT_co)
+      back_voltage = np.where(co_sat > 0, (z - 1) * kT_co / e, np.inf)
+      # Above the forward knee. y = 1 - eV/kT_E solves y exp(y) = J_C/J_E exp(1 - s_f/kT_E).
+      y = _lambertw_exp(np.log(co_sat) - np.log(em_sat) + 1 - forward_knee/kT_em)
+      forward_voltage = np.where(em_sat > 0, (1 - y) * kT_em / e, -np.inf)
+
+    candidates = np.array([np.minimum(back_voltage, back_knee/e),
+                           forward_knee/e,
+                           np.maximum(forward_voltage, forward_knee/e)])
+    candidates = np.clip(candidates, 0, hi)
+    power = candidates * no_space_charge_current_density(emitter, collector, candidates)
+    best = np.argmax(power, axis=0)
+    output_voltage = np.choose(best, candidates)
+
+  output_current_density = no_space_charge_current_density(emitter, collector, output_voltage)
+  return {"output_voltage":output_voltage,
+          "output_current_density":output_current_density,
+          "output_power_density":output_voltage * output_current_density}
+
+def _no_space_charge_params(emitter, collector):
+  """
+  Saturation current densities and the forward and back knee energies in J.
+  """
+  def saturation_current_density(el):
+    temp = np.asarray(el["temp"], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+      return np.where(temp > 0, el["richardson"] * temp**2 * \
+        np.exp(-el["barrier"]/(physical_constants["boltzmann"] * temp)), 0)
+
+  em_vacuum = np.asarray(emitter["barrier"]) - emitter.get("nea", 0)
+  co_vacuum = np.asarray(collector["barrier"]) - collector.get("nea", 0)
+
+  return saturation_current_density(emitter), saturation_current_density(collector), \
+    emitter["barrier"] - co_vacuum, em_vacuum - collector["barrier"]
+
+def _lambertw_exp(log_x):
+  """
+  Principal branch of the Lambert W function of exp(log_x), without overflow.
+  """
+  log_x = np.asarray(log_x, dtype=float)
+  small = log_x < 700
+  with np.errstate(over="ignore", invalid="ignore"):
+    # W(x) = x to double precision for tiny x, where lambertw is unreliable.
+    w = np.where(log_x < -700, np.exp(log_x), \
+      special.lambertw(np.exp(np.clip(log_x, -700, 700))).real)
+    # w + log(w) = log_x for large arguments; Newton's method from the asymptote.
+    big = np.where(small, 1000, log_x)
+    wb = big - np.log(big)
+    for i in range(4):
+      wb = wb - (wb + np.log(wb) - big) / (1 + 1/wb)
+  return np.where(small, w, wb)
+
 class TECBase(dict):
   """
   Base thermionic engine class.
@@ -256,6 +545,8 @@ class TECBase(dict):
   * position_array: A two-element array containing the values of position corresponding to the values in motive_array.
   * motive_interp: A scipy.interpolate.interp1d object that interpolates the two arrays described above used in the class's convenience methods.
 
+  Setting a parameter of either Electrode sets the "params_changed" attribute, and the next read of an item or memoized value collects the changes; see :meth:`collect_changes`. The current, power, heat transport and efficiency methods are memoized (see :func:`memoized`), so an efficiency query calculates each of them at most once until a parameter they depend on changes. The values are kept in the "derived" attribute, a :class:`DerivedCache` which is not one of the dictionary items.
+
   Examples
   --------
   >>> em_dict = {"temp":1000,
@@ -277,6 +568,9 @@ class TECBase(dict):
   ------------
   [1] "Thermionic Energy Conversion, Vol. I." Hatsopoulous and Gyftopoulous. p. 48.
   """
+
+  # Attributes which choose how the model calculates, such as its backend. Those set on an object are pickled with its Electrode parameters; see __getstate__.
+  pickled_settings = ()
   
   def __init__(self,input_params):
     # is input_params a dict?
@@ -290,6 +584,8 @@ class TECBase(dict):
     if not set(req_fields).issubset(input_param_keys):
       raise KeyError("Input dict is missing one or more keys.")
     
+    self.init_bookkeeping()
+
     # Try to set the object's attributes:
     for key in req_fields:
       self[key] = input_params[key]
@@ -305,6 +601,8 @@ class TECBase(dict):
     # its not worth proceeding.
     if key in ["Emitter","Collector"]:
       item = Electrode(item)
+      item.owner = self
+      self.derived.clear()
     
     # Set value.
     dict.__setitem__(self,key,item)
@@ -313,21 +611,101 @@ class TECBase(dict):
     """
     Return attribute, recalculating motive_data if necessary.
     """
-    
-    # By the time we are calling this method, the object has been instantiated. Therefore it has all of the necessary attributes (Emitter, Collector, motive_data). It is possible that one of the Electrodes' data has changed in such a way that it is no longer consistant with motive_data. The Electrode already knows it has changed because it now has an item called, "param_changed". At this point all I have to do is look for that attribute in both Electrodes, delete it, delete "motive_data" and then call calc_motive().
-    
+    # The Electrodes set params_changed when one of their parameters changes, so on a clean object this is a plain lookup.
+    if self.params_changed:
+      self.collect_changes()
+    return dict.__getitem__(self,key)
+
+  def collect_changes(self):
+    """
+    Bring 'motive_data' and the memoized values up to date with the Electrodes.
+    """
+    # By the time we are calling this method, the object has been instantiated. Therefore it has all of the necessary attributes (Emitter, Collector, motive_data). It is possible that one of the Electrodes' data has changed in such a way that it is no longer consistant with motive_data. The Electrode already knows which of its parameters have changed. At this point all I have to do is collect those changes from both Electrodes and hand them to update_motive().
+    self.params_changed = False
+    changed = set()
     for el in ["Emitter","Collector"]:
       El = dict.__getitem__(self,el)
-      if El.param_changed_and_reset():
-        del self["motive_data"]
-        self.calc_motive()
-      
-    return dict.__getitem__(self,key)
+      changed |= El.changed_params_and_reset(Electrode.motive_params + ("emissivity",))
+
+    if changed:
+      self.derived.invalidate(changed)
+      changed.intersection_update(Electrode.motive_params)
+      if changed:
+        self.update_motive(changed)
+
+  def get_derived(self):
+    """
+    Return the :class:`DerivedCache` of memoized values, up to date with the Electrodes.
+    """
+    if self.params_changed:
+      self.collect_changes()
+    return self.derived
+
+  def update(self, params):
+    """
+    Set parameters of both Electrodes at once.
+
+    :param dict params: Keyed like the input dict, e.g. {"Emitter":{"temp":1200}, "Collector":{"voltage":0.3, "position":5}}, with values in the units :class:`Electrode` takes.
+
+    Every value is checked before any is set, so if one fails its constraints the object is left unchanged. The changes are collected together on the next read, so 'motive_data' is brought up to date once, by a single call to :meth:`update_motive`.
+    """
+    if not set(params).issubset(["Emitter","Collector"]):
+      raise KeyError("Only Emitter and Collector parameters can be updated.")
+
+    # Check everything before setting anything.
+    converted = [(dict.__getitem__(self,el), dict.__getitem__(self,el).checked_params(params[el])) \
+      for el in params]
+    for El, items in converted:
+      for key, item in items:
+        El.set_si_value(key, item)
+
+  def __reduce__(self):
+    """
+    Pickle the Electrode parameters in SI units and the state given by :meth:`__getstate__`.
+    """
+    electrodes = dict((el, dict(self[el])) for el in ["Emitter","Collector"])
+    return (tec_from_si, (self.__class__, electrodes), self.__getstate__())
+
+  def __getstate__(self):
+    """
+    State for pickling: the attributes named in pickled_settings which are set on the object.
+
+    The memoized values, 'motive_data' and the bookkeeping of :meth:`init_bookkeeping` are not pickled.
+    """
+    return dict((name, self.__dict__[name]) for name in self.pickled_settings \
+      if name in self.__dict__)
+
+  def __setstate__(self, state):
+    """
+    Restore the settings from :meth:`__getstate__` and rebuild 'motive_data' with :meth:`calc_motive`.
+    """
+    self.__dict__.update(state)
+    self.calc_motive()
+
+  def init_bookkeeping(self):
+    """
+    Set up the state an object keeps between calculations: the memoized values and the flag of pending changes.
+
+    Called on instantiation and on unpickling. Models keeping more bookkeeping extend this method.
+    """
+    self.derived = DerivedCache()
+    self.params_changed = False
   
   # Methods regarding motive --------------------------------------------------
   def calc_motive(self):
     """
     Calculates the motive (meta)data and populates the 'motive_data' attribute.
+
+    Every memoized value is discarded first (see :meth:`clear_derived`), so this also brings the object up to date after a change of settings other than the Electrode parameters, such as the backend of a model.
+    """
+    self.clear_derived()
+    self.build_motive_data()
+
+  def build_motive_data(self):
+    """
+    Populate the 'motive_data' attribute, keeping the memoized values.
+
+    Subclasses override this method rather than :meth:`calc_motive`.
     """
     motive_array = np.array([self["Emitter"].calc_motive_bc(), \
       self["Collector"].calc_motive_bc()])
@@ -339,6 +717,27 @@ class TECBase(dict):
                            "position_array":position_array, \
                            "motive_interp":motive_interp}
 
+  def update_motive(self, changed):
+    """
+    Bring 'motive_data' up to date after Electrode parameters have changed.
+
+    :param set changed: Names of the Electrode parameters which changed, e.g. set(["voltage"]).
+
+    This implementation recalculates everything in 'motive_data'. The memoized values depending on the changed parameters have already been discarded, so the others are kept. Subclasses whose motive data has parts that do not depend on every parameter override this method to recalculate only what is needed.
+    """
+    del self["motive_data"]
+    self.build_motive_data()
+
+  def clear_derived(self):
+    """
+    Discard the memoized values of this object and of both Electrodes.
+
+    Called by :meth:`calc_motive`, since a value memoized before it was called may depend on settings other than the Electrode parameters, such as the backend of a model. Changes of the Electrode parameters only discard the values depending on them.
+    """
+    self.derived.clear()
+    for el in ["Emitter","Collector"]:
+      dict.__getitem__(self,el).derived.clear()
+
   def get_motive(self, position):
     """
     Value of motive relative to ground for given value(s) of position in J.
@@ -388,6 +787,7 @@ class TECBase(dict):
     
     
   # Methods regarding current and power ---------------------------------------
+  @memoized(*Electrode.motive_params)
   def calc_forward_current_density(self):
     """
     Forward current density in A m^{-2}.
@@ -400,6 +800,7 @@ class TECBase(dict):
       return self["Emitter"].calc_saturation_current_density() * \
 	np.exp(-barrier/(physical_constants["boltzmann"]*self["Emitter"]["temp"]))
   
+  @memoized(*Electrode.motive_params)
   def calc_back_current_density(self):
     """
     Back current density in A m^{-2}.
@@ -413,6 +814,7 @@ class TECBase(dict):
 	np.exp(-barrier/(physical_constants["boltzmann"]*self["Collector"]["temp"]))
   
   
+  @memoized(*Electrode.motive_params)
   def calc_output_current_density(self):
     """
     Net current density flowing across device in A m^{-2}.
@@ -421,12 +823,83 @@ class TECBase(dict):
       self.calc_back_current_density()
   
   @max_value
+  @memoized(*Electrode.motive_params)
   def calc_output_power_density(self):
     """
     Return output power density in W m^{-2}.
     """
     return self.calc_output_current_density() * self.calc_output_voltage()
   
+  def calc_max_power_pt(self):
+    """
+    Operating point at which the output power density is greatest.
+
+    :returns: Dictionary with keys "output_voltage" [V], "output_current_density" [A m^-2], "output_power_density" [W m^-2] and "total_efficiency" at the maximum power point.
+
+    The maximum is located by :meth:`locate_max_power_pt` without changing the object. The Collector voltage is then set once to evaluate the efficiency and put back, even if that raises an exception.
+    """
+    output_voltage, output_current_density = self.locate_max_power_pt()
+
+    saved_voltage = self["Collector"]["voltage"]
+    try:
+      self["Collector"]["voltage"] = self["Emitter"]["voltage"] + output_voltage
+      total_efficiency = self.calc_total_efficiency()
+    finally:
+      self["Collector"]["voltage"] = saved_voltage
+
+    return {"output_voltage":output_voltage,
+            "output_current_density":output_current_density,
+            "output_power_density":output_voltage * output_current_density,
+            "total_efficiency":total_efficiency}
+
+  def locate_max_power_pt(self, numeric = False):
+    """
+    Output voltage [V] and output current density [A m^-2] at maximum output power.
+
+    :param bool numeric: If True, search numerically instead of using the closed form solution.
+
+    In this model the output current density is an explicit function of the output voltage, so the maximum has a closed form; see :func:`max_power_pt`.
+    """
+    max_power = max_power_pt(self["Emitter"], self["Collector"], numeric)
+    return float(max_power["output_voltage"]), float(max_power["output_current_density"])
+
+  def calc_sweep(self, path, quantities = ("calc_output_current_density", "calc_output_power_density")):
+    """
+    Walk the object through a sequence of parameter values, evaluating quantities at each step.
+
+    :param dict path: Keyed like the input dict, e.g. {"Collector":{"voltage":[0, 0.1, 0.2]}}. Each value is a sequence of parameter values in the units Electrode takes; scalars are broadcast against the sequences.
+    :param quantities: Names of methods of the object which take no arguments and return a float, e.g. "calc_total_efficiency" or "get_max_motive_ht".
+    :returns: Dictionary keyed on the names in quantities; each value is an array of the results along the path.
+
+    The swept parameters are put back afterwards. :meth:`start_sweep_point` is called after the parameters of each step are set.
+    """
+    params = [(el, key) for el in sorted(path) for key in sorted(path[el])]
+    values = np.broadcast_arrays(*[np.atleast_1d(path[el][key]) for el, key in params])
+    # Electrode converts some parameters to SI units, so the saved values are put back in SI units.
+    saved = dict((el, dict(self[el])) for el in ["Emitter","Collector"])
+
+    results = dict((name, np.empty(values[0].size)) for name in quantities)
+    try:
+      for indx in range(values[0].size):
+        for (el, key), value in zip(params, values):
+          self[el][key] = value.flat[indx]
+        self.start_sweep_point()
+        for name in quantities:
+          results[name][indx] = getattr(self, name)()
+    finally:
+      for el, key in params:
+        self[el].set_si_value(key, saved[el][key])
+
+    return dict((name, result.reshape(values[0].shape)) for name, result in results.items())
+
+  def start_sweep_point(self):
+    """
+    Hook called by :meth:`calc_sweep` at each step, after the swept parameters are set.
+
+    Does nothing here; models which solve for their motive can use it to seed their solvers from the previous steps.
+    """
+    pass
+
   # This method needs work: voltage/current density is not resistance
   def calc_load_resistance(self):
     """
@@ -449,6 +922,7 @@ class TECBase(dict):
     """
     return 1 - (self["Collector"]["temp"]/self["Emitter"]["temp"])
   
+  @memoized("emissivity", *Electrode.motive_params)
   def calc_radiation_efficiency(self):
     """
     Efficiency considering only blackbody heat transport in range 0 to 1.
@@ -460,6 +934,7 @@ class TECBase(dict):
     else:
       return np.nan
   
+  @memoized(*Electrode.motive_params)
   def calc_electronic_efficiency(self):
     """
     Efficiency considering only electronic heat transport in range 0 to 1.
@@ -472,6 +947,7 @@ class TECBase(dict):
       return np.nan
   
   @max_value
+  @memoized("emissivity", *Electrode.motive_params)
   def calc_total_efficiency(self):
     """
     Return total efficiency considering all heat transport mechanisms.
@@ -485,6 +961,7 @@ class TECBase(dict):
     else:
       return np.nan
 
+  @memoized(*Electrode.motive_params)
   def __calc_electronic_heat_transport(self):
     """
     Returns the electronic heat transport of a TECBase object.
@@ -499,6 +976,7 @@ class TECBase(dict):
       physical_constants["electron_charge"]
     return elecHeatTransportForward - elecHeatTransportBackward
   
+  @memoized("temp","emissivity")
   def __calc_black_body_heat_transport(self):
     """
     Returns the radiation transport of a TECBase object.
@@ -509,189 +987,77 @@ class TECBase(dict):
       (self["Emitter"]["temp"]**4 - self["Collector"]["temp"]**4) / \
       ((1./self["Emitter"]["emissivity"]) + (1./self["Collector"]["emissivity"]) - 1)
 
+  # Methods regarding plotting; matplotlib is imported on first use ------------
   def plot_motive(self, axl = None, show = False, fontsize = False, output_voltage = False):
     """
-    Plot an annotated motive diagram relative to ground.
-
-    :param axl: :class:`matplotlib.Axes` object on which to draw motive diagram. None results in a new figure with a subplot(111) as the location to draw the motive diagram.
-    :param bool show: If True, :meth:`pyplot.show()` the result.
-    :param int fontsize: Annotation font size.
+    Plot an annotated motive diagram relative to ground; see :func:`tec.plotting.plot_motive`.
     """
-
-    if axl == None:
-      fig = plt.figure()
-      axl = fig.add_subplot(111)
-    else:
-      fig = plt.gcf()
-
-    # Create the axes object for the collector barrier visualization.
-    axr = fig.add_axes(axl.get_position())
-
-    # Generate the position and corresponding motive values.
-    pos = np.linspace(self["Emitter"]["position"],self["Collector"]["position"],100)
-    mot = self.get_motive(pos) / physical_constants["electron_charge"]
-
-    # Plot all the items on the emitter-side axes.
-    axl.plot(pos,mot,"k")
-
-    # Work out the x-interval.
-    x_interval = self["Collector"]["position"] - self["Emitter"]["position"]
-
-    # maximum motive
-    plt.plot(self.get_max_motive_ht(with_position=True), self.get_max_motive_ht() / physical_constants["electron_charge"], 'k+')
-    plt.annotate("$\psi_{m}$", 
-      xytext = (1.1 * self.get_max_motive_ht(with_position=True), 1.05 * self.get_max_motive_ht() / physical_constants["electron_charge"]),
-      xy = (self.get_max_motive_ht(with_position=True), self.get_max_motive_ht() / physical_constants["electron_charge"]))
-    
-    # labels and dimension lines
-    for el, factr in zip(["Emitter", "Collector"],[-1,1]):
-      if "nea" in self[el]:
-        nea = "$\chi_{" + el[0] + "}$"
-        self.dimension_line(nea, self[el]["position"] + (factr * 0.25 * x_interval), 
-          self[el].calc_motive_bc() / physical_constants["electron_charge"], 
-          self[el].calc_barrier_ht() / physical_constants["electron_charge"])
-        barrier = "$\zeta_{" + el[0] + "}$"
-        barrier_pos = 0.6
-      else:
-        barrier = "$\phi_{" + el[0] + "}$"
-        barrier_pos = 0.25
-      self.dimension_line(barrier,self[el]["position"] + \
-        (factr * barrier_pos * x_interval), 
-        self[el]["voltage"], 
-        self[el].calc_barrier_ht() / physical_constants["electron_charge"])
-
-      # Code for output voltage
-      if output_voltage:
-        if el == "Collector":
-          self.dimension_line("eV",self[el]["position"] + \
-            (factr * barrier_pos * x_interval), 
-            self["Emitter"]["voltage"], 
-            self[el]["voltage"])
-
-    self.barrier_artist(axl, "Emitter")
-    self.barrier_artist(axr, "Collector")
-
-    # x-scaling
-    xl_buffer = 0.25
-    xr_buffer = 0.6
-    xmin = self["Emitter"]["position"] - (xl_buffer * x_interval)
-    xmax = self["Collector"]["position"] + (xr_buffer * x_interval)
-    xlim = (xmin, xmax)
-
-    axl.set_xlim(xlim)
-    axr.set_xlim(xlim)
-
-    # y-scaling
-    y_lo = min([0, self["Emitter"]["voltage"], self["Collector"]["voltage"]])
-    y_hi = max([self["Emitter"].calc_barrier_ht() / \
-      physical_constants["electron_charge"], 
-      self["Collector"].calc_barrier_ht() / physical_constants["electron_charge"], 
-      self.get_max_motive_ht()])
-
-    axl.set_ylim([y_lo, 1.1 * y_hi])
-    axr.set_ylim([y_lo, 1.1 * y_hi])
-
-    # Set the fontsize of all the elements.
-    if fontsize:
-      axs = [axl, axr]
-
-      for ax in axs:
-        # Set fontsize of annotations
-        for child in ax.get_children():
-          if isinstance(child, matplotlib.text.Annotation):
-            child.set_fontsize(fontsize)
-          if isinstance(child, matplotlib.axis.YAxis):
-            for tick_label in child.get_majorticklabels():
-              tick_label.set_fontsize(fontsize)
-
-    if show:
-      plt.show()
+    from tec import plotting
+    plotting.plot_motive(self, axl, show, fontsize, output_voltage)
 
   def barrier_artist(self, ax, el):
     """
-    Helper method to properly draw barrier on the motive diagram using spines.
+    Helper method to properly draw barrier on the motive diagram; see :func:`tec.plotting.barrier_artist`.
     """
-    if el == "Emitter":
-      loc = "left"
-    else:
-      loc = "right"
-
-    # Initialize the axes borders, etc.
-    ax.xaxis.set(visible = False)
-    ax.spines["top"].set_color("none")
-    ax.spines["bottom"].set_color("none")
-    ax.spines["right"].set_color("none")
-    ax.spines["left"].set_color("none")
-    ax.patch.set_visible(False)
-
-    # Switch back on the appropriate spine.
-    ax.spines[loc].set_color("k")
-    ax.spines[loc].set_linewidth(0.25)
-
-    # Only have ticks on the proper side of the plot
-    ax.yaxis.set_ticks_position(loc)
-    ax.tick_params(direction = "outward")
-
-    # Draw the barrier of the electrode using the axes object's spines. Constrain it to the proper side of the motive curve.
-    # Fix the unit offset on the right
-    if el == "Collector":
-      x_loc = self[el]["position"] - 1
-    else:
-      x_loc = self[el]["position"]
-
-    ax.spines[loc].set_position(("data", x_loc))
-    ax.spines[loc].set_bounds(self[el]["voltage"], 
-      self[el].calc_barrier_ht() / physical_constants["electron_charge"])
-
-    # Set up ticks and labels for emitter.
-    ticks_labels = ["$\mu_{" + el[0] + "}$",
-              "$\psi_{" + el[0] + "}$",
-              "$\psi_{" + el[0] + ",CBM}$"]
-    if "nea" in self[el]:
-      ticks_loc = matplotlib.ticker.FixedLocator([self[el]["voltage"],
-        self[el].calc_motive_bc() / physical_constants["electron_charge"],
-        self[el].calc_barrier_ht() / physical_constants["electron_charge"]])
-    else:
-      del ticks_labels[-1]
-      ticks_loc = matplotlib.ticker.FixedLocator([self[el]["voltage"],
-        self[el].calc_barrier_ht() / physical_constants["electron_charge"]])
-
-    ticks_format = matplotlib.ticker.FixedFormatter(ticks_labels)
-
-    # Apply ticks to axes object
-    ax.yaxis.set_major_locator(ticks_loc)
-    ax.yaxis.set_major_formatter(ticks_format)
+    from tec import plotting
+    plotting.barrier_artist(self, ax, el)
 
   def dimension_line(self, label, x, y_lo, y_hi, label_loc = "mi", label_pos = "left"):
     """
-    Helper method to plot vertical dimension line on the motive diagram.
+    Helper method to plot vertical dimension line on the motive diagram; see :func:`tec.plotting.dimension_line`.
+    """
+    from tec import plotting
+    plotting.dimension_line(label, x, y_lo, y_hi, label_loc, label_pos)
 
-    :param dict label: Dict containing sub-dicts which can instantiate 
+def tec_from_si(model, electrodes):
+  """
+  Return an uninitialized object of model whose Electrodes are built by :func:`electrode_from_si`.
 
-    :param string label: Label for dimension line.
-    :param float x: Horizontal placement of dimension line.
-    :param float y_lo: Lower extent of dimension line.
-    :param float y_hi: Upper extent of dimension line.
-    :param str label_loc: Vertical placement of the label. Can be "lo" "mi" or "hi".
-    :param str label_pos: Which side of the dimension line the label is placed ("left" or "right").
-    """
-    ax = plt.gca()
+  Used to unpickle TECBase objects; the rest of the state is restored by :meth:`TECBase.__setstate__`.
+  """
+  tec = dict.__new__(model)
+  tec.init_bookkeeping()
+  for el in ["Emitter","Collector"]:
+    El = electrode_from_si(electrodes[el])
+    El.owner = tec
+    dict.__setitem__(tec, el, El)
+  return tec
 
-    # Figure out where the text should go.
-    if label_pos == "right":
-      ha = "right"
-    else:
-      ha = "left"
+def evaluate(model, params, quantities, cache = None):
+  """
+  Evaluate quantities of a device without touching any shared object.
 
-    if label_loc == "hi":
-      label_y = np.mean([y_lo, y_hi, y_hi, y_hi])
-    elif label_loc == "lo":
-      label_y = np.mean([y_lo, y_lo, y_lo, y_hi])
-    else:
-      label_y = np.mean([y_lo, y_hi])
+  :param model: Class of the model, e.g. :class:`TECBase` or :class:`tec.models.Langmuir`.
+  :param dict params: Input dict of the model, e.g. {"Emitter":{...}, "Collector":{...}}. It is not modified.
+  :param quantities: Sequence of the quantities to evaluate. Each is the name of a method of model, e.g. "calc_total_efficiency", or a tuple of the name followed by positional arguments, e.g. ("calc_output_power_density", "max").
+  :param dict cache: Optional dict of results shared between calls, keyed on the model, the Electrode parameters and the quantity. Quantities found in it are not evaluated again and new results are added to it.
+  :returns: Dictionary of the results keyed on the items of quantities.
+
+  A private model object is built from params and the quantities are evaluated on it in order, so methods which move the collector voltage while maximizing do not affect anything else. The only state shared between calls is the read-only solution of Langmuir's dimensionless Poisson's equation (see :func:`tec.models.langmuir.get_shared_dps`) and cache, so calls can run concurrently in threads.
+
+  Example, with param_list a list of input dicts:
+
+  >>> from multiprocessing.pool import ThreadPool
+  >>> from tec.models import Langmuir
+  >>> pool = ThreadPool(4)
+  >>> results = pool.map(lambda params: evaluate(Langmuir, params, ["calc_total_efficiency"]), param_list)
+  """
+  results = {}
+  if cache is not None:
+    key = (model,) + tuple((el, tuple(sorted(params[el].items()))) for el in ["Emitter","Collector"])
+    for quantity in quantities:
+      if key + (quantity,) in cache:
+        results[quantity] = cache[key + (quantity,)]
+
+  missing = [quantity for quantity in quantities if quantity not in results]
+  if missing:
+    device = model(params)
+    for quantity in missing:
+      if isinstance(quantity, tuple):
+        results[quantity] = getattr(device, quantity[0])(*quantity[1:])
+      else:
+        results[quantity] = getattr(device, quantity)()
+      if cache is not None:
+        cache[key + (quantity,)] = results[quantity]
 
-    # Write the text.
-    ax.annotate(label, xy = [x, y_lo], xytext = [x, label_y], ha = "center",
-      arrowprops = {"arrowstyle":"->", "linewidth":0.25})
-    ax.annotate(label, xy = [x, y_hi], xytext = [x, label_y], ha = "center",
-      arrowprops = {"arrowstyle":"->", "linewidth":0.25})
+  return results
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from base import physical_constants, electrode_param_to_si, max_power_pt
+
+class ElectrodeArray(dict):
+  """
+  Many thermionic electrodes stored as arrays.
+
+  An ElectrodeArray is instantiated like an :class:`tec.Electrode` except that each value can be a numpy array (or anything numpy.asarray accepts) describing one parameter of many electrodes. Values are checked elementwise against the same constraints as those of an Electrode, converted to SI units and stored as float arrays. Parameters of different shapes are broadcast against each other when used.
+
+  :param dict input_params: Initializing values for ElectrodeArray; see :class:`tec.Electrode` for keys, constraints and units.
+
+  Example:
+
+  >>> El = ElectrodeArray({"temp":[1000, 1200],
+  ...                      "barrier":1,
+  ...                      "voltage":0,
+  ...                      "position":0,
+  ...                      "richardson":10,
+  ...                      "emissivity":0.5})
+  >>> El.calc_saturation_current_density()
+  array([  912476.38133707, 9089650.51247135])
+  """
+
+  def __init__(self,input_params):
+    # Ensure input_params is of type dict.
+    if not isinstance(input_params,dict):
+      raise TypeError("Inputs must be of type dict.")
+
+    # Ensure that the minimum required fields are present in input_params.
+    req_fields = ["temp","barrier","voltage","position","richardson",\
+      "emissivity"]
+    input_param_keys = set(input_params.keys())
+
+    if not set(req_fields).issubset(input_param_keys):
+      missing_keys = set(req_fields) - input_param_keys
+      raise KeyError("Input dict is missing the following keys:" + \
+      str(list(missing_keys)))
+
+    if "nea" in input_param_keys:
+      req_fields.append("nea")
+
+    # Try to set the object's attributes:
+    for key in req_fields:
+      self[key] = input_params[key]
+
+  def __setitem__(self,key,item):
+    """
+    Sets attribute values according to constraints.
+    """
+    # Check to see if the argument is numeric.
+    try:
+      item = np.array(item, dtype=float)
+    except (TypeError, ValueError):
+      raise TypeError("Argument must be of real numeric type.")
+
+    dict.__setitem__(self,key,electrode_param_to_si(key, item))
+
+  # Methods
+  def calc_saturation_current_density(self):
+    """
+    Saturation current in A m^{-2} calculated according to Richardson-Dushman.
+
+    Elements where temp is 0 are 0.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+      return np.where(self["temp"] > 0, self["richardson"] * self["temp"]**2 * \
+        np.exp(-self["barrier"]/(physical_constants["boltzmann"] * self["temp"])), 0)
+
+  def calc_vacuum_energy(self):
+    """
+    Position of the vacuum energy relative to Fermi energy in J.
+    """
+    if "nea" in self.keys():
+      return self["barrier"] - self["nea"]
+    else:
+      return self["barrier"]
+
+  def calc_barrier_ht(self):
+    """
+    Value of barrier height in J relative to ground.
+    """
+    return self["barrier"] + physical_constants["electron_charge"] * self["voltage"]
+
+  def calc_motive_bc(self):
+    """
+    Motive boundary condition in J relative to ground.
+    """
+    return self.calc_vacuum_energy() + \
+      physical_constants["electron_charge"] * self["voltage"]
+
+
+class TECArray(dict):
+  """
+  Ensemble of thermionic energy converters evaluated with numpy.
+
+  A TECArray is instantiated like a :class:`tec.TECBase` except that "Emitter" and "Collector" initialize :class:`ElectrodeArray` objects, so each device parameter can be an array. Every calculator method returns an array broadcast over the devices, with the same meaning and units as the TECBase method of the same name. There is no per-access bookkeeping: quantities are computed from the current arrays each time they are requested.
+
+  The model is that of TECBase, which ignores space charge. Space charge models can plug in by overriding :meth:`get_max_motive_ht` (and :meth:`calc_back_current_density` and :meth:`_calc_back_current_density` where back emission is ignored); the current, power and efficiency methods are written in terms of those. Each of them calls get_max_motive_ht once and passes the result on, so a model with a costly maximum motive solves for it once per query.
+
+  :param dict input_params["Emitter"]: Initializes the emitter electrodes.
+  :param dict input_params["Collector"]: Initializes the collector electrodes.
+  """
+
+  def __init__(self,input_params):
+    # is input_params a dict?
+    if not isinstance(input_params,dict):
+      raise TypeError("Inputs must be of type dict.")
+
+    # Ensure that the required fields are present in input_params.
+    req_fields = ["Emitter","Collector"]
+    input_param_keys = set(input_params.keys())
+
+    if not set(req_fields).issubset(input_param_keys):
+      raise KeyError("Input dict is missing one or more keys.")
+
+    # Try to set the object's attributes:
+    for key in req_fields:
+      self[key] = input_params[key]
+
+  def __setitem__(self,key,item):
+    """
+    Sets attribute values according to ElectrodeArray constraints.
+    """
+    if key in ["Emitter","Collector"]:
+      item = ElectrodeArray(item)
+
+    dict.__setitem__(self,key,item)
+
+  def get_shape(self):
+    """
+    Shape of the ensemble, i.e. the broadcast shape of all of the electrode parameters.
+    """
+    return np.broadcast(*[self[el][key] for el in ["Emitter","Collector"] \
+      for key in self[el]]).shape
+
+  def get_max_motive_ht(self):
+    """
+    Value of the maximum motive relative to ground in J.
+    """
+    return np.maximum(self["Emitter"].calc_motive_bc(), self["Collector"].calc_motive_bc())
+
+  def calc_interelectrode_spacing(self):
+    """
+    Distance between the surfaces of the electrodes in m.
+    """
+    return self["Collector"]["position"] - self["Emitter"]["position"]
+
+  def calc_output_voltage(self):
+    """
+    Voltage difference between emitter and collector in V.
+    """
+    return self["Collector"]["voltage"] - self["Emitter"]["voltage"]
+
+  def calc_contact_potential(self):
+    """
+    Contact potential in V.
+    """
+    return (self["Emitter"]["barrier"] - \
+      self["Collector"]["barrier"])/physical_constants["electron_charge"]
+
+  # Methods regarding current and power ---------------------------------------
+  def calc_forward_current_density(self):
+    """
+    Forward current density in A m^{-2}.
+    """
+    return self.__calc_emitted_current_density(self["Emitter"], self.get_max_motive_ht())
+
+  def calc_back_current_density(self):
+    """
+    Back current density in A m^{-2}.
+    """
+    return self._calc_back_current_density(self.get_max_motive_ht())
+
+  def _calc_back_current_density(self, max_motive_ht):
+    """
+    Back current density in A m^{-2} given the maximum motive of each device in J.
+    """
+    return self.__calc_emitted_current_density(self["Collector"], max_motive_ht)
+
+  def calc_output_current_density(self):
+    """
+    Net current density flowing across device in A m^{-2}.
+    """
+    return self.__calc_output_current_density(self.get_max_motive_ht())
+
+  def calc_output_power_density(self):
+    """
+    Return output power density in W m^{-2}.
+    """
+    return self.__calc_output_current_density(self.get_max_motive_ht()) * \
+      self.calc_output_voltage()
+
+  def calc_max_power_pt(self):
+    """
+    Operating point of each device at which the output power density is greatest.
+
+    :returns: Dictionary with keys "output_voltage" [V], "output_current_density" [A m^-2], "output_power_density" [W m^-2] and "total_efficiency", each an array.
+
+    The maxima are located by :meth:`locate_max_power_pt`. The collector voltages are then set to evaluate the efficiency and put back, even if that raises an exception.
+    """
+    output_voltage, output_current_density = self.locate_max_power_pt()
+    max_power = {"output_voltage":output_voltage,
+                 "output_current_density":output_current_density,
+                 "output_power_density":output_voltage * output_current_density}
+
+    saved_voltage = self["Collector"]["voltage"]
+    try:
+      self["Collector"]["voltage"] = self["Emitter"]["voltage"] + output_voltage
+      max_power["total_efficiency"] = self.calc_total_efficiency()
+    finally:
+      self["Collector"]["voltage"] = saved_voltage
+
+    return max_power
+
+  def locate_max_power_pt(self):
+    """
+    Output voltage [V] and output current density [A m^-2] of each device at maximum output power, without changing the object.
+
+    Uses the closed form solution :func:`tec.max_power_pt` of the TECBase model. Subclasses implementing other models override this method.
+    """
+    max_power = max_power_pt(self["Emitter"], self["Collector"])
+    return max_power["output_voltage"], max_power["output_current_density"]
+
+  # Methods regarding efficiency ----------------------------------------------
+  def calc_carnot_efficiency(self):
+    """
+    Carnot efficiency in the range 0 to 1.
+    """
+    return 1 - (self["Collector"]["temp"]/self["Emitter"]["temp"])
+
+  def calc_radiation_efficiency(self):
+    """
+    Efficiency considering only blackbody heat transport in range 0 to 1.
+
+    Elements where the output power is not positive are nan.
+    """
+    return self.__positive_power_ratio(self.get_max_motive_ht(), \
+      self.__calc_black_body_heat_transport())
+
+  def calc_electronic_efficiency(self):
+    """
+    Efficiency considering only electronic heat transport in range 0 to 1.
+
+    Elements where the output power is not positive are nan.
+    """
+    max_motive_ht = self.get_max_motive_ht()
+    return self.__positive_power_ratio(max_motive_ht, \
+      self.__calc_electronic_heat_transport(max_motive_ht))
+
+  def calc_total_efficiency(self):
+    """
+    Return total efficiency considering all heat transport mechanisms.
+
+    Elements where the output power is not positive are nan.
+    """
+    max_motive_ht = self.get_max_motive_ht()
+    return self.__positive_power_ratio(max_motive_ht, \
+      self.__calc_black_body_heat_transport() + \
+      self.__calc_electronic_heat_transport(max_motive_ht))
+
+  def __positive_power_ratio(self, max_motive_ht, heat_transport):
+    """
+    Output power density divided by heat_transport, nan where the power is not positive.
+    """
+    power = self.__calc_output_current_density(max_motive_ht) * self.calc_output_voltage()
+    with np.errstate(divide="ignore", invalid="ignore"):
+      return np.where(power > 0, power / heat_transport, np.nan)
+
+  def __calc_output_current_density(self, max_motive_ht):
+    """
+    Net current density in A m^{-2} given the maximum motive of each device in J.
+    """
+    return self.__calc_emitted_current_density(self["Emitter"], max_motive_ht) - \
+      self._calc_back_current_density(max_motive_ht)
+
+  def __calc_emitted_current_density(self, el, max_motive_ht):
+    """
+    Current density emitted by el over the maximum motive max_motive_ht in A m^{-2}.
+    """
+    barrier = np.maximum(0, max_motive_ht - el.calc_barrier_ht())
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+      return np.where(barrier > 0, el.calc_saturation_current_density() * \
+        np.exp(-barrier/(physical_constants["boltzmann"]*el["temp"])), \
+        el.calc_saturation_current_density())
+
+  def __calc_electronic_heat_transport(self, max_motive_ht):
+    """
+    Electronic heat transport given the maximum motive of each device in J; see :meth:`tec.TECBase.calc_electronic_efficiency`.
+    """
+    elecHeatTransportForward = \
+      self.__calc_emitted_current_density(self["Emitter"], max_motive_ht)*(max_motive_ht+\
+      2 * physical_constants["boltzmann"] * self["Emitter"]["temp"]) / \
+      physical_constants["electron_charge"]
+    elecHeatTransportBackward = self._calc_back_current_density(max_motive_ht)*(max_motive_ht+\
+      2 * physical_constants["boltzmann"] * self["Collector"]["temp"]) / \
+      physical_constants["electron_charge"]
+    return elecHeatTransportForward - elecHeatTransportBackward
+
+  def __calc_black_body_heat_transport(self):
+    """
+    Radiation heat transport; see :meth:`tec.TECBase.calc_radiation_efficiency`.
+    """
+    return physical_constants["sigma0"] * \
+      (self["Emitter"]["temp"]**4 - self["Collector"]["temp"]**4) / \
+      ((1./self["Emitter"]["emissivity"]) + (1./self["Collector"]["emissivity"]) - 1)
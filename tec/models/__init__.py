@@ -13,5 +13,8 @@ Models (:mod:`tec.models`)
 	:members:
 """
 
-from langmuir import Langmuir
-from neac import NEAC
+from langmuir import Langmuir, DimensionlessLangmuirPoissonSoln
+from langmuir import QuadratureLangmuirPoissonSoln, KleynenLangmuirPoissonSoln, dps_backends
+from langmuir import get_shared_dps, warm_up_dps, dps_is_built
+from langmuir import LangmuirArray
+from neac import NEAC, NEACArray, spclmbs_max_dist
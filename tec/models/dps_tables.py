@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+On-disk tables of the dimensionless Langmuir solution.
+
+Solving the ode behind :class:`tec.models.langmuir.DimensionlessLangmuirPoissonSoln` costs an integration every time a process starts. The functions in this module write the raw position/motive arrays of both branches to a binary file in a user cache directory the first time they are computed, and map that file with :class:`numpy.memmap` on subsequent starts so that many worker processes share the same pages.
+
+File layout: a fixed-size ASCII header holding a JSON dict, followed by the raw little-endian float64 data. The header records the table format version, the solver parameters used to generate the data and a SHA-1 checksum of the data block. A table whose header does not match the requested parameters, or whose data does not match its checksum, is treated as stale and rebuilt.
+
+Hashing the data would cost every start a full read of the table, so the checksum is verified once: a table is marked as verified by a small sidecar file next to it, written when the table is saved or first loaded, which records the checksum, size and modification time of the file it vouches for. A load of a marked table checks only its header and size; a table modified after it was marked no longer matches its marker and is verified again.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+TABLE_VERSION = 1
+MAGIC = "TECDPS"
+HEADER_SIZE = 1024
+DTYPE = "<f8"
+
+def cache_dir():
+  """
+  Directory in which tables are stored.
+
+  Uses the TEC_CACHE_DIR environment variable if it is set, otherwise a "tec" directory under XDG_CACHE_HOME (default ~/.cache).
+  """
+  if os.environ.get("TEC_CACHE_DIR"):
+    return os.environ["TEC_CACHE_DIR"]
+
+  xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+  return os.path.join(xdg, "tec")
+
+def table_path(params):
+  """
+  Path of the table for a given dict of solver parameters.
+
+  :param dict params: Solver parameters; every item is part of the file name so different settings never share a file.
+  """
+  tag = hashlib.sha1(json.dumps(params, sort_keys = True).encode("ascii")).hexdigest()[:16]
+  return os.path.join(cache_dir(), "dps-v%d-%s.dat" % (TABLE_VERSION, tag))
+
+def _checksum(data):
+  """
+  SHA-1 hex digest of an array's bytes.
+  """
+  return hashlib.sha1(np.ascontiguousarray(data).view(np.uint8)).hexdigest()
+
+def marker_path(path):
+  """
+  Path of the sidecar file marking the table at path as verified.
+  """
+  return path + ".verified"
+
+def _marker(path, sha1):
+  """
+  Contents of the marker of the table at path, whose data has the SHA-1 hex digest sha1.
+  """
+  stat = os.stat(path)
+  return json.dumps({"sha1": sha1, "size": stat.st_size, "mtime": repr(stat.st_mtime)}, \
+    sort_keys = True)
+
+def _write_file(path, contents):
+  """
+  Write the string contents to path via a temporary file in the same directory, so that a concurrent reader never sees a partial file.
+  """
+  fd, tmp_path = tempfile.mkstemp(dir = os.path.dirname(path))
+  with os.fdopen(fd, "wb") as f:
+    f.write(contents)
+  os.chmod(tmp_path, 0o644)
+  try:
+    os.rename(tmp_path, path)
+  except OSError:
+    # Windows will not rename over an existing file.
+    os.remove(path)
+    os.rename(tmp_path, path)
+
+def _mark_verified(path, sha1):
+  """
+  Write the marker of the table at path. A cache directory which is not writable is not an error; the table is then verified on each load.
+  """
+  try:
+    _write_file(marker_path(path), _marker(path, sha1).encode("ascii"))
+  except (IOError, OSError):
+    pass
+
+def _is_marked(path, sha1):
+  """
+  Whether the table at path has a marker matching its current state and the checksum sha1 in its header.
+  """
+  try:
+    with open(marker_path(path), "rb") as f:
+      return f.read().decode("ascii") == _marker(path, sha1)
+  except (IOError, OSError, UnicodeDecodeError):
+    return False
+
+def save_table(params, data):
+  """
+  Write a table to the cache directory.
+
+  The file is written to a temporary name and renamed into place so that a concurrent reader never sees a partial table, then marked as verified since its checksum was computed from the data written. Returns the path of the table, or None if the cache directory is not writable.
+
+  :param dict params: Solver parameters used to generate the data.
+  :param data: 2D float array.
+  """
+  data = np.ascontiguousarray(data, dtype = DTYPE)
+  sha1 = _checksum(data)
+  header = {"version": TABLE_VERSION,
+            "params": params,
+            "shape": list(data.shape),
+            "sha1": sha1}
+  header = (MAGIC + json.dumps(header, sort_keys = True)).ljust(HEADER_SIZE - 1) + "\n"
+  if len(header) != HEADER_SIZE:
+    raise ValueError("Table header exceeds %d bytes." % HEADER_SIZE)
+
+  path = table_path(params)
+  try:
+    if not os.path.isdir(cache_dir()):
+      os.makedirs(cache_dir())
+    _write_file(path, header.encode("ascii") + data.tobytes())
+  except (IOError, OSError):
+    return None
+
+  _mark_verified(path, sha1)
+  return path
+
+def load_table(params):
+  """
+  Memory-map a table from the cache directory.
+
+  :param dict params: Solver parameters the table must have been generated with.
+  :returns: Read-only :class:`numpy.memmap`, or None if there is no valid table for these parameters.
+
+  The data is hashed only if the table has no matching marker; see the module docstring. A table which passes is then marked.
+  """
+  path = table_path(params)
+  try:
+    with open(path, "rb") as f:
+      header = f.read(HEADER_SIZE).decode("ascii")
+  except (IOError, OSError):
+    return None
+
+  if not header.startswith(MAGIC):
+    return None
+  try:
+    header = json.loads(header[len(MAGIC):])
+  except ValueError:
+    return None
+
+  if header.get("version") != TABLE_VERSION or header.get("params") != params:
+    return None
+
+  shape = tuple(header["shape"])
+  if os.path.getsize(path) != HEADER_SIZE + 8 * int(np.prod(shape)):
+    return None
+
+  data = np.memmap(path, dtype = DTYPE, mode = "r", offset = HEADER_SIZE, shape = shape)
+  if not _is_marked(path, header["sha1"]):
+    if _checksum(data) != header["sha1"]:
+      return None
+    _mark_verified(path, header["sha1"])
+
+  return data
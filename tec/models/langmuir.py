@@ -1,37 +1,62 @@
 # -*- coding: utf-8 -*-
 
+import os
+import inspect
+import threading
 import numpy as np
 from scipy import interpolate,optimize,integrate,special
-from tec import TECBase
+from tec import TECBase, MotiveData, TECArray
 from tec import physical_constants
+import dps_tables
+from roots import illinois, newton
 
 class DimensionlessLangmuirPoissonSoln(dict):
   """
   Numerical solution of Langmuir's dimensionless Poisson's equation.
 
   The purpose of this class is to provide an API to the solution of Langmuir's dimensionless Poisson's equation :cite:`10.1103/PhysRev.21.419` to provide the appropriate level of simplicity to the user. Via the class methods, the user can access either the dimensionless motive vs. dimensionless position or the dimensionless position vs. dimensionless motive, both of which are necessary in the Langmuir model. This class uses an ode solver to approximate the solution to the ode, then interpolation to return values at arbitrary abscissae -- see the source for details of the ode solver and interpolation algorithm.
+
+  The solution does not depend on any device parameters, so there is no need to build more than one instance per set of solver settings. Use :func:`get_shared_dps` to obtain the process-wide instance instead of instantiating this class directly.
+
+  :param float lhs_endpoint: Endpoint of the ode solver for the left-hand side branch.
+  :param float rhs_endpoint: Endpoint of the ode solver for the right-hand side branch.
+  :param int num_points: Number of points for ode solver to use on each branch.
+  :param bool use_table: If True, load the ode solution from the on-disk table cache (see :mod:`tec.models.dps_tables`) and write it there after solving if no valid table exists.
   """
+
+  # Identifies the ode solver in the on-disk table header; tables written by a different solver are rebuilt.
+  solver = "lsoda-erfcx"
+
+  # Coefficients of the large-motive expansion of the rhs branch; see rhs_tail_position.
+  rhs_tail_coeffs = ((np.pi / 4)**0.25, 
+                     3 * np.pi / 32 - 0.25, 
+                     -3 * np.sqrt(np.pi) / 16 + 5 * np.pi**1.5 / 128)
   
-  def __init__(self):
+  def __init__(self, lhs_endpoint = -2.5538, rhs_endpoint = 100, num_points = 1000, use_table = True):
     
     # Here is the algorithm:
-    # 1. Set up the default ode solver parameters.
-    # 2. Check to see if either the rhs or lhs params were passed as arguments. If not, use the default params.
-    # 3. Cat the additional default ode solver parameters to the lhs and rhs set of params.
-    # 4. Solve both the lhs and rhs odes.
-    # 5. Create the lhs and rhs interpolation objects.
-    
-    self["lhs"] = self.calc_branch(-2.5538)
-    self["rhs"] = self.calc_branch(100)
-
-    # data = np.loadtxt("tec/models/kleynen_langmuir.dat")
-    # rhs = data[565:-1,:]
-    # self["rhs"] = {}
-
-    # self["rhs"]["motive_v_position"] = \
-    #   interpolate.InterpolatedUnivariateSpline(rhs[:,0],rhs[:,1])
-    # self["rhs"]["position_v_motive"] = \
-    #     interpolate.InterpolatedUnivariateSpline(rhs[:,1],rhs[:,0],k=1)
+    # 1. Try to map a previously computed table for these solver parameters from the cache directory.
+    # 2. If there is no valid table, solve both the lhs and rhs odes and write the table for next time.
+    # 3. Create the lhs and rhs interpolation objects from the rows of the table; a mapped table is read through its memmap rather than copied first.
+    
+    params = {"solver": self.solver,
+              "lhs_endpoint": float(lhs_endpoint),
+              "rhs_endpoint": float(rhs_endpoint),
+              "num_points": int(num_points)}
+    
+    data = None
+    if use_table:
+      data = dps_tables.load_table(params)
+    
+    if data is None:
+      data = np.vstack(self.solve_branch(lhs_endpoint, num_points) + \
+        self.solve_branch(rhs_endpoint, num_points))
+      if use_table:
+        dps_tables.save_table(params, data)
+    
+    self["lhs"] = self.interpolate_branch(data[0], data[1])
+    self["rhs"] = self.interpolate_branch(data[2], data[3])
+    self.fit_tails(data[1][-1], data[3][-1])
       
   def calc_branch(self, endpoint, num_points = 1000):
     """
@@ -43,27 +68,72 @@ class DimensionlessLangmuirPoissonSoln(dict):
 
     This method returns a dictionary with items, "motive_v_position" and "position_v_motive"; each item an interpolation of what its name describes.
     """
-    ics = np.array([0,0])
+    return self.interpolate_branch(*self.solve_branch(endpoint, num_points))
+
+  def solve_branch(self, endpoint, num_points = 1000):
+    """
+    Solve the ode from the origin to endpoint.
+
+    :param float endpoint: Endpoint for the ode solver.
+    :param int num_points: Number of points for ode solver to use.
+    :returns: Tuple of position and motive arrays.
+    """
+    position_array, motive_array = self.solve_states(np.zeros((2,1)), endpoint, num_points)
+
+    return (position_array, motive_array[:,0])
+
+  def solve_states(self, ics, endpoint, num_points = 1000, rtol = 1e-10, atol = 1e-12):
+    """
+    Integrate several initial conditions from the origin to endpoint at once.
+
+    :param ics: Array of shape (2, n); the motive and its derivative for each of n initial conditions.
+    :param float endpoint: Endpoint for the ode solver.
+    :param int num_points: Number of evenly spaced positions at which to return the solution.
+    :param float rtol: Relative tolerance of the ode solver.
+    :param float atol: Absolute tolerance of the ode solver.
+    :returns: Tuple of the position array (num_points,) and motive array (num_points, n).
+
+    The integration uses LSODA with the analytic Jacobian from :meth:`langmuir_poisson_jac`, so the solver switches to a stiff method where appropriate. The solver chooses its own steps and the solution is sampled from its dense output, so the number of right-hand side evaluations does not grow with num_points.
+    """
+    ics = np.asarray(ics, dtype = float)
     position_array = np.linspace(0, endpoint, num_points)
-    motive_array = integrate.odeint(self.langmuir_poisson_eq,ics,position_array)
-    
+
+    soln = integrate.solve_ivp(lambda t, y: self.langmuir_poisson_eq(y, t), 
+      (0, endpoint), ics.ravel(), method = "LSODA", 
+      jac = lambda t, y: self.langmuir_poisson_jac(y, t), 
+      dense_output = True, rtol = rtol, atol = atol)
+    if not soln.success:
+      raise RuntimeError("ode solver failed: " + soln.message)
+
+    motive_array = soln.sol(position_array).reshape((2, ics.shape[1], num_points))[0].T
+
+    return (position_array, motive_array)
+
+  def interpolate_branch(self, position_array, motive_array):
+    """
+    Interpolation objects for one branch of the solution.
+
+    :param position_array: Dimensionless position, starting at the origin.
+    :param motive_array: Dimensionless motive corresponding to position_array.
+    :rtype: Dictionary of interpolation objects.
+    """
     # Create the motive_v_position interpolation, but first check the abscissae (position_array) are monotonically increasing.
     if position_array[0] < position_array[-1]:
       motive_v_position = \
-        interpolate.InterpolatedUnivariateSpline(position_array,motive_array[:,0])
+        interpolate.InterpolatedUnivariateSpline(position_array,motive_array)
     else:
       motive_v_position = \
-        interpolate.InterpolatedUnivariateSpline(position_array[::-1],motive_array[::-1,0])
+        interpolate.InterpolatedUnivariateSpline(position_array[::-1],motive_array[::-1])
       
     # Now create the position_v_motive interpolation but first check the abscissae (motive_array in this case) are monotonically increasing. Use linear interpolation to avoid weirdness near the origin.
     
     # I think I don't need the following block.
-    if motive_array[0,0] < motive_array[-1,0]:
+    if motive_array[0] < motive_array[-1]:
       position_v_motive = \
-        interpolate.InterpolatedUnivariateSpline(motive_array[:,0],position_array,k=1)
+        interpolate.InterpolatedUnivariateSpline(motive_array,position_array,k=1)
     else:
       position_v_motive = \
-        interpolate.InterpolatedUnivariateSpline(motive_array[::-1,0],position_array[::-1],k=1)
+        interpolate.InterpolatedUnivariateSpline(motive_array[::-1],position_array[::-1],k=1)
       
     return {"motive_v_position": motive_v_position, 
             "position_v_motive": position_v_motive}
@@ -72,13 +142,12 @@ class DimensionlessLangmuirPoissonSoln(dict):
     """
     Interpolation of dimensionless position at arbitrary dimensionless motive.
 
-    :param float motive: Argument of interpolation.
+    :param motive: float or numpy array of any shape; argument of interpolation.
     :param str branch=="lhs": Interpolate from left-hand side of solution to ode.
     :param str branch=="rhs": Interpolate from right-hand side of solution to ode.
-    :returns: Interpolated position.
-    :rtype: float
+    :returns: Interpolated position; float for float input, otherwise an array the same shape as motive.
 
-    The left or right hand side must be specified since the inverse of the solution to Langmuir's dimensionless Poisson's equation is not a single-valued function. Returns NaN if motive is < 0.
+    The left or right hand side must be specified since the inverse of the solution to Langmuir's dimensionless Poisson's equation is not a single-valued function. Returns NaN where motive is < 0 or NaN.
     """
     
     if type(branch) is not str:
@@ -86,44 +155,603 @@ class DimensionlessLangmuirPoissonSoln(dict):
     #if branch is not "lhs" or "rhs":
       #raise ValueError("branch must either be 'lhs' or 'rhs'.")
     
-    if motive < 0:
-      return np.NaN
+    motive = np.asarray(motive, dtype = float)
+    position = np.empty(motive.shape)
+    position.fill(np.nan)
+    
+    # NaN compares False, so NaN input stays NaN.
+    valid = motive >= 0
 
-    #if branch is "lhs" or branch is "rhs":
-    if branch is "lhs" and motive > 18.7:
-      return -2.55389
-    else:
-      return self[branch]["position_v_motive"](motive)
+    # Beyond the tabulated region use the asymptotic expansions.
+    if branch == "lhs":
+      tail = valid & (motive > self.lhs_end_motive)
+      position[tail] = self.lhs_tail_position(motive[tail])
+      valid &= ~tail
+    elif branch == "rhs":
+      tail = valid & (motive > self.rhs_end_motive)
+      position[tail] = self.rhs_tail_position(motive[tail])
+      valid &= ~tail
+
+    if valid.any():
+      position[valid] = self[branch]["position_v_motive"](motive[valid])
+
+    return self._match_input(position)
   
   def get_motive(self, position):
     """
-    Value of motive relative to ground for given value(s) of position in J.
+    Value of dimensionless motive for given value(s) of dimensionless position.
     
-    :param position: float or numpy array at which motive is to be evaluated. Returns NaN if position falls outside of the interelectrode space.
+    :param position: float or numpy array of any shape at which motive is to be evaluated. Returns NaN where position is beyond the lhs asymptote (see :meth:`fit_tails`).
+    :returns: float for float input, otherwise an array the same shape as position.
+    """
+    position = np.asarray(position, dtype = float)
+    motive = np.empty(position.shape)
+    motive.fill(np.nan)
+
+    lhs_tail = (position >= self.lhs_asymptote) & (position < self.lhs_end_position)
+    lhs = (position >= self.lhs_end_position) & (position <= 0)
+    rhs = (position > 0) & (position <= self.rhs_end_position)
+    rhs_tail = position > self.rhs_end_position
+
+    if lhs_tail.any():
+      motive[lhs_tail] = self.lhs_tail_motive(position[lhs_tail])
+    if lhs.any():
+      motive[lhs] = self["lhs"]["motive_v_position"](position[lhs])
+    if rhs.any():
+      motive[rhs] = self["rhs"]["motive_v_position"](position[rhs])
+    if rhs_tail.any():
+      motive[rhs_tail] = self.rhs_tail_motive(position[rhs_tail])
+
+    return self._match_input(motive)
+
+  def get_field(self, motive, branch = "lhs"):
+    """
+    Derivative of dimensionless motive with respect to dimensionless position for given value(s) of dimensionless motive.
+
+    :param motive: float or numpy array of any shape. Returns NaN where motive is negative.
+    :param str branch: "lhs" or "rhs", as for :meth:`get_position`.
+    :returns: float for float input, otherwise an array the same shape as motive. The field is negative on the lhs branch and positive on the rhs branch.
+
+    The field is given in closed form by the first integral of Poisson's equation (see :meth:`_field_sq_ratio`), so it does not depend on the tables.
+    """
+    motive = np.asarray(motive, dtype = float)
+    sign = 1 if branch == "rhs" else -1
+    # The ratio is already NaN for negative motive, so no warnings arise here.
+    field = sign * np.sqrt(motive * self._field_sq_ratio(motive, branch))
+    return self._match_input(field)
+
+  def get_position_slope(self, root_motive, branch = "lhs"):
+    """
+    Derivative of dimensionless position with respect to the square root of dimensionless motive.
+
+    :param root_motive: float or numpy array of any shape of square roots of dimensionless motive.
+    :param str branch: "lhs" or "rhs", as for :meth:`get_position`.
+    :returns: float for float input, otherwise an array the same shape as root_motive.
+
+    Position is not differentiable with respect to motive at the origin, where the field vanishes, but it is with respect to the square root of motive. There the slope is -2 on the lhs branch and 2 on the rhs branch.
+    """
+    root_motive = np.asarray(root_motive, dtype = float)
+    sign = 1 if branch == "rhs" else -1
+    slope = sign * 2 / np.sqrt(self._field_sq_ratio(root_motive**2, branch))
+    return self._match_input(slope)
+
+  def _field_sq_ratio(self, motive, branch):
+    """
+    Square of the field divided by motive.
+
+    Integrating :meth:`_poisson_accel` once from the origin, where both the motive and field vanish, gives the square of the field:
+    rhs: erfcx(sqrt(motive)) - 1 + 2 sqrt(motive/pi)
+    lhs: 2 exp(motive) - erfcx(sqrt(motive)) - 1 - 2 sqrt(motive/pi)
+    Near the origin these cancel to leading order, so the series in sqrt(motive) is used there instead.
+    """
+    motive = np.asarray(motive, dtype = float)
+    # The odd powers of sqrt(motive) come from the erf term, which has opposite signs on the two branches.
+    odd = -1 if branch == "rhs" else 1
+
+    with np.errstate(invalid = "ignore", over = "ignore", divide = "ignore"):
+      small = motive < 1e-4
+      root = np.sqrt(motive)
+      if branch == "rhs":
+        field_sq = special.erfcx(root) - 1 + 2 * root / np.sqrt(np.pi)
+      else:
+        field_sq = 2 * np.exp(motive) - special.erfcx(root) - 1 - 2 * root / np.sqrt(np.pi)
+      series = 1 + odd * 4 * root / (3 * np.sqrt(np.pi)) + motive / 2 + \
+        odd * 8 * motive * root / (15 * np.sqrt(np.pi)) + motive**2 / 6
+      return np.where(small, series, field_sq / motive)
+
+  def fit_tails(self, lhs_end_motive, rhs_end_motive):
     """
-    if position < -2.55389:
-      return np.NaN
-    elif position <= 0:
-      return self["lhs"]["motive_v_position"](position)
+    Stitch the asymptotic expansions of both branches onto the tabulated solution.
+
+    :param float lhs_end_motive: Largest motive resolved by the lhs branch.
+    :param float rhs_end_motive: Largest motive resolved by the rhs branch; np.inf if the branch needs no tail.
+
+    Sets the lhs_end_* and rhs_end_* attributes, which mark where each branch hands over to its expansion, and lhs_asymptote, the position the lhs branch approaches as motive goes to infinity. The constant of each expansion is chosen so that it meets the tabulated solution at the handover point.
+    """
+    self.lhs_end_motive = float(lhs_end_motive)
+    self.lhs_end_position = float(self["lhs"]["position_v_motive"](self.lhs_end_motive))
+    self.lhs_asymptote = self.lhs_end_position - np.sqrt(2) * np.exp(-self.lhs_end_motive / 2)
+
+    self.rhs_end_motive = float(rhs_end_motive)
+    if np.isfinite(self.rhs_end_motive):
+      self.rhs_end_position = float(self["rhs"]["position_v_motive"](self.rhs_end_motive))
+      self.rhs_tail_offset = self.rhs_end_position - self._rhs_tail_series(self.rhs_end_motive)
     else:
-      return self["rhs"]["motive_v_position"](position)
+      self.rhs_end_position = np.inf
+      self.rhs_tail_offset = np.nan
+
+  def lhs_tail_position(self, motive):
+    """
+    Large-motive expansion of position on the lhs branch.
+
+    For large motive the square of the field on the lhs is 2 exp(motive) to within terms of order sqrt(motive) exp(-motive), so position approaches lhs_asymptote as sqrt(2) exp(-motive / 2).
+    """
+    return self.lhs_asymptote + np.sqrt(2) * np.exp(-np.asarray(motive) / 2)
+
+  def lhs_tail_motive(self, position):
+    """
+    Inverse of :meth:`lhs_tail_position`.
+    """
+    with np.errstate(divide = "ignore"):
+      return -2 * np.log((np.asarray(position) - self.lhs_asymptote) / np.sqrt(2))
+
+  def rhs_tail_position(self, motive):
+    """
+    Large-motive expansion of position on the rhs branch.
+
+    For large motive the square of the field on the rhs is 2 sqrt(motive / pi) - 1 + erfcx(sqrt(motive)). Expanding its inverse square root in powers of motive^(-1/2) and integrating term by term gives position as a series that starts with (4/3) (pi/4)^(1/4) motive^(3/4); the first four terms are kept.
+    """
+    return self.rhs_tail_offset + self._rhs_tail_series(motive)
+
+  def rhs_tail_motive(self, position):
+    """
+    Inverse of :meth:`rhs_tail_position` by Newton iteration from the leading term.
+    """
+    a, c2, c3 = self.rhs_tail_coeffs
+    target = np.asarray(position, dtype = float) - self.rhs_tail_offset
+
+    motive = (3 * target / (4 * a))**(4./3)
+    for i in range(6):
+      slope = a * motive**-0.25 * (1 + np.sqrt(np.pi) / 4 * motive**-0.5 + c2 / motive + c3 * motive**-1.5)
+      motive = motive - (self._rhs_tail_series(motive) - target) / slope
+
+    return motive
+
+  def _rhs_tail_series(self, motive):
+    """
+    Series part of :meth:`rhs_tail_position`, without the constant.
+    """
+    a, c2, c3 = self.rhs_tail_coeffs
+    motive = np.asarray(motive, dtype = float)
+    return a * (4./3 * motive**0.75 + np.sqrt(np.pi) * motive**0.25 - \
+      4 * c2 * motive**-0.25 - 4./3 * c3 * motive**-0.75)
+
+  def _match_input(self, value):
+    """
+    Return a float if value is 0-d, otherwise the array itself.
+    """
+    if value.ndim == 0:
+      return float(value)
+    return value
   
   def langmuir_poisson_eq(self, motive, position):
     """
     Langmuir's dimensionless Poisson's equation for the ODE solver.
+
+    :param motive: State vector; the first half holds motive and the second half its derivative, for any number of independent states.
+    :param float position: Dimensionless position; its sign selects the branch.
+
+    The right-hand side is written with the scaled complementary error function, exp(x^2) erfc(x), so that it neither overflows nor loses precision to cancellation in 1 - erf at large motive.
     """
     
     # Note:
     # motive[0] = motive.
     # motive[1] = motive[0]'
     
+    state = np.reshape(motive, (2, -1))
+    accel = self._poisson_accel(state[0], position)
+    
+    return np.concatenate((state[1], accel))
+
+  def langmuir_poisson_jac(self, motive, position):
+    """
+    Jacobian of :meth:`langmuir_poisson_eq` with respect to the state vector.
+    """
+    state = np.reshape(motive, (2, -1))
+    n = state.shape[1]
+    jac = np.zeros((2 * n, 2 * n))
+    jac[np.arange(n), n + np.arange(n)] = 1
+    jac[n + np.arange(n), np.arange(n)] = self._poisson_accel_deriv(state[0], position)
+    
+    return jac
+
+  def _poisson_accel(self, motive, position):
+    """
+    Second derivative of motive.
+
+    rhs: 0.5 exp(motive) (1 - erf(sqrt(motive))) = 0.5 erfcx(sqrt(motive))
+    lhs: 0.5 exp(motive) (1 + erf(sqrt(motive))) = exp(motive) - 0.5 erfcx(sqrt(motive))
+    """
+    # The solver can undershoot zero by roundoff near the origin.
+    motive = np.maximum(motive, 0)
+    scaled = 0.5 * special.erfcx(np.sqrt(motive))
+    
     if position >= 0:
-      return np.array([ motive[1],\
-        0.5*np.exp(motive[0])*(1-special.erf( motive[0]**0.5 )) ])
-        
-    if position < 0:
-      return np.array([ motive[1],\
-        0.5*np.exp(motive[0])*(1+special.erf( motive[0]**0.5 )) ])
+      return scaled
+    else:
+      return np.exp(motive) - scaled
+
+  def _poisson_accel_deriv(self, motive, position):
+    """
+    Derivative of :meth:`_poisson_accel` with respect to motive.
+
+    The derivative diverges like motive^(-1/2) at the origin, so motive is floored at a small positive value.
+    """
+    motive = np.maximum(motive, 1e-12)
+    root = np.sqrt(motive)
+    scaled = 0.5 * (special.erfcx(root) - 1 / (np.sqrt(np.pi) * root))
+    
+    if position >= 0:
+      return scaled
+    else:
+      return np.exp(motive) - scaled
+
+
+class QuadratureLangmuirPoissonSoln(DimensionlessLangmuirPoissonSoln):
+  """
+  Solution of Langmuir's dimensionless Poisson's equation by quadrature of its first integral.
+
+  Integrating Langmuir's dimensionless Poisson's equation once gives the square of the dimensionless field in closed form::
+
+    (d motive / d position)^2 = exp(motive) - 1 +/- (exp(motive) erf(sqrt(motive)) - 2 sqrt(motive / pi))
+
+  with the upper sign on the lhs branch and the lower sign on the rhs branch. Position as a function of motive is therefore a single quadrature, which this class evaluates directly at arbitrary (arrays of) motive rather than interpolating an ode solution tabulated on a fixed grid. Motive as a function of position is found by a bracketed Newton iteration on the same quadrature. The rhs branch is extended on demand, so there is no fixed endpoint.
+
+  The API is identical to :class:`DimensionlessLangmuirPoissonSoln`; obtain an instance with ``get_shared_dps("quad")``.
+
+  :param float abserr: Target absolute error in dimensionless position per unit of the integration variable sqrt(motive).
+  :param float panel_width: Largest quadrature panel width in sqrt(motive).
+  """
+
+  solver = "quad"
+
+  def __init__(self, abserr = 1e-10, panel_width = 0.25):
+    self["lhs"] = self.calc_branch(1, abserr, panel_width)
+    self["rhs"] = self.calc_branch(-1, abserr, panel_width)
+
+    # The rhs branch extends itself on demand, so only the lhs needs a tail.
+    lhs_end_motive = self["lhs"]["quadrature"].u_end**2
+    self.fit_tails(lhs_end_motive, np.inf)
+
+  def calc_branch(self, sign, abserr = 1e-10, panel_width = 0.25):
+    """
+    Quadrature of the first integral for either side of the ode.
+
+    :param int sign: 1 for the lhs branch, -1 for the rhs branch.
+    :param float abserr: See class docstring.
+    :param float panel_width: See class docstring.
+    :rtype: Dictionary of callables.
+
+    This method returns a dictionary with items, "motive_v_position" and "position_v_motive"; each item a callable which evaluates what its name describes for array input. The item "quadrature" is the underlying :class:`_QuadratureBranch`.
+    """
+    branch = _QuadratureBranch(sign, abserr, panel_width)
+
+    return {"motive_v_position": branch.motive_v_position,
+            "position_v_motive": branch.position_v_motive,
+            "quadrature": branch}
+
+
+class _QuadratureBranch(object):
+  """
+  One branch of :class:`QuadratureLangmuirPoissonSoln`.
+
+  The integration variable is u = sqrt(motive), which removes the inverse square root singularity of d(position)/d(motive) at the origin. A table of the integral at panel edges is built with adaptive Gauss-Legendre quadrature; position at arbitrary u is the tabulated value at the panel edge below plus a Gauss-Legendre quadrature over the remainder of the panel.
+  """
+
+  nodes_lo, weights_lo = np.polynomial.legendre.leggauss(8)
+  nodes_hi, weights_hi = np.polynomial.legendre.leggauss(16)
+
+  # Coefficients of the power series (in ascending powers of u) of (d(motive)/d(position))^2 / u^2, used near the origin where the closed form suffers cancellation.
+  series_terms = 10
+  series_cutoff = 0.5
+
+  def __init__(self, sign, abserr, panel_width):
+    self.sign = sign
+    self.abserr = abserr
+    self.panel_width = panel_width
+    self._lock = threading.Lock()
+
+    coeffs = np.zeros(2 * self.series_terms)
+    double_factorial = 1.
+    for n in range(1, self.series_terms + 1):
+      double_factorial *= 2 * n + 1
+      coeffs[2 * n - 2] = 1. / special.factorial(n)
+      coeffs[2 * n - 1] = sign * 2 / np.sqrt(np.pi) * 2**n / double_factorial
+    self.series_coeffs = coeffs[::-1]
+
+    # The lhs integrand decays like exp(-u^2 / 2); beyond lhs_end the remaining integral is below abserr. The rhs branch grows without bound and starts at motive 100.
+    if sign > 0:
+      self.u_end = np.sqrt(2 * np.log(np.sqrt(2) / abserr))
+    else:
+      self.u_end = 10.
+
+    self._table = (np.array([0.]), np.array([0.]))
+    self.extend(self.u_end)
+
+  def integrand(self, u):
+    """
+    d(|position|)/du at u = sqrt(motive).
+    """
+    u = np.asarray(u, dtype = float)
+    g = np.empty(u.shape)
+
+    small = u < self.series_cutoff
+    g[small] = 2 / np.sqrt(np.polyval(self.series_coeffs, u[small]))
+
+    big = ~small
+    ub = u[big]
+    if self.sign > 0:
+      # Factor exp(u^2) out of the field to avoid overflow.
+      g[big] = 2 * ub * np.exp(-ub**2 / 2) / \
+        np.sqrt(1 + special.erf(ub) - np.exp(-ub**2) * (1 + 2 * ub / np.sqrt(np.pi)))
+    else:
+      g[big] = 2 * ub / np.sqrt(special.erfcx(ub) - 1 + 2 * ub / np.sqrt(np.pi))
+
+    return g
+
+  def gauss(self, a, b, high = True):
+    """
+    Gauss-Legendre quadrature of the integrand over [a, b], vectorized over a and b.
+    """
+    if high:
+      nodes, weights = self.nodes_hi, self.weights_hi
+    else:
+      nodes, weights = self.nodes_lo, self.weights_lo
+
+    a = np.asarray(a, dtype = float)[..., np.newaxis]
+    b = np.asarray(b, dtype = float)[..., np.newaxis]
+    half = (b - a) / 2
+    return (half * weights * self.integrand(a + half * (nodes + 1))).sum(axis = -1)
+
+  def extend(self, u_end):
+    """
+    Extend the table of panel edges and cumulative integrals to at least u_end.
+    """
+    with self._lock:
+      edges, cum = self._table
+      edges, cum = list(edges), list(cum)
+      width = self.panel_width
+
+      while edges[-1] < u_end:
+        a = edges[-1]
+        hi = self.gauss(a, a + width)
+        lo = self.gauss(a, a + width, high = False)
+        if abs(hi - lo) > self.abserr * width:
+          width /= 2
+          continue
+        edges.append(a + width)
+        cum.append(cum[-1] + float(hi))
+        width = min(2 * width, self.panel_width)
+
+      # Replace the table in one assignment so concurrent readers always see a consistent pair.
+      self._table = (np.array(edges), np.array(cum))
+      self.u_end = max(self.u_end, edges[-1])
+
+  def _locate(self, edges, u):
+    """
+    Index of the panel containing each u.
+    """
+    return np.clip(np.searchsorted(edges, u, side = "right") - 1, 0, len(edges) - 2)
+
+  def position_v_motive(self, motive):
+    """
+    Dimensionless position at dimensionless motive >= 0.
+    """
+    u = np.sqrt(np.asarray(motive, dtype = float))
+
+    if self.sign < 0 and u.size and u.max() > self.u_end:
+      self.extend(u.max())
+    else:
+      # The lhs table ends at u_end; larger motive is handled by the asymptotic tail.
+      u = np.minimum(u, self.u_end)
+
+    edges, cum = self._table
+    k = self._locate(edges, u)
+    position = cum[k] + self.gauss(edges[k], u)
+
+    return -self.sign * position
+
+  def motive_v_position(self, position):
+    """
+    Dimensionless motive at dimensionless position on this branch.
+    """
+    target = -self.sign * np.asarray(position, dtype = float)
+
+    if self.sign < 0:
+      while target.size and target.max() > self._table[1][-1]:
+        self.extend(2 * self.u_end)
+
+    edges, cum = self._table
+    shape = target.shape
+    target = np.minimum(target, cum[-1]).ravel()
+    k = self._locate(cum, target)
+    lo = edges[k]
+    hi = edges[k + 1]
+
+    # Safeguarded Newton iteration inside the bracketing panel, starting from linear interpolation. Only unconverged points are iterated.
+    u = lo + (hi - lo) * (target - cum[k]) / (cum[k + 1] - cum[k])
+    active = np.arange(u.size)
+    for i in range(50):
+      residual = cum[k[active]] + self.gauss(edges[k[active]], u[active]) - target[active]
+      unconverged = np.abs(residual) > self.abserr
+      active = active[unconverged]
+      residual = residual[unconverged]
+      if not active.size:
+        break
+
+      lo[active] = np.where(residual < 0, u[active], lo[active])
+      hi[active] = np.where(residual > 0, u[active], hi[active])
+      step = u[active] - residual / self.integrand(u[active])
+      outside = (step <= lo[active]) | (step >= hi[active])
+      step[outside] = ((lo[active] + hi[active]) / 2)[outside]
+      u[active] = step
+
+    u = u.reshape(shape)
+    return u**2
+
+
+class KleynenLangmuirPoissonSoln(DimensionlessLangmuirPoissonSoln):
+  """
+  Solution of Langmuir's dimensionless Poisson's equation interpolated from Kleynen's tables.
+
+  Kleynen's extension of Langmuir's (xi, eta) tables (Philips Res. Rep. 1:79-96, 1945) ship with this package as kleynen_langmuir.dat. This backend parses the file and interpolates it, so it costs no integration at all; it also serves as an independent reference for the other backends, see :meth:`cross_check`. Beyond the end of the tables the asymptotic tails of :class:`DimensionlessLangmuirPoissonSoln` are used.
+
+  The tables are given to 3-4 significant figures, and the printed source contains a handful of transcription errors which show up as non-monotonic rows; :meth:`load_table` drops those rows.
+
+  The API is identical to :class:`DimensionlessLangmuirPoissonSoln`; obtain an instance with ``get_shared_dps("kleynen")``.
+
+  :param str fname: Path of the table file; defaults to the copy bundled with the package.
+  """
+
+  solver = "kleynen"
+
+  def __init__(self, fname = None):
+    if fname is None:
+      fname = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kleynen_langmuir.dat")
+
+    self.table = self.load_table(fname)
+    self["lhs"] = self.interpolate_branch(*self.table["lhs"])
+    self["rhs"] = self.interpolate_branch(*self.table["rhs"])
+    self.fit_tails(self.table["lhs"][1][-1], self.table["rhs"][1][-1])
+
+  def load_table(self, fname):
+    """
+    Parse the table file into one (position, motive) pair of arrays per branch.
+
+    :param str fname: Path of the table file; two whitespace separated columns, position and motive, with "#" comments.
+    :rtype: Dictionary with keys "lhs" and "rhs", each a tuple of position and motive arrays ordered outward from the origin.
+    """
+    data = np.loadtxt(fname)
+    data = data[np.argsort(data[:,0], kind = "mergesort")]
+
+    lhs = data[data[:,0] <= 0][::-1]
+    rhs = data[data[:,0] >= 0]
+
+    # Near the lhs asymptote the printed positions are all -2.554; keep only the first row of each run of identical positions so both interpolants have strictly monotonic abscissae.
+    lhs = lhs[np.concatenate(([True], np.diff(lhs[:,0]) != 0))]
+
+    return {"lhs": self._drop_outliers(lhs[:,0], lhs[:,1]),
+            "rhs": self._drop_outliers(rhs[:,0], rhs[:,1])}
+
+  def _drop_outliers(self, position, motive):
+    """
+    Remove rows which break the monotonicity of motive along the branch.
+
+    Where two consecutive rows are out of order, the one which deviates further from the linear interpolation of its neighbours is dropped; this repeats until the branch is monotonic.
+    """
+    position = list(position)
+    motive = list(motive)
+
+    while True:
+      bad = [i for i in range(1, len(motive)) if motive[i] <= motive[i-1]]
+      if not bad:
+        break
+
+      i = bad[0]
+      deviations = []
+      for j in [i-1, i]:
+        if j == 0 or j == len(motive) - 1:
+          # Never drop the origin or the end of the table.
+          deviations.append(-1)
+          continue
+        frac = (position[j] - position[j-1]) / (position[j+1] - position[j-1])
+        interp = motive[j-1] + frac * (motive[j+1] - motive[j-1])
+        deviations.append(abs(motive[j] - interp))
+      j = [i-1, i][int(np.argmax(deviations))]
+      del position[j]
+      del motive[j]
+
+    return (np.array(position), np.array(motive))
+
+  def cross_check(self, reference = None):
+    """
+    Maximum deviation of the tables from another backend over their overlapping range.
+
+    :param reference: Solution object to compare against; defaults to the shared "ode" backend.
+    :rtype: Dictionary with keys "lhs" and "rhs"; the largest absolute difference in dimensionless position between each table row and the reference solution at the same motive, over rows within the reference's tabulated range.
+    """
+    if reference is None:
+      reference = get_shared_dps("ode")
+
+    deviation = {}
+    for branch in ["lhs", "rhs"]:
+      position, motive = self.table[branch]
+      overlap = motive <= getattr(reference, branch + "_end_motive")
+      deviation[branch] = np.abs(position[overlap] - \
+        reference.get_position(motive[overlap], branch)).max()
+
+    return deviation
+
+
+# Process-wide DimensionlessLangmuirPoissonSoln instances keyed on backend and solver settings.
+dps_backends = {"ode": DimensionlessLangmuirPoissonSoln,
+                "quad": QuadratureLangmuirPoissonSoln,
+                "kleynen": KleynenLangmuirPoissonSoln}
+_shared_dps = {}
+_shared_dps_lock = threading.Lock()
+
+def _dps_key(backend, settings):
+  """
+  Normalized cache key for a backend and its solver settings.
+
+  Defaults are filled in from the backend's constructor so that omitting a setting and passing its default value give the same key. use_table only decides how the solution is built, not the solution itself, so it is not part of the key.
+  """
+  if backend not in dps_backends:
+    raise ValueError("backend must be one of " + str(sorted(dps_backends.keys())) + ".")
+
+  args = inspect.getcallargs(dps_backends[backend].__init__, None, **settings)
+  del args["self"]
+  args.pop("use_table", None)
+
+  return (backend,) + tuple(sorted(args.items()))
+
+def get_shared_dps(backend = "ode", **settings):
+  """
+  Process-wide solution of Langmuir's dimensionless Poisson's equation for the given backend and solver settings.
+
+  The solution is built the first time it is requested and the same object is returned on every subsequent call with the same settings. Building is guarded by a lock so concurrent first calls from several threads only solve the ode once. The returned object is shared and must be treated as read-only.
+
+  :param str backend: Key of :data:`dps_backends`; "ode" for :class:`DimensionlessLangmuirPoissonSoln`, "quad" for :class:`QuadratureLangmuirPoissonSoln`, "kleynen" for :class:`KleynenLangmuirPoissonSoln`.
+  :param settings: Keyword arguments for the backend's constructor, e.g. lhs_endpoint, rhs_endpoint and num_points for "ode" or abserr for "quad". use_table is passed on to the "ode" constructor if the solution has not been built yet; it is rejected with TypeError by backends which do not take it.
+  """
+  key = _dps_key(backend, settings)
+
+  # Fast path: no locking once the solution exists.
+  dps = _shared_dps.get(key)
+  if dps is not None:
+    return dps
+
+  with _shared_dps_lock:
+    if key not in _shared_dps:
+      build_settings = dict(key[1:])
+      if "use_table" in settings:
+        build_settings["use_table"] = settings["use_table"]
+      _shared_dps[key] = dps_backends[backend](**build_settings)
+    return _shared_dps[key]
+
+def warm_up_dps(backend = "ode", **settings):
+  """
+  Build the shared solution ahead of time, e.g. at process start.
+
+  Takes the same arguments as :func:`get_shared_dps` and returns the shared instance.
+  """
+  return get_shared_dps(backend, **settings)
+
+def dps_is_built(backend = "ode", **settings):
+  """
+  True if the shared solution for the given backend and solver settings has already been built.
+  """
+  return _dps_key(backend, settings) in _shared_dps
 
 
 class Langmuir(TECBase):
@@ -138,7 +766,13 @@ class Langmuir(TECBase):
 
   * saturation_pt: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2] at the saturation point.
   * critical_pt: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2] at the critical point.
-  * dps: Langmuir's dimensionless Poisson's equation solution object.
+  * dps: Langmuir's dimensionless Poisson's equation solution object. This object is shared by every instance in the process; see :func:`get_shared_dps`.
+  * max_motive_ht: Maximum value of the motive [J].
+  * motive_profile: Scalars relating position to motive; see :meth:`calc_motive_profile`.
+
+  "motive_data" is a :class:`tec.MotiveData`, so each item is only calculated the first time it is read. Creating an object is therefore cheap until a quantity needing the Poisson solution is requested. The calculating method for each item is given by the motive_calculators attribute.
+
+  The backend used for "dps" is chosen by the dps_backend and dps_settings attributes, which are passed to :func:`get_shared_dps`. They can be overridden on a subclass or on an individual object, e.g. ``obj.dps_backend = "quad"`` followed by ``obj.calc_motive()``.
       
   Examples and interface testing
   ------------------------------
@@ -168,6 +802,28 @@ class Langmuir(TECBase):
   >>> type(example_tec["motive_data"]["dps"])
   <class 'tec.dimensionlesslangmuirpoissonsoln.DimensionlessLangmuirPoissonSoln'>
   """
+
+  dps_backend = "ode"
+  dps_settings = {}
+  root_finder = "brentq"
+  pickled_settings = ("dps_backend", "dps_settings", "root_finder")
+  motive_calculators = {"dps":"calc_dps",
+                        "saturation_pt":"calc_saturation_pt",
+                        "critical_pt":"calc_critical_pt",
+                        "max_motive_ht":"calc_max_motive_ht",
+                        "motive_profile":"calc_motive_profile"}
+
+  def init_bookkeeping(self):
+    """
+    Set up the memoized values and the bookkeeping of the rootfinders; see :meth:`TECBase.init_bookkeeping`.
+    """
+    TECBase.init_bookkeeping(self)
+    # Bookkeeping of solve_output_current_density, keyed on the motive_data item being calculated.
+    self.root_guesses = {}
+    self.root_iterations = {}
+    # Solutions at the previous steps of a sweep, as (step, solution) tuples; see start_sweep_point.
+    self.root_history = {}
+    self.sweep_step = 0
   
   def calc_back_current_density(self):
     """
@@ -175,72 +831,106 @@ class Langmuir(TECBase):
     """
     return 0.0
     
-  def calc_motive(self):
+  def build_motive_data(self):
     """
-    Calculates the motive (meta)data and populates the 'motive_data' attribute.
+    Populate the 'motive_data' attribute; see :meth:`TECBase.build_motive_data`.
     """
     # Throw out any nea attributes if they exist.
     # I feel like this code needs some explanation. The model this class implements assumes that neither electrode has NEA. Therefore, it doesn't make sense to allow anyone to set an "nea" attribute for either electrode. However, it is possible to instantiate a TEC_Langmuir object without either electrode having an "nea" attribute, then later set an "nea" attribute for one of the electrodes. It would be easy to check for "nea" during instantiation, but I would have to write a lot of ugly, hacky code to prevent either of the electrodes from acquiring an "nea" attribute later on. Since the calc_motive() method is presumably called whenever the TEC_Langmuir attributes (or sub-attributes) are called, the following block of code will notice if "nea" has been added to the electrodes, and will remove it.
+    self.remove_nea()
+    
+    # The items of motive_data are calculated when they are first read.
+    self["motive_data"] = MotiveData(self, self.motive_calculators)
+
+  def remove_nea(self):
+    """
+    Delete any "nea" items of the Electrodes and return whether there were any.
+
+    A newly set "nea" is not reported as a change by the Electrode, so :meth:`update_motive` calls this before deciding what to keep.
+    """
+    removed = False
     for electrode in ["Emitter","Collector"]:
       if "nea" in self[electrode]:
         del self[electrode]["nea"]
-    
-    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
-    
-    self["motive_data"] = {}
-    self["motive_data"]["dps"] = DimensionlessLangmuirPoissonSoln()
-    
-    self["motive_data"]["saturation_pt"] = self.calc_saturation_pt()
-    self["motive_data"]["critical_pt"] = self.calc_critical_pt()
-    
-    if self.calc_output_voltage() < self["motive_data"]["saturation_pt"]["output_voltage"]:
+        removed = True
+    return removed
+
+  def update_motive(self, changed):
+    """
+    Bring 'motive_data' up to date after Electrode parameters have changed.
+
+    The saturation and critical points depend on the barriers, temperatures, Richardson constants and spacing but not on the electrode voltages. If only voltages changed they are kept and only the maximum motive and the motive profile are discarded, to be recalculated when next read. An "nea" set on either Electrode counts as a change of everything.
+    """
+    if not self.remove_nea() and changed.issubset(["voltage"]):
+      self["motive_data"].invalidate(["max_motive_ht", "motive_profile"])
+    else:
+      TECBase.update_motive(self, changed)
+
+  def calc_dps(self):
+    """
+    Return the shared dimensionless Poisson's equation solution for this object's backend.
+    """
+    return get_shared_dps(self.dps_backend, **self.dps_settings)
+
+  def calc_max_motive_ht(self):
+    """
+    Determine the operating mode and the corresponding maximum motive in J.
+
+    Requires the "saturation_pt" and "critical_pt" entries of 'motive_data'. In space charge limited mode this solves for the output current density.
+    """
+    # The boundaries are included in the outer modes; at them the results are the same and the rootfinder has no bracket.
+    if self.calc_output_voltage() <= self["motive_data"]["saturation_pt"]["output_voltage"]:
       # Accelerating mode.
-      self["motive_data"]["max_motive_ht"] = self["Emitter"].calc_motive_bc()
-    elif self.calc_output_voltage() > self["motive_data"]["critical_pt"]["output_voltage"]:
+      return self["Emitter"].calc_motive_bc()
+    elif self.calc_output_voltage() >= self["motive_data"]["critical_pt"]["output_voltage"]:
       # Retarding mode.
-      self["motive_data"]["max_motive_ht"] = self["Collector"].calc_motive_bc()
+      return self["Collector"].calc_motive_bc()
     else:
       # Space charge limited mode.
-      output_current_density = optimize.brentq(self.output_voltage_target_function,\
+      output_current_density = self.solve_output_current_density("max_motive_ht",\
+        self.output_voltage_target_function, self.output_voltage_target_and_deriv,\
         self["motive_data"]["saturation_pt"]["output_current_density"],\
         self["motive_data"]["critical_pt"]["output_current_density"])
         
       barrier = physical_constants["boltzmann"] * self["Emitter"]["temp"] * \
         np.log(self["Emitter"].calc_saturation_current_density()/output_current_density)
-      self["motive_data"]["max_motive_ht"] = barrier + self["Emitter"].calc_motive_bc()
+      return barrier + self["Emitter"].calc_motive_bc()
     
   def get_motive(self,pos):
     """
     Value of motive relative to ground for given value(s) of position in J.
     
-    Position must be of numerical type or numpy array. Returns NaN if position 
-    falls outside of the interelectrode space.
+    :param pos: float or numpy array of any shape of positions [m].
+    :returns: float for float input, otherwise an array the same shape as pos. NaN where position is beyond the lhs asymptote of the Poisson solution.
+
+    The scalars relating position to motive are kept in the "motive_profile" entry of 'motive_data', so a profile of any number of points is a single vectorized lookup of the Poisson solution.
     """
     # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names. The "position" and "motive" variables refer to the dimensionless quantities, while "pos" and "mot" refer to the dimensioned quantities.
-    em_motive = (self.get_max_motive_ht() - self["Emitter"].calc_barrier_ht()) / \
-      (physical_constants["boltzmann"] * self["Emitter"]["temp"])
-    em_position = self["motive_data"]["dps"].get_position(em_motive)
+    profile = self["motive_data"]["motive_profile"]
+    motive = self["motive_data"]["dps"].get_motive(np.asarray(pos) * profile["scale"] + \
+      profile["em_position"])
+    
+    return profile["max_motive_ht"] - profile["kT"] * motive
+
+  def calc_motive_profile(self):
+    """
+    Scalars relating position to motive for :meth:`get_motive`.
+
+    :rtype: Dictionary with keys "max_motive_ht" [J], "kT" [J] (the emitter's thermal energy), "scale" [m^-1] (dimensionless position per unit length) and "em_position" (the emitter's dimensionless position).
+    """
+    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
+    kT = physical_constants["boltzmann"] * self["Emitter"]["temp"]
+    em_motive = (self.get_max_motive_ht() - self["Emitter"].calc_barrier_ht()) / kT
     
-    position = pos * ((2 * np.pi * physical_constants["electron_mass"] * \
+    scale = ((2 * np.pi * physical_constants["electron_mass"] * \
       physical_constants["electron_charge"]**2) / \
       (physical_constants["permittivity0"]**2 * physical_constants["boltzmann"]**3))**(1.0/4) * \
-      (self.calc_output_current_density()**(1.0/2))/(self["Emitter"]["temp"]**(3.0/4)) + \
-      em_position
-      
-    # What follows is some hacky code
-      
-    motive = []
-      
-    for p in position:
-      motive.append(self["motive_data"]["dps"].get_motive(p))
-    
-    # Turn the list into a numpy array
-    motive = np.array(motive)
-    
-    mot = self.get_max_motive_ht() - \
-      physical_constants["boltzmann"] * self["Emitter"]["temp"] * motive
-      
-    return mot
+      (self.calc_output_current_density()**(1.0/2))/(self["Emitter"]["temp"]**(3.0/4))
+
+    return {"max_motive_ht":self.get_max_motive_ht(),
+            "kT":kT,
+            "scale":scale,
+            "em_position":self["motive_data"]["dps"].get_position(em_motive)}
   
   def get_max_motive_ht(self, with_position=False):
     """
@@ -249,15 +939,8 @@ class Langmuir(TECBase):
     :param bool with_position: True returns the position at max motive instead.
     """
     if with_position:
-      em_motive = (self.get_max_motive_ht() - self["Emitter"].calc_barrier_ht()) / \
-        (physical_constants["boltzmann"] * self["Emitter"]["temp"])
-      em_position = self["motive_data"]["dps"].get_position(em_motive)
-      
-      return -1 * em_position * \
-        ((physical_constants["permittivity0"]**2 * physical_constants["boltzmann"]**3)/\
-        (2*np.pi*physical_constants["electron_mass"]*\
-        physical_constants["electron_charge"]**2))**(1.0/4) * \
-        (self["Emitter"]["temp"]**(3.0/4))/(self.calc_output_current_density()**(1.0/2))
+      profile = self["motive_data"]["motive_profile"]
+      return -profile["em_position"] / profile["scale"]
     else:
       return self["motive_data"]["max_motive_ht"]
   
@@ -294,7 +977,8 @@ class Langmuir(TECBase):
     # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
     
     # Rootfinder to get critical point output current density.
-    output_current_density = optimize.brentq(self.critical_point_target_function,\
+    output_current_density = self.solve_output_current_density("critical_pt",\
+      self.critical_point_target_function, self.critical_point_target_and_deriv,\
       self["Emitter"].calc_saturation_current_density(),0)
     
     position = -self.calc_interelectrode_spacing() * \
@@ -329,10 +1013,113 @@ class Langmuir(TECBase):
     
     return position - self["motive_data"]["dps"].get_position(motive)
 
+  def critical_point_target_and_deriv(self,root_motive):
+    """
+    Value of :meth:`critical_point_target_function` and its derivative, both as functions of the square root of the dimensionless emitter motive.
+
+    :param float root_motive: Square root of the dimensionless emitter motive, i.e. sqrt(ln(J_sat/J)).
+    :returns: Tuple of the target and its derivative with respect to root_motive.
+    """
+    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
+    dps = self["motive_data"]["dps"]
+    output_current_density = self["Emitter"].calc_saturation_current_density() * \
+      np.exp(-root_motive**2)
+    position = -self.calc_interelectrode_spacing() * \
+      ((2 * np.pi * physical_constants["electron_mass"] * physical_constants["electron_charge"]**2) / \
+      (physical_constants["permittivity0"]**2 * physical_constants["boltzmann"]**3))**(1.0/4) * \
+      (output_current_density**(1.0/2))/(self["Emitter"]["temp"]**(3.0/4))
+
+    return (position - dps.get_position(root_motive**2),
+            -root_motive * position - dps.get_position_slope(root_motive))
+
   def output_voltage_target_function(self,output_current_density):
     """
     Target function for the output voltage rootfinder.
     """
+    return self.calc_output_voltage() - \
+      self.calc_space_charge_output_voltage(output_current_density)
+
+  def output_voltage_target_and_deriv(self,root_motive):
+    """
+    Value of :meth:`output_voltage_target_function` and its derivative, both as functions of the square root of the dimensionless emitter motive.
+
+    :param float root_motive: Square root of the dimensionless emitter motive, i.e. sqrt(ln(J_sat/J)).
+    :returns: Tuple of the target and its derivative with respect to root_motive.
+    """
+    output_voltage, slope = self.calc_space_charge_output_voltage_and_slope(root_motive)
+    return self.calc_output_voltage() - output_voltage, -slope
+
+  def calc_space_charge_output_voltage_and_slope(self,root_motive):
+    """
+    :meth:`calc_space_charge_output_voltage` and its derivative, both as functions of the square root of the dimensionless emitter motive.
+
+    :param float root_motive: Square root of the dimensionless emitter motive, i.e. sqrt(ln(J_sat/J)).
+    :returns: Tuple of the output voltage [V] and its derivative with respect to root_motive [V].
+
+    The collector's dimensionless position is the emitter's plus the dimensionless spacing, so the derivative of the collector motive follows from the field there by the chain rule.
+    """
+    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
+    dps = self["motive_data"]["dps"]
+    output_current_density = self["Emitter"].calc_saturation_current_density() * \
+      np.exp(-root_motive**2)
+    offset = self.calc_interelectrode_spacing() * \
+      ((2 * np.pi * physical_constants["electron_mass"] * physical_constants["electron_charge"]**2) / \
+      (physical_constants["permittivity0"]**2 * physical_constants["boltzmann"]**3))**(1.0/4) * \
+      (output_current_density**(1.0/2))/(self["Emitter"]["temp"]**(3.0/4))
+
+    co_position = dps.get_position(root_motive**2) + offset
+    co_motive = dps.get_motive(co_position)
+    co_position_slope = dps.get_position_slope(root_motive) - root_motive * offset
+    # At the critical point the collector motive can round to just below 0, where the field would be NaN.
+    co_field = dps.get_field(np.maximum(co_motive, 0), "rhs" if co_position >= 0 else "lhs")
+
+    kT = physical_constants["boltzmann"] * self["Emitter"]["temp"]
+    output_voltage = ((self["Emitter"]["barrier"] + root_motive**2 * kT) - \
+      (self["Collector"]["barrier"] + co_motive * kT)) / physical_constants["electron_charge"]
+    slope = kT * (2 * root_motive - co_field * co_position_slope) / \
+      physical_constants["electron_charge"]
+
+    return output_voltage, slope
+
+  def solve_output_current_density(self, name, target_function, target_and_deriv, lo, hi):
+    """
+    Output current density [A m^-2] at which target_function is zero.
+
+    :param str name: Key under which the solution is recorded in the root_guesses and root_iterations attributes, e.g. "critical_pt".
+    :param target_function: Target function of output current density.
+    :param target_and_deriv: Returns the tuple of target_function and its derivative, both as functions of the square root of the dimensionless emitter motive.
+    :param float lo: One end of the bracket [A m^-2].
+    :param float hi: The other end of the bracket [A m^-2].
+
+    The rootfinder is chosen by the root_finder attribute, which can be overridden on a subclass or an individual object. With "brentq" (the default) target_function is solved directly. With "newton" it is solved for the square root of the dimensionless emitter motive, sqrt(ln(J_sat/J)), by :func:`tec.models.roots.newton` using target_and_deriv; position is a smooth function of that variable even at the saturation point. Newton's method starts from the solution last recorded under name in root_guesses if it lies within the bracket, so a sequence of nearby problems takes only a few iterations each. Either way, the number of iterations is recorded under name in root_iterations.
+    """
+    if self.root_finder == "newton":
+      saturation_current_density = self["Emitter"].calc_saturation_current_density()
+      bracket = [np.sqrt(np.log(saturation_current_density/j)) if j > 0 else np.inf \
+        for j in [lo, hi]]
+
+      root_motive, iterations = newton(target_and_deriv, bracket[0], bracket[1], \
+        x0=self.root_guesses.get(name))
+      self.root_guesses[name] = root_motive
+      self.root_history[name] = self.root_history.get(name, [])[-1:] + [(self.sweep_step, root_motive)]
+      output_current_density = saturation_current_density * np.exp(-root_motive**2)
+    elif self.root_finder == "brentq":
+      output_current_density, info = optimize.brentq(target_function, lo, hi, full_output=True)
+      iterations = info.iterations
+    else:
+      raise ValueError("root_finder must be 'brentq' or 'newton'.")
+
+    self.root_iterations[name] = iterations
+    return output_current_density
+
+  def calc_space_charge_output_voltage(self,output_current_density):
+    """
+    Output voltage in V at which the given current density flows in space charge limited mode.
+
+    :param output_current_density: Output current density [A m^-2] between those of the saturation and critical points. Can be a float or numpy array.
+
+    In space charge limited mode the output voltage is an explicit function of the output current density, so no rootfinding is needed in this direction.
+    """
     # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
     em_motive = np.log(self["Emitter"].calc_saturation_current_density()/output_current_density)
     em_position = self["motive_data"]["dps"].get_position(em_motive)
@@ -344,9 +1131,419 @@ class Langmuir(TECBase):
     co_position = self.calc_interelectrode_spacing()/x0 + em_position
     co_motive = self["motive_data"]["dps"].get_motive(co_position)
     
-    return self.calc_output_voltage() - ((self["Emitter"]["barrier"] + \
+    return ((self["Emitter"]["barrier"] + \
       em_motive * physical_constants["boltzmann"] * self["Emitter"]["temp"]) - \
       (self["Collector"]["barrier"] + \
       co_motive * physical_constants["boltzmann"] * self["Emitter"]["temp"]))/ \
       physical_constants["electron_charge"]
-      
\ No newline at end of file
+
+  def calc_sweep(self, path, quantities = ("calc_output_current_density", "calc_output_power_density"), continuation = True):
+    """
+    Walk the object through a sequence of parameter values, evaluating quantities at each step.
+
+    :param bool continuation: If True, the rootfinders use Newton's method seeded from the previous steps; see :meth:`start_sweep_point`.
+
+    See :meth:`tec.TECBase.calc_sweep` for the other parameters and the return value. The rootfinders start each sweep without guesses, so the results do not depend on earlier sweeps. On a smooth path continuation takes two or three iterations per rootfinder per step rather than the eight or so of a cold start.
+    """
+    if not continuation:
+      return TECBase.calc_sweep(self, path, quantities)
+
+    saved_root_finder = self.__dict__.get("root_finder")
+    self.root_finder = "newton"
+    # Each sweep starts cold, so the roots of an earlier sweep do not seed the first steps.
+    self.root_guesses = {}
+    self.root_history = {}
+    self.sweep_step = 0
+    try:
+      return TECBase.calc_sweep(self, path, quantities)
+    finally:
+      if saved_root_finder is None:
+        del self.root_finder
+      else:
+        self.root_finder = saved_root_finder
+
+  def start_sweep_point(self):
+    """
+    Seed Newton's method for the next step of a sweep.
+
+    Each rootfinder whose solution is known at the previous two steps starts from their linear extrapolation; one known only at the previous step starts from that solution. A rootfinder which was not needed at the previous step, e.g. because the device was outside space charge limited mode, starts from its last solution if that lies within the new bracket. A poor guess only costs iterations, since :func:`tec.models.roots.newton` keeps a bracket.
+    """
+    self.sweep_step += 1
+    for name, history in self.root_history.items():
+      steps = [step for step, root_motive in history]
+      if steps == [self.sweep_step - 2, self.sweep_step - 1]:
+        self.root_guesses[name] = max(2 * history[1][1] - history[0][1], 0)
+
+  def locate_max_power_pt(self):
+    """
+    Output voltage [V] and output current density [A m^-2] at maximum output power.
+
+    The mode boundaries bracket the search. The power rises linearly in accelerating mode, so its best point is the saturation point. In retarding mode the power is greatest at the critical point or at kT/e, whichever is greater. The current density is flat in output voltage at the saturation point, so the power keeps rising into space charge limited mode. If dP/dV is negative at the critical point, the power therefore has a maximum in space charge limited mode.
+
+    There dP/dV = 0 is solved over the square root of the emitter motive by a secant method, starting from the middle of the mode. The target is known in closed form, but its derivative needs the curvature of the output voltage, which is only estimated as a finite difference of the previous two evaluations. The steps are taken by :func:`roots.newton` for its bracketing safeguards. Each iteration needs two lookups of the Poisson solution, and usually five to ten iterations suffice, about half the lookups of a bounded minimization to the same tolerance.
+    """
+    sat_pt, crit_pt = self.get_mode_boundaries()
+    sat_current = sat_pt["output_current_density"]
+    crit_current = crit_pt["output_current_density"]
+    kT = physical_constants["boltzmann"] * self["Emitter"]["temp"]
+
+    # Retarding mode optimum.
+    output_voltage = max(crit_pt["output_voltage"], kT/physical_constants["electron_charge"])
+    output_current_density = crit_current * np.exp(-physical_constants["electron_charge"] * \
+      (output_voltage - crit_pt["output_voltage"]) / kT)
+
+    # Space charge limited mode optimum.
+    if crit_current < sat_current:
+      # With the emitter motive m = r**2 in units of kT, J = J_sat exp(-m) and dP/dm = J (dV/dm - V), so the target is dV/dm - V. Its derivative with respect to r is d(dV/dm)/dr - dV/dr. The second term is exact. The first is 0 in the no space charge model, where dV/dm = kT/e, and is otherwise the secant slope of dV/dm through the previous evaluation.
+      previous = []
+      def target_and_secant_slope(root_motive):
+        voltage, slope = self.calc_space_charge_output_voltage_and_slope(root_motive)
+        motive_slope = slope / (2 * root_motive)
+        secant_slope = 0.0
+        if previous:
+          secant_slope = (motive_slope - previous[1]) / (root_motive - previous[0])
+        previous[:] = [root_motive, motive_slope]
+        return motive_slope - voltage, secant_slope - slope
+
+      # The current density is flat in output voltage at the saturation point, so dP/dm > 0 there. Unless dP/dm < 0 at the critical point the power is greatest in retarding mode.
+      crit_root_motive = np.sqrt(np.log(sat_current/crit_current))
+      if target_and_secant_slope(crit_root_motive)[0] < 0:
+        root_motive = newton(target_and_secant_slope, 0, crit_root_motive, xtol = 1e-9)[0]
+        current = sat_current * np.exp(-root_motive**2)
+        voltage = self.calc_space_charge_output_voltage(current)
+        if voltage * current > output_voltage * output_current_density:
+          output_voltage, output_current_density = voltage, current
+
+    return output_voltage, output_current_density
+
+  def get_mode_boundaries(self):
+    """
+    Points bounding the space charge limited mode.
+
+    :returns: Tuple of the saturation point and critical point dictionaries from 'motive_data'.
+    """
+    return self["motive_data"]["saturation_pt"], self["motive_data"]["critical_pt"]
+
+  def calc_jv_curve(self, num_points=100, lo_voltage=None, hi_voltage=None):
+    """
+    Output current density versus output voltage over all operating modes.
+
+    :param int num_points: Number of points in each of the space charge limited and retarding segments.
+    :param float lo_voltage: Lowest output voltage [V]. Defaults to the lesser of 0 and the saturation point voltage.
+    :param float hi_voltage: Highest output voltage [V]. Defaults to the greater of the critical point voltage and the sum of the electrode barriers.
+    :returns: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2], both numpy arrays ordered by increasing output voltage. Only points between lo_voltage and hi_voltage are returned.
+
+    The object is not modified. The space charge limited segment is computed in one vectorized pass by sampling output current density between the saturation and critical points and evaluating :meth:`calc_space_charge_output_voltage`. In accelerating mode the current density is that of the saturation point, and in retarding mode it falls exponentially from that of the critical point with the emitter temperature.
+    """
+    sat_pt, crit_pt = self.get_mode_boundaries()
+    sat_voltage = sat_pt["output_voltage"]
+    crit_voltage = crit_pt["output_voltage"]
+    sat_current = sat_pt["output_current_density"]
+    crit_current = crit_pt["output_current_density"]
+    kT = physical_constants["boltzmann"] * self["Emitter"]["temp"]
+
+    if lo_voltage is None:
+      lo_voltage = min(0.0, sat_voltage)
+    if hi_voltage is None:
+      hi_voltage = max(crit_voltage, (self["Emitter"]["barrier"] + \
+        self["Collector"]["barrier"]) / physical_constants["electron_charge"])
+
+    # Space charge limited mode, sampled evenly in emitter motive.
+    if crit_current < sat_current:
+      em_motive = np.linspace(0, np.log(sat_current/crit_current), num_points)
+      sc_current = sat_current * np.exp(-em_motive)
+      sc_voltage = self.calc_space_charge_output_voltage(sc_current)
+      sc_voltage[0], sc_voltage[-1] = sat_voltage, crit_voltage
+    else:
+      sc_current = np.array([sat_current])
+      sc_voltage = np.array([sat_voltage])
+
+    # Accelerating mode is flat so its end points describe it.
+    if lo_voltage < sat_voltage:
+      acc_voltage = np.array([lo_voltage])
+    else:
+      acc_voltage = np.array([])
+    acc_current = sat_current * np.ones_like(acc_voltage)
+
+    # Retarding mode.
+    if hi_voltage > crit_voltage:
+      ret_voltage = np.linspace(crit_voltage, hi_voltage, num_points + 1)[1:]
+    else:
+      ret_voltage = np.array([])
+    ret_current = crit_current * \
+      np.exp(-physical_constants["electron_charge"] * (ret_voltage - crit_voltage) / kT)
+
+    output_voltage = np.concatenate([acc_voltage, sc_voltage, ret_voltage])
+    output_current_density = np.concatenate([acc_current, sc_current, ret_current])
+    keep = (output_voltage >= lo_voltage) & (output_voltage <= hi_voltage)
+
+    return {"output_voltage":output_voltage[keep],
+            "output_current_density":output_current_density[keep]}
+      
+
+
+class LangmuirArray(TECArray):
+  """
+  Ensemble of :class:`Langmuir` devices evaluated with numpy.
+
+  A LangmuirArray is instantiated like a :class:`tec.TECArray`. Like :class:`Langmuir` it ignores NEA and back emission. The saturation point, critical point and space charge limited output current density of every device are found together: the rootfinding is done by :func:`tec.models.roots.illinois` over all devices at once, with vectorized lookups of the shared dimensionless Poisson's equation solution chosen by dps_backend and dps_settings. Results match the scalar :class:`Langmuir` path to the rootfinder tolerance, rtol (relative, in output current density).
+
+  The space charge solution is recalculated each time :meth:`get_max_motive_ht` is called. Each current, power or efficiency query calls it once; :meth:`calc_max_power_pt` also does the batched search of :meth:`locate_max_power_pt`.
+  """
+
+  dps_backend = "ode"
+  dps_settings = {}
+  rtol = 1e-12
+  # Labels of the codes returned by calc_mode_map.
+  modes = ("accelerating", "space charge limited", "retarding")
+  # Names of the points returned by get_mode_boundaries.
+  boundary_keys = ("saturation_pt", "critical_pt")
+
+  def calc_dps(self):
+    """
+    Return the shared dimensionless Poisson's equation solution for this object's backend.
+    """
+    return get_shared_dps(self.dps_backend, **self.dps_settings)
+
+  def calc_back_current_density(self):
+    """
+    Always 0 since back emission is ignored.
+    """
+    return 0.0
+
+  def _calc_back_current_density(self, max_motive_ht):
+    """
+    Always 0 since back emission is ignored.
+    """
+    return 0.0
+
+  def _device_params(self):
+    """
+    Flattened arrays of the device parameters used by the space charge calculations.
+    """
+    shape = self.get_shape()
+    params = {"temp":self["Emitter"]["temp"],
+              "saturation_current_density":self["Emitter"].calc_saturation_current_density(),
+              "spacing":self.calc_interelectrode_spacing(),
+              "em_barrier":self["Emitter"]["barrier"],
+              "co_barrier":self["Collector"]["barrier"],
+              "output_voltage":self.calc_output_voltage()}
+    if "nea" in self["Collector"]:
+      params["co_nea"] = self["Collector"]["nea"]
+    for key in params:
+      params[key] = np.broadcast_to(params[key], shape).ravel()
+    # Factor turning a distance into a dimensionless position given sqrt(J).
+    params["scale"] = ((2 * np.pi * physical_constants["electron_mass"] * \
+      physical_constants["electron_charge"]**2) / \
+      (physical_constants["permittivity0"]**2 * physical_constants["boltzmann"]**3))**(1.0/4) / \
+      params["temp"]**(3.0/4)
+    params["kT"] = physical_constants["boltzmann"] * params["temp"]
+    return params
+
+  def calc_saturation_pt(self):
+    """
+    Determine the saturation point of each device.
+
+    :rtype: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2], each an array.
+    """
+    p = self._device_params()
+    output_current_density = p["saturation_current_density"]
+    motive = self.calc_dps().get_motive(p["spacing"] * p["scale"] * output_current_density**(1.0/2))
+    output_voltage = (p["em_barrier"] - p["co_barrier"] - motive * p["kT"]) / \
+      physical_constants["electron_charge"]
+    return self._reshape({"output_voltage":output_voltage,
+                          "output_current_density":output_current_density})
+
+  def calc_critical_pt(self):
+    """
+    Determine the critical point of each device.
+
+    :rtype: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2], each an array.
+    """
+    p = self._device_params()
+    dps = self.calc_dps()
+
+    def target(output_current_density, indx):
+      with np.errstate(divide="ignore"):
+        motive = np.log(p["saturation_current_density"][indx]/output_current_density)
+      return -p["spacing"][indx] * p["scale"][indx] * output_current_density**(1.0/2) - \
+        dps.get_position(motive)
+
+    output_current_density = illinois(target, p["saturation_current_density"], 0, rtol=self.rtol)
+    motive = np.log(p["saturation_current_density"]/output_current_density)
+    output_voltage = (p["em_barrier"] - p["co_barrier"] + motive * p["kT"]) / \
+      physical_constants["electron_charge"]
+    return self._reshape({"output_voltage":output_voltage,
+                          "output_current_density":output_current_density})
+
+  def get_mode_boundaries(self):
+    """
+    Points bounding the space charge limited mode; see :meth:`Langmuir.get_mode_boundaries`.
+    """
+    return self.calc_saturation_pt(), self.calc_critical_pt()
+
+  def calc_space_charge_output_voltage(self, output_current_density):
+    """
+    Output voltage in V at which the given current density flows in space charge limited mode; see :meth:`Langmuir.calc_space_charge_output_voltage`.
+    """
+    p = self._device_params()
+    output_current_density = np.broadcast_to(output_current_density, self.get_shape()).ravel()
+    return self._space_charge_output_voltage(p, output_current_density, \
+      np.arange(output_current_density.size)).reshape(self.get_shape())
+
+  def _space_charge_output_voltage(self, p, output_current_density, indx):
+    """
+    Space charge limited output voltage of the flattened devices numbered indx.
+    """
+    dps = self.calc_dps()
+    em_motive = np.log(p["saturation_current_density"][indx]/output_current_density)
+    em_position = dps.get_position(em_motive)
+    co_position = p["spacing"][indx] * p["scale"][indx] * output_current_density**(1.0/2) + \
+      em_position
+    co_motive = dps.get_motive(co_position)
+    return ((p["em_barrier"][indx] + em_motive * p["kT"][indx]) - \
+      (p["co_barrier"][indx] + co_motive * p["kT"][indx])) / \
+      physical_constants["electron_charge"]
+
+  def _space_charge_output_voltage_and_slope(self, p, root_motive, indx):
+    """
+    Space charge limited output voltage of the flattened devices numbered indx and its derivative, both as functions of the square root of the dimensionless emitter motive; see :meth:`Langmuir.calc_space_charge_output_voltage_and_slope`.
+    """
+    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
+    dps = self.calc_dps()
+    offset = p["spacing"][indx] * p["scale"][indx] * \
+      (p["saturation_current_density"][indx] * np.exp(-root_motive**2))**(1.0/2)
+
+    co_position = dps.get_position(root_motive**2) + offset
+    co_motive = np.maximum(dps.get_motive(co_position), 0)
+    co_position_slope = dps.get_position_slope(root_motive) - root_motive * offset
+    co_field = np.where(co_position >= 0, dps.get_field(co_motive, "rhs"), \
+      dps.get_field(co_motive, "lhs"))
+
+    kT = p["kT"][indx]
+    output_voltage = ((p["em_barrier"][indx] + root_motive**2 * kT) - \
+      (p["co_barrier"][indx] + co_motive * kT)) / physical_constants["electron_charge"]
+    slope = kT * (2 * root_motive - co_field * co_position_slope) / \
+      physical_constants["electron_charge"]
+
+    return output_voltage, slope
+
+  def locate_max_power_pt(self):
+    """
+    Output voltage [V] and output current density [A m^-2] of each device at maximum output power; see :meth:`Langmuir.locate_max_power_pt`.
+
+    :returns: Tuple of arrays shaped like the ensemble.
+
+    The candidates are those of the scalar path. The stationary points in space charge limited mode are found for all of the devices together with :func:`tec.models.roots.illinois`, which evaluates the ends of the brackets, so the target is dP/dr / J = dV/dr - 2 r V, where r is the square root of the emitter motive. Unlike dP/dm / J it is finite at the saturation point. Devices where it does not change sign have their greatest power in retarding mode.
+    """
+    p = self._device_params()
+    sat_pt, crit_pt = self.get_mode_boundaries()
+    sat_current = sat_pt["output_current_density"].ravel()
+    crit_voltage = crit_pt["output_voltage"].ravel()
+    crit_current = crit_pt["output_current_density"].ravel()
+    e = physical_constants["electron_charge"]
+
+    # Retarding mode optimum.
+    output_voltage = np.maximum(crit_voltage, p["kT"]/e)
+    output_current_density = crit_current * np.exp(-e * (output_voltage - crit_voltage) / p["kT"])
+
+    # Space charge limited mode optimum.
+    scl = np.flatnonzero(crit_current < sat_current)
+    if scl.size > 0:
+      def target(root_motive, indx):
+        voltage, slope = self._space_charge_output_voltage_and_slope(p, root_motive, scl[indx])
+        return slope - 2 * root_motive * voltage
+      root_motive = illinois(target, 0, np.sqrt(np.log(sat_current[scl]/crit_current[scl])), \
+        rtol=self.rtol)
+      found = ~np.isnan(root_motive)
+      scl, root_motive = scl[found], root_motive[found]
+      current = sat_current[scl] * np.exp(-root_motive**2)
+      voltage = self._space_charge_output_voltage(p, current, scl)
+      better = voltage * current > output_voltage[scl] * output_current_density[scl]
+      output_voltage[scl[better]] = voltage[better]
+      output_current_density[scl[better]] = current[better]
+
+    return output_voltage.reshape(self.get_shape()), \
+      output_current_density.reshape(self.get_shape())
+
+  def get_max_motive_ht(self):
+    """
+    Value of the maximum motive relative to ground in J for each device.
+
+    The operating mode of each device is determined from its mode boundaries. The output current densities of the devices in space charge limited mode are then solved for together.
+    """
+    p = self._device_params()
+    sat_pt, crit_pt = self.get_mode_boundaries()
+    sat_voltage = sat_pt["output_voltage"].ravel()
+    crit_voltage = crit_pt["output_voltage"].ravel()
+    em_barrier_ht = np.broadcast_to(self["Emitter"].calc_barrier_ht(), self.get_shape()).ravel()
+    co_barrier_ht = np.broadcast_to(self["Collector"].calc_barrier_ht(), self.get_shape()).ravel()
+
+    # The boundaries are included in the outer modes as in Langmuir.calc_max_motive_ht.
+    max_motive_ht = np.where(p["output_voltage"] <= sat_voltage, em_barrier_ht, co_barrier_ht)
+    scl = np.flatnonzero((p["output_voltage"] > sat_voltage) & \
+      (p["output_voltage"] < crit_voltage))
+
+    if scl.size > 0:
+      def target(output_current_density, indx):
+        return p["output_voltage"][scl[indx]] - \
+          self._space_charge_output_voltage(p, output_current_density, scl[indx])
+      output_current_density = illinois(target, \
+        sat_pt["output_current_density"].ravel()[scl], \
+        crit_pt["output_current_density"].ravel()[scl], rtol=self.rtol)
+      max_motive_ht[scl] = em_barrier_ht[scl] + p["kT"][scl] * \
+        np.log(p["saturation_current_density"][scl]/output_current_density)
+
+    return max_motive_ht.reshape(self.get_shape())
+
+  def calc_mode_map(self, output_voltage):
+    """
+    Operating mode of each device over a range of output voltages.
+
+    :param output_voltage: float or numpy array of any shape of output voltages [V]. The electrode voltages of the ensemble itself are not used.
+    :returns: Dictionary with key "mode", an int array of shape self.get_shape() + numpy.shape(output_voltage) indexing the modes attribute, i.e. 0 for accelerating, 1 for space charge limited and 2 for retarding mode. The mode boundaries are included under the keys of :meth:`get_mode_boundaries`, e.g. "saturation_pt" and "critical_pt".
+
+    The mode boundaries do not depend on the output voltage, so they are found once for all of the devices. For example, a map over spacing and output voltage is given by an ensemble whose collector position is an array of spacings. As in :meth:`Langmuir.calc_max_motive_ht`, voltages on a boundary belong to the outer mode.
+    """
+    output_voltage = np.asarray(output_voltage, dtype=float)
+    boundaries = self.get_mode_boundaries()
+    expand = (Ellipsis,) + (np.newaxis,) * output_voltage.ndim
+    sat_voltage = boundaries[0]["output_voltage"][expand]
+    crit_voltage = boundaries[1]["output_voltage"][expand]
+
+    mode_map = {"mode":np.where(output_voltage <= sat_voltage, 0, \
+      np.where(output_voltage >= crit_voltage, 2, 1))}
+    for key, point in zip(self.boundary_keys, boundaries):
+      mode_map[key] = point
+    return mode_map
+
+  def get_motive(self, pos):
+    """
+    Motive profile of each device relative to ground in J.
+
+    :param pos: float or numpy array of any shape of positions [m], as for :meth:`Langmuir.get_motive`.
+    :returns: Array of shape self.get_shape() + numpy.shape(pos), holding the motive of each device at each position.
+
+    The space charge solution is found once for all of the devices, and all of the profiles are then a single vectorized lookup of the Poisson solution.
+    """
+    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
+    p = self._device_params()
+    pos = np.asarray(pos, dtype=float)
+    max_motive_ht = self.get_max_motive_ht().ravel()
+    em_barrier_ht = np.broadcast_to(self["Emitter"].calc_barrier_ht(), self.get_shape()).ravel()
+
+    # Back emission is ignored, so the output current density follows from the emitter motive.
+    em_motive = np.maximum(max_motive_ht - em_barrier_ht, 0) / p["kT"]
+    scale = p["scale"] * (p["saturation_current_density"] * np.exp(-em_motive))**(1.0/2)
+    position = np.outer(scale, pos.ravel()) + self.calc_dps().get_position(em_motive)[:, np.newaxis]
+    motive = self.calc_dps().get_motive(position)
+
+    return (max_motive_ht[:, np.newaxis] - p["kT"][:, np.newaxis] * motive).reshape( \
+      self.get_shape() + pos.shape)
+
+  def _reshape(self, point):
+    """
+    Reshape the flattened arrays of a point dictionary to the ensemble shape.
+    """
+    return dict((key, value.reshape(self.get_shape())) for key, value in point.items())
+
@@ -2,9 +2,10 @@
 
 import numpy as np
 from scipy import interpolate,optimize
-from tec import physical_constants
+from tec import physical_constants, electrode_param_to_si
 from . import Langmuir
-from langmuir import DimensionlessLangmuirPoissonSoln
+from langmuir import LangmuirArray, get_shared_dps
+from roots import illinois
 
 class NEAC(Langmuir):
   """
@@ -18,8 +19,12 @@ class NEAC(Langmuir):
 
   * saturation_pt: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2] at the saturation point.
   * virt_critical_pt: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2] at the critical point.
-  * dps: Langmuir's dimensionless Poisson's equation solution object.
+  * dps: Langmuir's dimensionless Poisson's equation solution object. This object is shared by every instance in the process; see :func:`tec.models.langmuir.get_shared_dps`.
   * spclmbs_max_dist: Space charge limited mode boundary surface (spclmbs) maximum distance [m]. The distance below which the TEC experiences no space charge limited mode.
+  * max_motive_ht: Maximum value of the motive [J].
+  * motive_profile: Scalars relating position to motive; see :meth:`Langmuir.calc_motive_profile`.
+
+  As in :class:`Langmuir`, the items of "motive_data" are only calculated the first time they are read.
 
   Examples and interface testing
   ------------------------------
@@ -53,34 +58,42 @@ class NEAC(Langmuir):
   <class 'tec.dimensionlesslangmuirpoissonsoln.DimensionlessLangmuirPoissonSoln'>
   """
   
-  def calc_motive(self):
+  motive_calculators = {"dps":"calc_dps",
+                        "spclmbs_max_dist":"calc_spclmbs_max_dist",
+                        "saturation_pt":"calc_saturation_pt",
+                        "virt_critical_pt":"calc_virt_critical_pt",
+                        "max_motive_ht":"calc_max_motive_ht",
+                        "motive_profile":"calc_motive_profile"}
+
+  def remove_nea(self):
     """
-    Calculates the motive (meta)data and populates the 'motive_data' attribute.
+    Keep the "nea" items; this model uses them.
     """
-    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
-    
-    self["motive_data"] = {}
-    self["motive_data"]["dps"] = DimensionlessLangmuirPoissonSoln()
+    return False
 
-    self["motive_data"]["spclmbs_max_dist"] = self.calc_spclmbs_max_dist()
-    self["motive_data"]["saturation_pt"] = self.calc_saturation_pt()
-    self["motive_data"]["virt_critical_pt"] = self.calc_virt_critical_pt()
+  def calc_max_motive_ht(self):
+    """
+    Determine the operating mode and the corresponding maximum motive in J.
 
-    if self.calc_output_voltage() < self["motive_data"]["saturation_pt"]["output_voltage"]:
+    Requires the "saturation_pt" and "virt_critical_pt" entries of 'motive_data'. In space charge limited mode this solves for the output current density. Like the saturation and virtual critical points, "spclmbs_max_dist" does not depend on the electrode voltages, so :meth:`Langmuir.update_motive` only discards "max_motive_ht" and "motive_profile" after a voltage change.
+    """
+    # The boundaries are included in the outer modes; at them the results are the same and the rootfinder has no bracket.
+    if self.calc_output_voltage() <= self["motive_data"]["saturation_pt"]["output_voltage"]:
       # Accelerating mode.
-      self["motive_data"]["max_motive_ht"] = self["Emitter"].calc_barrier_ht()
-    elif self.calc_output_voltage() > self["motive_data"]["virt_critical_pt"]["output_voltage"]:
+      return self["Emitter"].calc_barrier_ht()
+    elif self.calc_output_voltage() >= self["motive_data"]["virt_critical_pt"]["output_voltage"]:
       # Retarding mode.
-      self["motive_data"]["max_motive_ht"] = self["Collector"].calc_barrier_ht()
+      return self["Collector"].calc_barrier_ht()
     else:
       # Space charge limited mode.
-      output_current_density = optimize.brentq(self.output_voltage_target_function,\
+      output_current_density = self.solve_output_current_density("max_motive_ht",\
+        self.output_voltage_target_function, self.output_voltage_target_and_deriv,\
         self["motive_data"]["saturation_pt"]["output_current_density"],\
         self["motive_data"]["virt_critical_pt"]["output_current_density"])
         
       barrier = physical_constants["boltzmann"] * self["Emitter"]["temp"] * \
         np.log(self["Emitter"].calc_saturation_current_density()/output_current_density)
-      self["motive_data"]["max_motive_ht"] = barrier + self["Emitter"].calc_barrier_ht()
+      return barrier + self["Emitter"].calc_barrier_ht()
       
   def calc_spclmbs_max_dist(self):
     """
@@ -144,7 +157,8 @@ class NEAC(Langmuir):
       return {"output_voltage":self.calc_contact_potential(),
               "output_current_density":self["Emitter"].calc_saturation_current_density()}
     
-    output_current_density = optimize.brentq(self.virt_critical_point_target_function,\
+    output_current_density = self.solve_output_current_density("virt_critical_pt",\
+      self.virt_critical_point_target_function, self.virt_critical_point_target_and_deriv,\
       self["Emitter"].calc_saturation_current_density(),0)
     
     motive = np.log(self["Emitter"].calc_saturation_current_density()/output_current_density)
@@ -179,9 +193,36 @@ class NEAC(Langmuir):
       
     return co_position - (em_position + offset)
 
-  def output_voltage_target_function(self,output_current_density):
+  def virt_critical_point_target_and_deriv(self,root_motive):
+    """
+    Value of :meth:`virt_critical_point_target_function` and its derivative, both as functions of the square root of the dimensionless emitter motive.
+
+    :param float root_motive: Square root of the dimensionless emitter motive, i.e. sqrt(ln(J_sat/J)).
+    :returns: Tuple of the target and its derivative with respect to root_motive.
+
+    The collector position of the virtual critical point does not depend on the output current density, so the target differs from :meth:`Langmuir.critical_point_target_and_deriv` by a constant.
+    """
+    # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
+    co_motive = self["Collector"]["nea"]/ \
+      (physical_constants["boltzmann"] * self["Emitter"]["temp"])
+    co_position = self["motive_data"]["dps"].get_position(co_motive,branch="rhs")
+
+    target, deriv = self.critical_point_target_and_deriv(root_motive)
+    return co_position + target, deriv
+
+  def get_mode_boundaries(self):
+    """
+    Points bounding the space charge limited mode.
+
+    :returns: Tuple of the saturation point and virtual critical point dictionaries from 'motive_data'.
+    """
+    return self["motive_data"]["saturation_pt"], self["motive_data"]["virt_critical_pt"]
+
+  def calc_space_charge_output_voltage(self,output_current_density):
     """
-    Target function for the output voltage rootfinder.
+    Output voltage in V at which the given current density flows in space charge limited mode.
+
+    :param output_current_density: Output current density [A m^-2] between those of the saturation and virtual critical points. Can be a float or numpy array.
     """
     # For brevity, "dimensionless" prefix omitted from "position" and "motive" variable names.
     em_motive = np.log(self["Emitter"].calc_saturation_current_density()/output_current_density)
@@ -195,8 +236,175 @@ class NEAC(Langmuir):
     co_position = em_position + offset
     co_motive = self["motive_data"]["dps"].get_motive(co_position)
     
-    return self.calc_output_voltage() - ((self["Emitter"]["barrier"] + \
+    return ((self["Emitter"]["barrier"] + \
       em_motive * physical_constants["boltzmann"] * self["Emitter"]["temp"]) - \
       (self["Collector"]["barrier"] - self["Collector"]["nea"] + \
       co_motive * physical_constants["boltzmann"] * self["Emitter"]["temp"]))/ \
       physical_constants["electron_charge"]
+
+
+  def calc_space_charge_output_voltage_and_slope(self,root_motive):
+    """
+    :meth:`calc_space_charge_output_voltage` and its derivative, both as functions of the square root of the dimensionless emitter motive.
+
+    The collector's vacuum level is its barrier less its NEA, so this is :meth:`Langmuir.calc_space_charge_output_voltage_and_slope` shifted by the NEA.
+    """
+    output_voltage, slope = Langmuir.calc_space_charge_output_voltage_and_slope(self, root_motive)
+    return output_voltage + self["Collector"]["nea"]/physical_constants["electron_charge"], slope
+
+
+class NEACArray(LangmuirArray):
+  """
+  Ensemble of :class:`NEAC` devices evaluated with numpy.
+
+  A NEACArray is instantiated like a :class:`tec.TECArray` and the collectors must have "nea". Everything else is as described in :class:`tec.models.langmuir.LangmuirArray`, with the virtual critical point bounding space charge limited mode.
+  """
+
+  boundary_keys = ("saturation_pt", "virt_critical_pt")
+
+  def calc_mode_map(self, output_voltage):
+    """
+    Operating mode of each device over a range of output voltages.
+
+    See :meth:`tec.models.langmuir.LangmuirArray.calc_mode_map`; the map also has the key "spclmbs_max_dist" [m]. Devices closer than spclmbs_max_dist have no space charge limited mode, so their saturation and virtual critical points coincide.
+
+    Example, a map over spacing and output voltage:
+
+    >>> em = {"temp":1000, "barrier":1, "voltage":0, "position":0, "richardson":10, "emissivity":0.5, "nea":0.5}
+    >>> co = {"temp":300, "barrier":0.8, "voltage":0, "position":np.logspace(-1, 2, 50), "richardson":10, "emissivity":0.5, "nea":0.5}
+    >>> mode_map = NEACArray({"Emitter":em, "Collector":co}).calc_mode_map(np.linspace(-1, 1, 200))
+    >>> mode_map["mode"].shape
+    (50, 200)
+    """
+    mode_map = LangmuirArray.calc_mode_map(self, output_voltage)
+    mode_map["spclmbs_max_dist"] = self.calc_spclmbs_max_dist()
+    return mode_map
+
+  def calc_spclmbs_max_dist(self):
+    """
+    Space charge limited mode boundary surface (spclmbs) maximum interelectrode distance of each device [m].
+    """
+    p = self._device_params()
+    co_position_vr = self.calc_dps().get_position(p["co_nea"]/p["kT"], branch="rhs")
+    return (co_position_vr / (p["scale"] * \
+      p["saturation_current_density"]**(1./2))).reshape(self.get_shape())
+
+  def calc_saturation_pt(self):
+    """
+    Determine the saturation point of each device.
+
+    :rtype: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2], each an array.
+    """
+    p = self._device_params()
+    inside = p["spacing"] <= self.calc_spclmbs_max_dist().ravel()
+    output_current_density = p["saturation_current_density"]
+    motive = self.calc_dps().get_motive(p["spacing"] * p["scale"] * output_current_density**(1.0/2))
+    output_voltage = np.where(inside, p["em_barrier"] - p["co_barrier"], \
+      p["em_barrier"] + p["co_nea"] - p["co_barrier"] - motive * p["kT"]) / \
+      physical_constants["electron_charge"]
+    return self._reshape({"output_voltage":output_voltage,
+                          "output_current_density":output_current_density})
+
+  def calc_virt_critical_pt(self):
+    """
+    Determine the virtual critical point of each device.
+
+    :rtype: Dictionary with keys "output_voltage" [V] and "output_current_density" [A m^-2], each an array.
+    """
+    p = self._device_params()
+    dps = self.calc_dps()
+    inside = p["spacing"] <= self.calc_spclmbs_max_dist().ravel()
+    co_position = dps.get_position(p["co_nea"]/p["kT"], branch="rhs")
+
+    def target(output_current_density, indx):
+      with np.errstate(divide="ignore"):
+        em_motive = np.log(p["saturation_current_density"][indx]/output_current_density)
+      return co_position[indx] - (dps.get_position(em_motive) + \
+        p["spacing"][indx] * p["scale"][indx] * output_current_density**(1.0/2))
+
+    # Devices within the spclmbs have no space charge limited mode; skip their rootfinding.
+    output_current_density = p["saturation_current_density"].copy()
+    outside = np.flatnonzero(~inside)
+    if outside.size > 0:
+      output_current_density[outside] = illinois(lambda j, indx: target(j, outside[indx]), \
+        p["saturation_current_density"][outside], 0, rtol=self.rtol)
+    motive = np.log(p["saturation_current_density"]/output_current_density)
+    output_voltage = (p["em_barrier"] - p["co_barrier"] + p["kT"] * motive) / \
+      physical_constants["electron_charge"]
+    return self._reshape({"output_voltage":output_voltage,
+                          "output_current_density":output_current_density})
+
+  def get_mode_boundaries(self):
+    """
+    Points bounding the space charge limited mode; see :meth:`NEAC.get_mode_boundaries`.
+    """
+    return self.calc_saturation_pt(), self.calc_virt_critical_pt()
+
+  def _space_charge_output_voltage(self, p, output_current_density, indx):
+    """
+    Space charge limited output voltage of the flattened devices numbered indx.
+    """
+    dps = self.calc_dps()
+    em_motive = np.log(p["saturation_current_density"][indx]/output_current_density)
+    em_position = dps.get_position(em_motive)
+    co_position = em_position + \
+      p["spacing"][indx] * p["scale"][indx] * output_current_density**(1.0/2)
+    co_motive = dps.get_motive(co_position)
+    return ((p["em_barrier"][indx] + em_motive * p["kT"][indx]) - \
+      (p["co_barrier"][indx] - p["co_nea"][indx] + co_motive * p["kT"][indx])) / \
+      physical_constants["electron_charge"]
+
+  def _space_charge_output_voltage_and_slope(self, p, root_motive, indx):
+    """
+    Space charge limited output voltage of the flattened devices numbered indx and its derivative; :meth:`tec.models.langmuir.LangmuirArray._space_charge_output_voltage_and_slope` shifted by the collector NEA.
+    """
+    output_voltage, slope = LangmuirArray._space_charge_output_voltage_and_slope(self, p, root_motive, indx)
+    return output_voltage + p["co_nea"][indx]/physical_constants["electron_charge"], slope
+
+
+def spclmbs_max_dist(temp, barrier, richardson, nea, filename=None, dps_backend="ode", **dps_settings):
+  """
+  Space charge limited mode boundary surface (spclmbs) maximum interelectrode distance over material parameters [m].
+
+  :param temp: Emitter temperature [K].
+  :param barrier: Emitter barrier [eV].
+  :param richardson: Emitter Richardson's constant [A cm^-2 K^-2].
+  :param nea: Collector negative electron affinity [eV].
+  :param str filename: If given, the parameters and the result are written to this file with numpy.savez_compressed. The parameters are stored with the shapes they were given in, so a grid built from broadcast axes stays compact.
+  :param str dps_backend: Backend of the dimensionless Poisson's equation solution; see :func:`tec.models.langmuir.get_shared_dps`.
+  :returns: Array of the broadcast shape of the parameters. Elements where temp is 0 are NaN.
+
+  This is the quantity returned by :meth:`NEAC.calc_spclmbs_max_dist`, which depends on nothing but these four parameters. Each may be a float or an array, and the arrays are checked and converted like those of :class:`tec.ElectrodeArray`. Below spclmbs_max_dist the collector's vacuum level lies within the rhs branch of every space charge limited motive, so there is no space charge limited mode.
+
+  Example, a surface over emitter temperature and collector NEA:
+
+  >>> surface = spclmbs_max_dist(np.linspace(800, 2000, 1000)[:, np.newaxis], 1.5, 120, np.linspace(0.1, 1, 1000))
+  >>> surface.shape
+  (1000, 1000)
+  """
+  params = {"temp":temp, "barrier":barrier, "richardson":richardson, "nea":nea}
+  for key in params:
+    try:
+      params[key] = np.array(params[key], dtype=float)
+    except (TypeError, ValueError):
+      raise TypeError("Argument must be of real numeric type.")
+    params[key] = electrode_param_to_si(key, params[key])
+
+  kT = physical_constants["boltzmann"] * params["temp"]
+  with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+    saturation_current_density = params["richardson"] * params["temp"]**2 * \
+      np.exp(-params["barrier"]/kT)
+    co_position_vr = get_shared_dps(dps_backend, **dps_settings).get_position( \
+      params["nea"]/kT, branch="rhs")
+    # Same scaling as NEACArray.calc_spclmbs_max_dist.
+    scale = ((2 * np.pi * physical_constants["electron_mass"] * \
+      physical_constants["electron_charge"]**2) / \
+      (physical_constants["permittivity0"]**2 * physical_constants["boltzmann"]**3))**(1.0/4) / \
+      params["temp"]**(3.0/4)
+    max_dist = np.where(params["temp"] > 0, \
+      co_position_vr / (scale * saturation_current_density**(1./2)), np.nan)
+
+  if filename is not None:
+    np.savez_compressed(filename, spclmbs_max_dist=max_dist, \
+      temp=temp, barrier=barrier, richardson=richardson, nea=nea)
+  return max_dist
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Root finders shared by the space charge models.
+"""
+
+import numpy as np
+
+def illinois(func, lo, hi, xtol=0, rtol=1e-12, maxiter=100):
+  """
+  Solve many bracketed scalar root finding problems at once.
+
+  :param func: Called as func(x, indx) where x is an array of trial values for the problems numbered indx in the flattened brackets; returns an array of the target function values.
+  :param lo: Array of lower (or upper) ends of the brackets.
+  :param hi: Array of the other ends of the brackets; broadcast against lo.
+  :param float xtol: Absolute tolerance on the root.
+  :param float rtol: Relative tolerance on the root.
+  :param int maxiter: Maximum number of iterations.
+  :returns: Array of roots shaped like the broadcast brackets. Problems whose brackets do not change sign, or whose target is NaN at an end or at any iterate, are NaN.
+
+  This is the Illinois variant of the false position method. Each iteration evaluates func only for the problems which have not yet converged, so func should subset any per-problem parameters with indx.
+  """
+  lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float), np.asarray(hi, dtype=float))
+  shape = lo.shape
+  a = lo.ravel().copy()
+  b = hi.ravel().copy()
+  indx = np.arange(a.size)
+  fa = np.asarray(func(a, indx), dtype=float)
+  fb = np.asarray(func(b, indx), dtype=float)
+
+  root = np.empty(a.size)
+  root.fill(np.nan)
+  root[fa == 0] = a[fa == 0]
+  root[fb == 0] = b[fb == 0]
+  active = (fa * fb < 0)
+
+  for i in range(maxiter):
+    indx = np.flatnonzero(active)
+    if indx.size == 0:
+      break
+    ai, bi, fai, fbi = a[indx], b[indx], fa[indx], fb[indx]
+    c = bi - fbi * (bi - ai) / (fbi - fai)
+    fc = np.asarray(func(c, indx), dtype=float)
+
+    # Keep the bracket; halve the retained end's value when it is kept twice.
+    flip = fc * fbi < 0
+    a[indx] = np.where(flip, bi, ai)
+    fa[indx] = np.where(flip, fbi, fai / 2)
+    b[indx] = c
+    fb[indx] = fc
+
+    # A NaN target ends the problem with a NaN root.
+    failed = np.isnan(fc)
+    converged = ((fc == 0) | (np.abs(c - a[indx]) <= xtol + rtol * np.abs(c))) & ~failed
+    root[indx[converged]] = c[converged]
+    active[indx[converged | failed]] = False
+
+  # Return the best estimate for any problem which ran out of iterations.
+  root[active] = b[active]
+  return root.reshape(shape)
+
+def newton(func, lo, hi, x0=None, xtol=0, rtol=1e-12, maxiter=100):
+  """
+  Safeguarded Newton's method for a monotonic function with a root between lo and hi.
+
+  :param func: Called as func(x); returns the tuple (value, derivative) of the target function at x.
+  :param float lo: One end of the bracket.
+  :param float hi: The other end of the bracket. Either end can be infinite.
+  :param float x0: Initial guess, e.g. the root of a nearby problem. Ignored unless it lies strictly inside the bracket.
+  :param float xtol: Absolute tolerance on the root.
+  :param float rtol: Relative tolerance on the root.
+  :param int maxiter: Maximum number of iterations.
+  :returns: Tuple of the root and the number of evaluations of func.
+  :raises RuntimeError: if the root has not converged after maxiter iterations.
+
+  The ends of the bracket are never evaluated. The target is assumed to change sign across the bracket, and whether it increases or decreases is taken from the sign of its derivative at the first iterate. Each iterate shrinks the bracket, and a Newton step which leaves the bracket is replaced by bisection, or by a step twice as far towards an infinite end. Iteration stops once a Newton step, or the estimate of the next one from the rate at which the steps contract, is within tolerance.
+  """
+  a, b = sorted([float(lo), float(hi)])
+  if x0 is not None and a < x0 < b:
+    x = float(x0)
+  elif np.isfinite(a) and np.isfinite(b):
+    x = (a + b) / 2
+  elif np.isfinite(a):
+    x = a + 1
+  elif np.isfinite(b):
+    x = b - 1
+  else:
+    x = 0.0
+
+  increasing = None
+  last_step = None
+  for iterations in range(1, maxiter + 1):
+    f, fprime = func(x)
+    if f == 0:
+      return x, iterations
+    if increasing is None and fprime != 0 and np.isfinite(fprime):
+      increasing = fprime > 0
+    if increasing is not None:
+      if (f > 0) == increasing:
+        b = x
+      else:
+        a = x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+      x_new = x - f / fprime
+    # A converged step may round onto the end of the bracket, so test it first. The step after a contracting one is estimated as step**2/last_step, which saves confirming the root with one more evaluation. The comparisons are also False if the step is NaN.
+    step = abs(x_new - x)
+    if step <= xtol + rtol * abs(x_new) or \
+      (last_step is not None and step < last_step and step**2 / last_step <= xtol + rtol * abs(x_new)):
+      return x_new, iterations
+    last_step = step
+    if not a < x_new < b:
+      if np.isfinite(a) and np.isfinite(b):
+        x_new = (a + b) / 2
+      elif np.isfinite(a):
+        x_new = x + max(abs(x), 1)
+      else:
+        x_new = x - max(abs(x), 1)
+      if b - a <= xtol + rtol * abs(x_new):
+        return x_new, iterations
+      last_step = None
+    x = x_new
+
+  raise RuntimeError("Failed to converge after %d iterations." % maxiter)
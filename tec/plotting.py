@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motive diagrams of TEC objects drawn with matplotlib.
+
+This module is imported when a plotting method of :class:`tec.TECBase` is first called, so importing tec does not load matplotlib.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib
+from tec import physical_constants
+
+def plot_motive(tec, axl = None, show = False, fontsize = False, output_voltage = False):
+  """
+  Plot an annotated motive diagram relative to ground.
+
+  The barriers and dimension lines are drawn by the barrier_artist and dimension_line methods of tec, so subclasses can override them.
+
+  :param axl: :class:`matplotlib.Axes` object on which to draw motive diagram. None results in a new figure with a subplot(111) as the location to draw the motive diagram.
+  :param bool show: If True, :meth:`pyplot.show()` the result.
+  :param int fontsize: Annotation font size.
+  """
+
+  if axl == None:
+    fig = plt.figure()
+    axl = fig.add_subplot(111)
+  else:
+    fig = plt.gcf()
+
+  # Create the axes object for the collector barrier visualization.
+  axr = fig.add_axes(axl.get_position())
+
+  # Generate the position and corresponding motive values.
+  pos = np.linspace(tec["Emitter"]["position"],tec["Collector"]["position"],100)
+  mot = tec.get_motive(pos) / physical_constants["electron_charge"]
+
+  # Plot all the items on the emitter-side axes.
+  axl.plot(pos,mot,"k")
+
+  # Work out the x-interval.
+  x_interval = tec["Collector"]["position"] - tec["Emitter"]["position"]
+
+  # maximum motive
+  plt.plot(tec.get_max_motive_ht(with_position=True), tec.get_max_motive_ht() / physical_constants["electron_charge"], 'k+')
+  plt.annotate("$\psi_{m}$", 
+    xytext = (1.1 * tec.get_max_motive_ht(with_position=True), 1.05 * tec.get_max_motive_ht() / physical_constants["electron_charge"]),
+    xy = (tec.get_max_motive_ht(with_position=True), tec.get_max_motive_ht() / physical_constants["electron_charge"]))
+  
+  # labels and dimension lines
+  for el, factr in zip(["Emitter", "Collector"],[-1,1]):
+    if "nea" in tec[el]:
+      nea = "$\chi_{" + el[0] + "}$"
+      tec.dimension_line(nea, tec[el]["position"] + (factr * 0.25 * x_interval), 
+        tec[el].calc_motive_bc() / physical_constants["electron_charge"], 
+        tec[el].calc_barrier_ht() / physical_constants["electron_charge"])
+      barrier = "$\zeta_{" + el[0] + "}$"
+      barrier_pos = 0.6
+    else:
+      barrier = "$\phi_{" + el[0] + "}$"
+      barrier_pos = 0.25
+    tec.dimension_line(barrier,tec[el]["position"] + \
+      (factr * barrier_pos * x_interval), 
+      tec[el]["voltage"], 
+      tec[el].calc_barrier_ht() / physical_constants["electron_charge"])
+
+    # Code for output voltage
+    if output_voltage:
+      if el == "Collector":
+        tec.dimension_line("eV",tec[el]["position"] + \
+          (factr * barrier_pos * x_interval), 
+          tec["Emitter"]["voltage"], 
+          tec[el]["voltage"])
+
+  tec.barrier_artist(axl, "Emitter")
+  tec.barrier_artist(axr, "Collector")
+
+  # x-scaling
+  xl_buffer = 0.25
+  xr_buffer = 0.6
+  xmin = tec["Emitter"]["position"] - (xl_buffer * x_interval)
+  xmax = tec["Collector"]["position"] + (xr_buffer * x_interval)
+  xlim = (xmin, xmax)
+
+  axl.set_xlim(xlim)
+  axr.set_xlim(xlim)
+
+  # y-scaling
+  y_lo = min([0, tec["Emitter"]["voltage"], tec["Collector"]["voltage"]])
+  y_hi = max([tec["Emitter"].calc_barrier_ht() / \
+    physical_constants["electron_charge"], 
+    tec["Collector"].calc_barrier_ht() / physical_constants["electron_charge"], 
+    tec.get_max_motive_ht()])
+
+  axl.set_ylim([y_lo, 1.1 * y_hi])
+  axr.set_ylim([y_lo, 1.1 * y_hi])
+
+  # Set the fontsize of all the elements.
+  if fontsize:
+    axs = [axl, axr]
+
+    for ax in axs:
+      # Set fontsize of annotations
+      for child in ax.get_children():
+        if isinstance(child, matplotlib.text.Annotation):
+          child.set_fontsize(fontsize)
+        if isinstance(child, matplotlib.axis.YAxis):
+          for tick_label in child.get_majorticklabels():
+            tick_label.set_fontsize(fontsize)
+
+  if show:
+    plt.show()
+
+def barrier_artist(tec, ax, el):
+  """
+  Helper method to properly draw barrier on the motive diagram using spines.
+  """
+  if el == "Emitter":
+    loc = "left"
+  else:
+    loc = "right"
+
+  # Initialize the axes borders, etc.
+  ax.xaxis.set(visible = False)
+  ax.spines["top"].set_color("none")
+  ax.spines["bottom"].set_color("none")
+  ax.spines["right"].set_color("none")
+  ax.spines["left"].set_color("none")
+  ax.patch.set_visible(False)
+
+  # Switch back on the appropriate spine.
+  ax.spines[loc].set_color("k")
+  ax.spines[loc].set_linewidth(0.25)
+
+  # Only have ticks on the proper side of the plot
+  ax.yaxis.set_ticks_position(loc)
+  ax.tick_params(direction = "outward")
+
+  # Draw the barrier of the electrode using the axes object's spines. Constrain it to the proper side of the motive curve.
+  # Fix the unit offset on the right
+  if el == "Collector":
+    x_loc = tec[el]["position"] - 1
+  else:
+    x_loc = tec[el]["position"]
+
+  ax.spines[loc].set_position(("data", x_loc))
+  ax.spines[loc].set_bounds(tec[el]["voltage"], 
+    tec[el].calc_barrier_ht() / physical_constants["electron_charge"])
+
+  # Set up ticks and labels for emitter.
+  ticks_labels = ["$\mu_{" + el[0] + "}$",
+            "$\psi_{" + el[0] + "}$",
+            "$\psi_{" + el[0] + ",CBM}$"]
+  if "nea" in tec[el]:
+    ticks_loc = matplotlib.ticker.FixedLocator([tec[el]["voltage"],
+      tec[el].calc_motive_bc() / physical_constants["electron_charge"],
+      tec[el].calc_barrier_ht() / physical_constants["electron_charge"]])
+  else:
+    del ticks_labels[-1]
+    ticks_loc = matplotlib.ticker.FixedLocator([tec[el]["voltage"],
+      tec[el].calc_barrier_ht() / physical_constants["electron_charge"]])
+
+  ticks_format = matplotlib.ticker.FixedFormatter(ticks_labels)
+
+  # Apply ticks to axes object
+  ax.yaxis.set_major_locator(ticks_loc)
+  ax.yaxis.set_major_formatter(ticks_format)
+
+def dimension_line(label, x, y_lo, y_hi, label_loc = "mi", label_pos = "left"):
+  """
+  Helper method to plot vertical dimension line on the motive diagram.
+
+  :param dict label: Dict containing sub-dicts which can instantiate 
+
+  :param string label: Label for dimension line.
+  :param float x: Horizontal placement of dimension line.
+  :param float y_lo: Lower extent of dimension line.
+  :param float y_hi: Upper extent of dimension line.
+  :param str label_loc: Vertical placement of the label. Can be "lo" "mi" or "hi".
+  :param str label_pos: Which side of the dimension line the label is placed ("left" or "right").
+  """
+  ax = plt.gca()
+
+  # Figure out where the text should go.
+  if label_pos == "right":
+    ha = "right"
+  else:
+    ha = "left"
+
+  if label_loc == "hi":
+    label_y = np.mean([y_lo, y_hi, y_hi, y_hi])
+  elif label_loc == "lo":
+    label_y = np.mean([y_lo, y_lo, y_lo, y_hi])
+  else:
+    label_y = np.mean([y_lo, y_hi])
+
+  # Write the text.
+  ax.annotate(label, xy = [x, y_lo], xytext = [x, label_y], ha = "center",
+    arrowprops = {"arrowstyle":"->", "linewidth":0.25})
+  ax.annotate(label, xy = [x, y_hi], xytext = [x, label_y], ha = "center",
+    arrowprops = {"arrowstyle":"->", "linewidth":0.25})
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test suite of the tec package.
+
+The test modules which build tables of the dimensionless Langmuir solution import :mod:`scratch_cache`, which writes them to a scratch directory rather than the user's cache whichever way the tests are run; see :func:`tec.models.dps_tables.cache_dir`.
+"""
@@ -0,0 +1,61 @@
+"""
+Module containing TEC classes which count calls for tests.
+"""
+
+from tec import TECBase
+from tec.models import Langmuir, LangmuirArray
+
+class CountingTEC(TECBase):
+  """
+  TECBase which counts its instances and each instance's calls to get_max_motive_ht.
+  """
+  instances = 0
+  calls = 0
+
+  def __init__(self, input_params):
+    CountingTEC.instances += 1
+    TECBase.__init__(self, input_params)
+
+  def get_max_motive_ht(self, with_position=False):
+    self.calls += 1
+    return TECBase.get_max_motive_ht(self, with_position)
+
+
+class CountingLangmuir(Langmuir):
+  """
+  Langmuir which counts the calls to update_motive.
+  """
+  calls = 0
+
+  def update_motive(self, changed):
+    self.calls += 1
+    return Langmuir.update_motive(self, changed)
+
+
+class CountingLangmuirArray(LangmuirArray):
+  """
+  LangmuirArray which counts the calls to get_max_motive_ht, each of which solves for the space charge.
+  """
+  calls = 0
+
+  def get_max_motive_ht(self):
+    self.calls += 1
+    return LangmuirArray.get_max_motive_ht(self)
+
+
+class CountingDPS(object):
+  """
+  Wrapper of a dimensionless Poisson's equation solution which counts its table lookups, the calls to get_position and get_motive.
+  """
+  def __init__(self, dps):
+    self.dps = dps
+    self.lookups = 0
+
+  def __getattr__(self, name):
+    attr = getattr(self.dps, name)
+    if name not in ["get_position", "get_motive"]:
+      return attr
+    def counted(*args, **kwargs):
+      self.lookups += 1
+      return attr(*args, **kwargs)
+    return counted
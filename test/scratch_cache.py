@@ -0,0 +1,14 @@
+"""
+Module which points the table cache at a scratch directory for tests.
+
+Importing it sets TEC_CACHE_DIR for the rest of the process, so the tables of the dimensionless Langmuir solution which the tests build never reach the user's cache, whichever runner or script imports the tests; see :func:`tec.models.dps_tables.cache_dir`. The directory is removed at exit.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+directory = tempfile.mkdtemp()
+os.environ["TEC_CACHE_DIR"] = directory
+atexit.register(shutil.rmtree, directory, True)
@@ -10,8 +10,12 @@ __date__ = ""
 __copyright__ = "Copyright (c) 2013 Joshua Ryan Smith"
 __license__ = ""
 
-from tec import DimensionlessLangmuirPoissonSoln
+from tec.models.langmuir import DimensionlessLangmuirPoissonSoln
+from tec.models.langmuir import get_shared_dps, warm_up_dps, dps_is_built
+from tec.models.langmuir import QuadratureLangmuirPoissonSoln, KleynenLangmuirPoissonSoln
+import scratch_cache
 import unittest
+import threading
 import numpy as np
 
 class MethodsOutputSanityCheck(unittest.TestCase):
@@ -189,4 +193,292 @@ class MethodsOutputSanityCheck(unittest.TestCase):
     """
     Ensure the get_motive and get_position methods are inverses of each other.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class SharedSolution(unittest.TestCase):
+  """
+  Tests the process-wide cache of solution objects.
+  """
+  def test_get_shared_dps_same_object(self):
+    """
+    Repeated requests with the same settings return the same object.
+    """
+    self.assertTrue(get_shared_dps() is get_shared_dps())
+
+  def test_get_shared_dps_keyed_on_settings(self):
+    """
+    Different solver settings get a different object.
+    """
+    self.assertFalse(get_shared_dps(num_points = 500) is get_shared_dps())
+
+  def test_warm_up_dps_builds(self):
+    """
+    After warming up, the solution reports itself as built.
+    """
+    self.assertFalse(dps_is_built(rhs_endpoint = 50, num_points = 200))
+    dps = warm_up_dps(rhs_endpoint = 50, num_points = 200)
+    self.assertTrue(dps_is_built(rhs_endpoint = 50, num_points = 200))
+    self.assertTrue(dps is get_shared_dps(rhs_endpoint = 50, num_points = 200))
+
+  def test_get_shared_dps_threads(self):
+    """
+    Concurrent first requests from several threads all get the same object.
+    """
+    results = []
+    def worker():
+      results.append(get_shared_dps(num_points = 300))
+    threads = [threading.Thread(target = worker) for i in range(8)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    self.assertTrue(all(dps is results[0] for dps in results))
+
+  def test_shared_matches_fresh(self):
+    """
+    The shared object gives the same answers as a freshly built one.
+    """
+    fresh = DimensionlessLangmuirPoissonSoln()
+    shared = get_shared_dps()
+    for pos in [-2., -1., 0.5, 10., 90.]:
+      self.assertEqual(fresh.get_motive(pos), shared.get_motive(pos))
+
+
+class VectorizedInput(unittest.TestCase):
+  """
+  Tests array input to get_motive and get_position.
+  """
+  def setUp(self):
+    """
+    Get shared solution object.
+    """
+    self.dlps = get_shared_dps()
+
+  def test_get_motive_matches_scalar(self):
+    """
+    Array input gives the same values as scalar input, including NaN beyond the asymptote.
+    """
+    pos = np.array([[-10., -2.5, -1.], [0., 0.5, 90.]])
+    mot = self.dlps.get_motive(pos)
+    self.assertEqual(mot.shape, pos.shape)
+    for p, m in zip(pos.ravel(), mot.ravel()):
+      scalar = self.dlps.get_motive(p)
+      self.assertTrue((np.isnan(m) and np.isnan(scalar)) or m == scalar)
+
+  def test_get_position_matches_scalar(self):
+    """
+    Array input gives the same values as scalar input on both branches.
+    """
+    mot = np.array([[-1., 0., 0.5], [5., 18., 50.]])
+    for branch in ["lhs", "rhs"]:
+      pos = self.dlps.get_position(mot, branch)
+      self.assertEqual(pos.shape, mot.shape)
+      for m, p in zip(mot.ravel(), pos.ravel()):
+        scalar = self.dlps.get_position(m, branch)
+        self.assertTrue((np.isnan(p) and np.isnan(scalar)) or p == scalar)
+
+  def test_get_position_nan_input(self):
+    """
+    NaN motive gives NaN position.
+    """
+    self.assertTrue(np.isnan(self.dlps.get_position(np.array([np.nan]))).all())
+
+  def test_scalar_returns_float(self):
+    """
+    Scalar input returns a float.
+    """
+    self.assertTrue(isinstance(self.dlps.get_motive(1.), float))
+    self.assertTrue(isinstance(self.dlps.get_position(1., "rhs"), float))
+
+
+class QuadratureBackend(unittest.TestCase):
+  """
+  Tests the quadrature backend against the ode backend and itself.
+  """
+  def setUp(self):
+    """
+    Get shared solution objects.
+    """
+    self.quad = get_shared_dps("quad")
+    self.ode = get_shared_dps("ode")
+
+  def test_instance_type(self):
+    """
+    The "quad" backend builds a QuadratureLangmuirPoissonSoln.
+    """
+    self.assertTrue(isinstance(self.quad, QuadratureLangmuirPoissonSoln))
+
+  def test_unknown_backend(self):
+    """
+    An unknown backend raises ValueError.
+    """
+    self.assertRaises(ValueError, get_shared_dps, "no such backend")
+
+  def test_agrees_with_ode(self):
+    """
+    Both backends agree where the ode solution is well resolved.
+    """
+    mot = np.linspace(0, 10, 21)
+    for branch in ["lhs", "rhs"]:
+      diff = self.quad.get_position(mot, branch) - self.ode.get_position(mot, branch)
+      self.assertTrue(np.abs(diff).max() < 1e-3)
+
+  def test_round_trip(self):
+    """
+    get_motive inverts get_position on both branches.
+    """
+    mot = np.array([0., 1e-4, 0.3, 2., 10., 15.])
+    for branch in ["lhs", "rhs"]:
+      pos = self.quad.get_position(mot, branch)
+      self.assertTrue(np.allclose(self.quad.get_motive(pos), mot, rtol = 1e-8, atol = 1e-8))
+
+  def test_rhs_beyond_ode_endpoint(self):
+    """
+    The rhs branch is not limited to the ode endpoint.
+    """
+    pos = self.quad.get_position(1e4, "rhs")
+    self.assertTrue(pos > 100)
+    self.assertAlmostEqual(self.quad.get_motive(pos), 1e4, places = 6)
+
+  def test_lhs_asymptote(self):
+    """
+    Large lhs motive approaches the asymptote and positions beyond it are NaN.
+    """
+    self.assertAlmostEqual(self.quad.get_position(1e3, "lhs"), -2.55394544, places = 7)
+    self.assertTrue(np.isnan(self.quad.get_motive(-2.554)))
+
+
+class AsymptoticTails(unittest.TestCase):
+  """
+  Tests the asymptotic expansions beyond the tabulated solution.
+  """
+  def setUp(self):
+    """
+    Get shared solution object.
+    """
+    self.dlps = get_shared_dps()
+
+  def test_lhs_tail_continuous(self):
+    """
+    Position is continuous where the lhs branch hands over to its tail.
+    """
+    end = self.dlps.lhs_end_motive
+    inside = self.dlps.get_position(end * (1 - 1e-9), "lhs")
+    outside = self.dlps.get_position(end * (1 + 1e-9), "lhs")
+    self.assertAlmostEqual(inside, outside, places = 8)
+
+  def test_rhs_tail_continuous(self):
+    """
+    Position is continuous where the rhs branch hands over to its tail.
+    """
+    end = self.dlps.rhs_end_motive
+    inside = self.dlps.get_position(end * (1 - 1e-9), "rhs")
+    outside = self.dlps.get_position(end * (1 + 1e-9), "rhs")
+    self.assertAlmostEqual(inside, outside, places = 6)
+
+  def test_lhs_tail_monotonic(self):
+    """
+    Position keeps decreasing beyond the lhs table instead of sitting on a clamp.
+    """
+    mot = self.dlps.lhs_end_motive + np.array([1., 2., 5., 10.])
+    pos = self.dlps.get_position(mot, "lhs")
+    self.assertTrue(np.all(np.diff(pos) < 0))
+    self.assertTrue(np.all(pos > self.dlps.lhs_asymptote))
+
+  def test_rhs_tail_monotonic(self):
+    """
+    Motive keeps increasing beyond the rhs table.
+    """
+    pos = self.dlps.rhs_end_position + np.array([1., 10., 100., 1000.])
+    mot = self.dlps.get_motive(pos)
+    self.assertTrue(np.all(np.diff(mot) > 0))
+
+  def test_tail_round_trip(self):
+    """
+    get_motive inverts get_position in both tails.
+    """
+    lhs_mot = self.dlps.lhs_end_motive + np.array([0.5, 3.])
+    rhs_mot = self.dlps.rhs_end_motive * np.array([2., 10., 100.])
+    lhs_pos = self.dlps.get_position(lhs_mot, "lhs")
+    rhs_pos = self.dlps.get_position(rhs_mot, "rhs")
+    self.assertTrue(np.allclose(self.dlps.get_motive(lhs_pos), lhs_mot, rtol = 1e-6))
+    self.assertTrue(np.allclose(self.dlps.get_motive(rhs_pos), rhs_mot, rtol = 1e-10))
+
+
+class PoissonEquation(unittest.TestCase):
+  """
+  Tests the right-hand side, Jacobian and multi-state integration.
+  """
+  def setUp(self):
+    """
+    Get shared solution object.
+    """
+    self.dlps = get_shared_dps()
+
+  def test_rhs_finite_at_large_motive(self):
+    """
+    The rhs acceleration stays finite and positive where exp(motive) overflows.
+    """
+    accel = self.dlps.langmuir_poisson_eq(np.array([1000., 0.]), 1.)[1]
+    self.assertTrue(np.isfinite(accel) and accel > 0)
+
+  def test_jacobian_matches_finite_difference(self):
+    """
+    The analytic Jacobian agrees with a finite difference of the right-hand side.
+    """
+    for position in [-1., 1.]:
+      state = np.array([3., 0.7])
+      jac = self.dlps.langmuir_poisson_jac(state, position)
+      h = 1e-6
+      for j in range(2):
+        step = np.zeros(2)
+        step[j] = h
+        fd = (self.dlps.langmuir_poisson_eq(state + step, position) - \
+          self.dlps.langmuir_poisson_eq(state - step, position)) / (2 * h)
+        self.assertTrue(np.allclose(jac[:,j], fd, rtol = 1e-6, atol = 1e-8))
+
+  def test_solve_states_matches_single(self):
+    """
+    Integrating several initial conditions at once matches integrating each alone.
+    """
+    ics = np.array([[0., 0.5, 1.], [0., 0.1, 0.2]])
+    position, motive = self.dlps.solve_states(ics, 5., 11)
+    self.assertEqual(motive.shape, (11, 3))
+    for i in range(3):
+      single = self.dlps.solve_states(ics[:,i:i+1], 5., 11)[1][:,0]
+      self.assertTrue(np.allclose(motive[:,i], single, rtol = 1e-7))
+
+
+class KleynenBackend(unittest.TestCase):
+  """
+  Tests the backend interpolating Kleynen's tables.
+  """
+  def setUp(self):
+    """
+    Get shared solution object.
+    """
+    self.kleynen = get_shared_dps("kleynen")
+
+  def test_instance_type(self):
+    """
+    The "kleynen" backend builds a KleynenLangmuirPoissonSoln.
+    """
+    self.assertTrue(isinstance(self.kleynen, KleynenLangmuirPoissonSoln))
+
+  def test_table_monotonic(self):
+    """
+    After dropping transcription errors, motive increases outward on both branches.
+    """
+    for branch in ["lhs", "rhs"]:
+      position, motive = self.kleynen.table[branch]
+      self.assertTrue(np.all(np.diff(motive) > 0))
+      self.assertTrue(np.all(np.diff(np.abs(position)) > 0))
+
+  def test_cross_check(self):
+    """
+    The tables agree with the ode backend to within their printed precision.
+    """
+    deviation = self.kleynen.cross_check()
+    self.assertTrue(deviation["lhs"] < 5e-3)
+    self.assertTrue(deviation["rhs"] < 0.2)
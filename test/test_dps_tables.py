@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the on-disk tables of the dimensionless Langmuir solution.
+"""
+
+from tec.models import dps_tables
+from tec.models.langmuir import DimensionlessLangmuirPoissonSoln
+from tec.models import get_shared_dps
+import scratch_cache
+import unittest
+import tempfile
+import shutil
+import os
+import numpy as np
+
+class TableCacheBase(unittest.TestCase):
+  """
+  Base class which points the table cache at a scratch directory.
+  """
+  def setUp(self):
+    """
+    Create scratch cache directory.
+    """
+    self.saved_env = os.environ.get("TEC_CACHE_DIR")
+    self.tmp_dir = tempfile.mkdtemp()
+    os.environ["TEC_CACHE_DIR"] = self.tmp_dir
+    self.params = {"solver":"test", "num_points":3}
+    self.data = np.arange(6.).reshape(2,3)
+
+  def tearDown(self):
+    """
+    Remove scratch cache directory.
+    """
+    if self.saved_env is None:
+      del os.environ["TEC_CACHE_DIR"]
+    else:
+      os.environ["TEC_CACHE_DIR"] = self.saved_env
+    shutil.rmtree(self.tmp_dir)
+
+
+class SaveLoad(TableCacheBase):
+  """
+  Tests writing and mapping tables.
+  """
+  def test_round_trip(self):
+    """
+    A saved table loads back as an identical memmap.
+    """
+    dps_tables.save_table(self.params, self.data)
+    loaded = dps_tables.load_table(self.params)
+    self.assertTrue(isinstance(loaded, np.memmap))
+    self.assertTrue(np.array_equal(loaded, self.data))
+
+  def test_missing(self):
+    """
+    Loading a table which was never written returns None.
+    """
+    self.assertTrue(dps_tables.load_table(self.params) is None)
+
+  def test_different_params(self):
+    """
+    A table written with different solver parameters is not used.
+    """
+    dps_tables.save_table(self.params, self.data)
+    self.assertTrue(dps_tables.load_table({"solver":"test", "num_points":4}) is None)
+
+  def corrupt(self, path):
+    """
+    Overwrite the last value of the table at path.
+    """
+    with open(path, "r+b") as f:
+      f.seek(-8, 2)
+      f.write(np.array([42.]).tobytes())
+
+  def count_checksums(self):
+    """
+    Replace dps_tables._checksum by a wrapper counting its calls in self.checksums.
+    """
+    self.checksums = 0
+    checksum = dps_tables._checksum
+    def counted(data):
+      self.checksums += 1
+      return checksum(data)
+    dps_tables._checksum = counted
+    self.addCleanup(setattr, dps_tables, "_checksum", checksum)
+
+  def test_corrupt_data(self):
+    """
+    An unverified table whose data does not match its checksum is stale.
+    """
+    path = dps_tables.save_table(self.params, self.data)
+    os.remove(dps_tables.marker_path(path))
+    self.corrupt(path)
+    self.assertTrue(dps_tables.load_table(self.params) is None)
+    self.assertFalse(os.path.exists(dps_tables.marker_path(path)))
+
+  def test_saved_table_not_hashed(self):
+    """
+    A table is marked as verified when it is saved, so loading it does not hash the data.
+    """
+    dps_tables.save_table(self.params, self.data)
+    self.count_checksums()
+    self.assertTrue(np.array_equal(dps_tables.load_table(self.params), self.data))
+    self.assertEqual(self.checksums, 0)
+
+  def test_verified_once(self):
+    """
+    An unmarked table is hashed on its first load only.
+    """
+    path = dps_tables.save_table(self.params, self.data)
+    os.remove(dps_tables.marker_path(path))
+    self.count_checksums()
+    for i in range(2):
+      self.assertTrue(np.array_equal(dps_tables.load_table(self.params), self.data))
+    self.assertEqual(self.checksums, 1)
+
+  def test_modified_table(self):
+    """
+    A table modified after it was marked is verified again.
+    """
+    path = dps_tables.save_table(self.params, self.data)
+    self.corrupt(path)
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+    self.assertTrue(dps_tables.load_table(self.params) is None)
+
+
+class SolutionUsesTable(TableCacheBase):
+  """
+  Tests DimensionlessLangmuirPoissonSoln reading and writing the table cache.
+  """
+  def test_table_written_and_reused(self):
+    """
+    The first instance writes a table; later instances give identical results from it.
+    """
+    built = DimensionlessLangmuirPoissonSoln(num_points = 500)
+    # The table and its marker.
+    names = sorted(os.listdir(self.tmp_dir))
+    self.assertEqual(len(names), 2)
+    self.assertEqual(dps_tables.marker_path(names[0]), names[1])
+    mapped = DimensionlessLangmuirPoissonSoln(num_points = 500)
+    for pos in [-2., -0.5, 3., 70.]:
+      self.assertEqual(built.get_motive(pos), mapped.get_motive(pos))
+
+  def test_use_table_false(self):
+    """
+    With use_table False, nothing is written.
+    """
+    DimensionlessLangmuirPoissonSoln(num_points = 500, use_table = False)
+    self.assertEqual(os.listdir(self.tmp_dir), [])
+
+  def test_shared_use_table_false(self):
+    """
+    get_shared_dps passes use_table on to the constructor.
+    """
+    get_shared_dps(num_points = 321, use_table = False)
+    self.assertEqual(os.listdir(self.tmp_dir), [])
+
+  def test_shared_use_table_rejected(self):
+    """
+    get_shared_dps rejects use_table for backends which do not take it.
+    """
+    self.assertRaises(TypeError, get_shared_dps, "quad", use_table = False)
@@ -361,3 +361,36 @@ class ParamChanged(ElectrodeAPITestBaseWithElectrode):
     self.El["nea"] = 0.7
     self.El.param_changed_and_reset()
     self.assertFalse(self.El.param_changed_and_reset())
+
+class ChangedParams(ElectrodeAPITestBaseWithElectrode):
+  """
+  Functionality of method changed_params_and_reset
+  """
+  def test_empty_by_default(self):
+    """
+    changed_params_and_reset should be empty by default
+    """
+    self.assertEqual(self.El.changed_params_and_reset(), set())
+
+  def test_names_changed_params(self):
+    """
+    changed_params_and_reset should name every changed parameter
+    """
+    self.El["voltage"] = 0.7
+    self.El["temp"] = 0.7
+    self.assertEqual(self.El.changed_params_and_reset(), set(["voltage","temp"]))
+
+  def test_ignores_emissivity(self):
+    """
+    changed_params_and_reset should not name emissivity
+    """
+    self.El["emissivity"] = 0.7
+    self.assertEqual(self.El.changed_params_and_reset(), set())
+
+  def test_reset_after_checking(self):
+    """
+    changed_params_and_reset should be empty after checking
+    """
+    self.El["voltage"] = 0.7
+    self.El.changed_params_and_reset()
+    self.assertEqual(self.El.changed_params_and_reset(), set())
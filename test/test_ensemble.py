@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the ElectrodeArray and TECArray ensemble classes.
+"""
+
+from tec import TECBase, ElectrodeArray, TECArray
+from tec.models import Langmuir, NEAC, LangmuirArray, NEACArray, spclmbs_max_dist
+from tec.models.roots import illinois
+from counting import CountingLangmuirArray
+import scratch_cache
+import unittest
+import os
+import tempfile
+import numpy as np
+
+class EnsembleTestBase(unittest.TestCase):
+  """
+  Base class providing random device parameters.
+  """
+  def setUp(self):
+    """
+    Set up parameters of a handful of random devices.
+    """
+    rng = np.random.RandomState(1)
+    self.num = 10
+    self.em = {"temp":rng.uniform(500, 2000, self.num),
+               "barrier":rng.uniform(0.5, 3, self.num),
+               "voltage":rng.uniform(-1, 1, self.num),
+               "position":0,
+               "richardson":10,
+               "emissivity":0.5,
+               "nea":rng.uniform(0, 0.3, self.num)}
+    self.co = {"temp":rng.uniform(0, 900, self.num),
+               "barrier":rng.uniform(0.2, 2.5, self.num),
+               "voltage":rng.uniform(-1, 1, self.num),
+               "position":10,
+               "richardson":10,
+               "emissivity":0.3}
+
+  def device(self, indx):
+    """
+    Return the TECBase object for one of the devices.
+    """
+    pick = lambda params: dict((key, np.broadcast_to(val, (self.num,))[indx]) \
+      for key, val in params.items())
+    return TECBase({"Emitter":pick(self.em), "Collector":pick(self.co)})
+
+
+class SetInput(EnsembleTestBase):
+  """
+  ElectrodeArray checks its input like Electrode.
+  """
+  def test_negative_temp(self):
+    """
+    A negative element of temp raises ValueError.
+    """
+    self.em["temp"][3] = -1
+    self.assertRaises(ValueError, ElectrodeArray, self.em)
+
+  def test_emissivity_range(self):
+    """
+    An element of emissivity outside (0, 1) raises ValueError.
+    """
+    self.em["emissivity"] = [0.5, 1.0]
+    self.assertRaises(ValueError, ElectrodeArray, self.em)
+
+  def test_non_numeric(self):
+    """
+    Non numeric input raises TypeError.
+    """
+    self.em["barrier"] = ["a", 1]
+    self.assertRaises(TypeError, ElectrodeArray, self.em)
+
+  def test_missing_key(self):
+    """
+    Missing keys raise KeyError.
+    """
+    del self.em["temp"]
+    self.assertRaises(KeyError, ElectrodeArray, self.em)
+
+  def test_converts_to_si(self):
+    """
+    ElectrodeArray stores the same SI values as Electrode.
+    """
+    El = ElectrodeArray(self.em)
+    self.assertEqual(El["barrier"][0], self.device(0)["Emitter"]["barrier"])
+    self.assertEqual(El["nea"][0], self.device(0)["Emitter"]["nea"])
+
+
+class MatchesTECBase(EnsembleTestBase):
+  """
+  TECArray calculators match those of TECBase device by device.
+  """
+  def test_calculators(self):
+    """
+    Current, power and efficiency methods match TECBase.
+    """
+    tec_array = TECArray({"Emitter":self.em, "Collector":self.co})
+    methods = ["get_max_motive_ht", "calc_contact_potential", "calc_output_voltage",
+               "calc_forward_current_density", "calc_back_current_density",
+               "calc_output_current_density", "calc_output_power_density",
+               "calc_carnot_efficiency", "calc_radiation_efficiency",
+               "calc_electronic_efficiency", "calc_total_efficiency"]
+    for method in methods:
+      values = getattr(tec_array, method)()
+      for indx in range(self.num):
+        expected = getattr(self.device(indx), method)()
+        if np.isnan(expected):
+          self.assertTrue(np.isnan(values[indx]))
+        else:
+          self.assertAlmostEqual(values[indx]/expected, 1, places=10)
+
+  def test_max_power_pt(self):
+    """
+    calc_max_power_pt matches TECBase.calc_max_power_pt.
+    """
+    tec_array = TECArray({"Emitter":self.em, "Collector":self.co})
+    max_power = tec_array.calc_max_power_pt()
+    for indx in range(self.num):
+      expected = self.device(indx).calc_max_power_pt()
+      self.assertAlmostEqual(max_power["output_voltage"][indx], expected["output_voltage"])
+      if np.isnan(expected["total_efficiency"]):
+        self.assertTrue(np.isnan(max_power["total_efficiency"][indx]))
+      else:
+        self.assertAlmostEqual(max_power["total_efficiency"][indx], expected["total_efficiency"])
+
+  def test_max_power_pt_restores_voltage(self):
+    """
+    calc_max_power_pt puts the collector voltages back if the efficiency raises.
+    """
+    tec_array = TECArray({"Emitter":self.em, "Collector":self.co})
+    saved_voltage = tec_array["Collector"]["voltage"].copy()
+    def fail():
+      raise ArithmeticError
+    tec_array.calc_total_efficiency = fail
+    self.assertRaises(ArithmeticError, tec_array.calc_max_power_pt)
+    np.testing.assert_array_equal(tec_array["Collector"]["voltage"], saved_voltage)
+
+
+class SpaceChargeMatchesScalar(unittest.TestCase):
+  """
+  LangmuirArray and NEACArray match Langmuir and NEAC device by device.
+  """
+  def setUp(self):
+    """
+    Set up random devices covering all three operating modes.
+    """
+    rng = np.random.RandomState(2)
+    self.num = 12
+    self.em = {"temp":rng.uniform(900, 1800, self.num),
+               "barrier":rng.uniform(1.0, 2.5, self.num),
+               "voltage":0,
+               "position":0,
+               "richardson":rng.uniform(10, 120, self.num),
+               "emissivity":0.5}
+    self.co = {"temp":rng.uniform(300, 600, self.num),
+               "barrier":rng.uniform(0.5, 1.5, self.num),
+               "voltage":rng.uniform(-0.5, 1.5, self.num),
+               "position":rng.uniform(0.5, 50, self.num),
+               "richardson":10,
+               "emissivity":0.3,
+               "nea":rng.uniform(0, 0.8, self.num)}
+
+  def compare(self, scalar_class, array_class, crit_key):
+    """
+    Compare mode boundaries, max motive and output current density.
+    """
+    tec_array = array_class({"Emitter":self.em, "Collector":self.co})
+    sat_pt, crit_pt = tec_array.get_mode_boundaries()
+    max_motive_ht = tec_array.get_max_motive_ht()
+    output_current_density = tec_array.calc_output_current_density()
+    pick = lambda params, indx: dict((key, np.broadcast_to(val, (self.num,))[indx]) \
+      for key, val in params.items())
+    for indx in range(self.num):
+      tec = scalar_class({"Emitter":pick(self.em, indx), "Collector":pick(self.co, indx)})
+      md = tec["motive_data"]
+      self.assertAlmostEqual(sat_pt["output_voltage"][indx], \
+        md["saturation_pt"]["output_voltage"], places=9)
+      self.assertAlmostEqual(crit_pt["output_voltage"][indx], md[crit_key]["output_voltage"], places=9)
+      self.assertAlmostEqual(max_motive_ht[indx]/md["max_motive_ht"], 1, places=10)
+      self.assertAlmostEqual(output_current_density[indx]/tec.calc_output_current_density(), \
+        1, places=9)
+
+  def compare_max_power_pt(self, scalar_class, array_class):
+    """
+    Compare calc_max_power_pt.
+    """
+    max_power = array_class({"Emitter":self.em, "Collector":self.co}).calc_max_power_pt()
+    pick = lambda params, indx: dict((key, np.broadcast_to(val, (self.num,))[indx]) \
+      for key, val in params.items())
+    for indx in range(self.num):
+      expected = scalar_class({"Emitter":pick(self.em, indx), \
+        "Collector":pick(self.co, indx)}).calc_max_power_pt()
+      self.assertAlmostEqual(max_power["output_voltage"][indx], expected["output_voltage"], places=6)
+      self.assertAlmostEqual(max_power["output_power_density"][indx]/ \
+        expected["output_power_density"], 1, places=9)
+      self.assertAlmostEqual(max_power["total_efficiency"][indx]/expected["total_efficiency"], \
+        1, places=6)
+
+  def test_langmuir(self):
+    """
+    LangmuirArray matches Langmuir.
+    """
+    del self.co["nea"]
+    self.compare(Langmuir, LangmuirArray, "critical_pt")
+
+  def test_neac(self):
+    """
+    NEACArray matches NEAC.
+    """
+    self.compare(NEAC, NEACArray, "virt_critical_pt")
+
+  def test_langmuir_max_power_pt(self):
+    """
+    LangmuirArray.calc_max_power_pt matches Langmuir.calc_max_power_pt.
+    """
+    del self.co["nea"]
+    self.compare_max_power_pt(Langmuir, LangmuirArray)
+
+  def test_neac_max_power_pt(self):
+    """
+    NEACArray.calc_max_power_pt matches NEAC.calc_max_power_pt.
+    """
+    self.compare_max_power_pt(NEAC, NEACArray)
+
+  def test_one_solve_per_query(self):
+    """
+    Each current, power and efficiency query of LangmuirArray solves for the max motive once.
+    """
+    del self.co["nea"]
+    tec_array = CountingLangmuirArray({"Emitter":self.em, "Collector":self.co})
+    for name in ["calc_forward_current_density", "calc_output_current_density",
+                 "calc_output_power_density", "calc_radiation_efficiency",
+                 "calc_electronic_efficiency", "calc_total_efficiency", "calc_max_power_pt"]:
+      tec_array.calls = 0
+      getattr(tec_array, name)()
+      self.assertEqual(tec_array.calls, 1, name)
+
+
+class Illinois(unittest.TestCase):
+  """
+  Functionality of the batched rootfinder.
+  """
+  def test_roots(self):
+    """
+    illinois finds the roots of many functions at once.
+    """
+    targets = np.array([0.5, 2.0, 7.0])
+    roots = illinois(lambda x, indx: x**3 - targets[indx], np.zeros(3), 10)
+    self.assertTrue(np.allclose(roots, targets**(1./3), rtol=1e-12))
+
+  def test_no_sign_change(self):
+    """
+    illinois returns NaN where the bracket does not change sign.
+    """
+    roots = illinois(lambda x, indx: x**2 - 1, np.array([0, 2]), 3)
+    self.assertAlmostEqual(roots[0], 1)
+    self.assertTrue(np.isnan(roots[1]))
+
+  def test_nan_target(self):
+    """
+    illinois returns NaN where the target is NaN inside the bracket, and solves the other problems.
+    """
+    targets = np.array([0.5, 2.0, 7.0])
+    roots = illinois(lambda x, indx: np.where((indx == 1) & (x > 0) & (x < 10), np.nan, \
+      x**3 - targets[indx]), np.zeros(3), 10)
+    self.assertTrue(np.isnan(roots[1]))
+    self.assertTrue(np.allclose(roots[[0, 2]], targets[[0, 2]]**(1./3), rtol=1e-12))
+
+
+
+class MotiveProfiles(SpaceChargeMatchesScalar):
+  """
+  LangmuirArray.get_motive matches Langmuir.get_motive device by device.
+  """
+  def compare(self, scalar_class, array_class, crit_key):
+    """
+    Compare the motive profiles over a grid of positions.
+    """
+    pos = np.linspace(0, 50e-6, 12).reshape(4, 3)
+    profiles = array_class({"Emitter":self.em, "Collector":self.co}).get_motive(pos)
+    self.assertEqual(profiles.shape, (self.num, 4, 3))
+    pick = lambda params, indx: dict((key, np.broadcast_to(val, (self.num,))[indx]) \
+      for key, val in params.items())
+    for indx in range(self.num):
+      tec = scalar_class({"Emitter":pick(self.em, indx), "Collector":pick(self.co, indx)})
+      expected = tec.get_motive(pos)
+      self.assertTrue(np.array_equal(np.isnan(expected), np.isnan(profiles[indx])))
+      self.assertTrue(np.allclose(profiles[indx][~np.isnan(expected)], \
+        expected[~np.isnan(expected)], rtol=1e-10, atol=0))
+
+
+class ModeMap(unittest.TestCase):
+  """
+  Mode maps over spacing and output voltage.
+  """
+  def setUp(self):
+    """
+    Set up a NEAC material set over a range of spacings.
+    """
+    self.em = {"temp":1000, "barrier":1, "voltage":0, "position":0, \
+      "richardson":10, "emissivity":0.5}
+    self.co = {"temp":300, "barrier":0.8, "voltage":0, \
+      "position":np.logspace(-1, 2, 7), "richardson":10, "emissivity":0.5, "nea":0.5}
+    self.output_voltage = np.linspace(-1, 1, 9)
+
+  def test_shape(self):
+    """
+    The map has one row per device and one column per output voltage.
+    """
+    mode_map = NEACArray({"Emitter":self.em, "Collector":self.co}).calc_mode_map( \
+      self.output_voltage)
+    self.assertEqual(mode_map["mode"].shape, (7, 9))
+    self.assertEqual(mode_map["saturation_pt"]["output_voltage"].shape, (7,))
+    self.assertEqual(mode_map["spclmbs_max_dist"].shape, (7,))
+
+  def test_matches_scalar(self):
+    """
+    Each label matches the operating mode of the NEAC device at that point.
+    """
+    mode_map = NEACArray({"Emitter":self.em, "Collector":self.co}).calc_mode_map( \
+      self.output_voltage)
+    modes = NEACArray.modes
+    for i, position in enumerate(self.co["position"]):
+      for j, voltage in enumerate(self.output_voltage):
+        co = dict(self.co, position=position, voltage=voltage)
+        tec = NEAC({"Emitter":dict(self.em), "Collector":co})
+        max_motive_ht = tec["motive_data"]["max_motive_ht"]
+        if modes[mode_map["mode"][i, j]] == "accelerating":
+          self.assertEqual(max_motive_ht, tec["Emitter"].calc_barrier_ht())
+        elif modes[mode_map["mode"][i, j]] == "retarding":
+          self.assertEqual(max_motive_ht, tec["Collector"].calc_barrier_ht())
+        else:
+          self.assertTrue(max_motive_ht > tec["Emitter"].calc_barrier_ht())
+          self.assertTrue(max_motive_ht > tec["Collector"].calc_barrier_ht())
+
+  def test_spclmbs(self):
+    """
+    Devices closer than spclmbs_max_dist have no space charge limited mode.
+    """
+    mode_map = NEACArray({"Emitter":self.em, "Collector":self.co}).calc_mode_map( \
+      np.linspace(-1, 1, 1001))
+    spacing = self.co["position"] * 1e-6
+    has_scl = np.any(mode_map["mode"] == 1, axis=-1)
+    self.assertTrue(np.all(has_scl == (spacing > mode_map["spclmbs_max_dist"])))
+    self.assertTrue(np.any(has_scl) and not np.all(has_scl))
+
+  def test_langmuir(self):
+    """
+    LangmuirArray maps with the critical point as the upper boundary.
+    """
+    del self.co["nea"]
+    mode_map = LangmuirArray({"Emitter":self.em, "Collector":self.co}).calc_mode_map(0.1)
+    self.assertEqual(mode_map["mode"].shape, (7,))
+    self.assertTrue("critical_pt" in mode_map)
+
+
+class SpclmbsSurface(unittest.TestCase):
+  """
+  The spclmbs_max_dist surface over material parameters.
+  """
+  def test_matches_neac(self):
+    """
+    Each element matches NEAC's spclmbs_max_dist.
+    """
+    temp = np.array([800, 1200, 1600])[:, np.newaxis]
+    nea = np.array([0.1, 0.5])
+    surface = spclmbs_max_dist(temp, 1.2, 60, nea)
+    self.assertEqual(surface.shape, (3, 2))
+    for i in range(3):
+      for j in range(2):
+        tec = NEAC({"Emitter":{"temp":temp[i, 0], "barrier":1.2, "voltage":0, "position":0, \
+          "richardson":60, "emissivity":0.5}, \
+          "Collector":{"temp":300, "barrier":0.8, "voltage":0, "position":10, \
+          "richardson":10, "emissivity":0.5, "nea":nea[j]}})
+        self.assertAlmostEqual(surface[i, j]/tec["motive_data"]["spclmbs_max_dist"], 1, places=12)
+
+  def test_zero_temp(self):
+    """
+    Elements where temp is 0 are NaN.
+    """
+    surface = spclmbs_max_dist([0, 1000], 1, 10, 0.5)
+    self.assertTrue(np.isnan(surface[0]))
+    self.assertTrue(surface[1] > 0)
+
+  def test_bad_input(self):
+    """
+    Parameters are checked like those of ElectrodeArray.
+    """
+    self.assertRaises(ValueError, spclmbs_max_dist, 1000, 1, 10, -0.5)
+    self.assertRaises(TypeError, spclmbs_max_dist, 1000, "a", 10, 0.5)
+
+  def test_file(self):
+    """
+    The grid file holds the result and the parameters in their given shapes.
+    """
+    temp = np.linspace(800, 2000, 5)[:, np.newaxis]
+    nea = np.linspace(0.1, 1, 4)
+    handle, filename = tempfile.mkstemp(suffix=".npz")
+    os.close(handle)
+    try:
+      surface = spclmbs_max_dist(temp, 1.5, 120, nea, filename=filename)
+      grid = np.load(filename)
+      self.assertTrue(np.array_equal(grid["spclmbs_max_dist"], surface))
+      self.assertTrue(np.array_equal(grid["temp"], temp))
+      self.assertTrue(np.array_equal(grid["nea"], nea))
+      self.assertEqual(grid["barrier"], 1.5)
+      grid.close()
+    finally:
+      os.remove(filename)
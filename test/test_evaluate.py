@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the stateless evaluate function.
+"""
+
+from tec import TECBase, evaluate
+from tec.models import Langmuir, NEAC
+from counting import CountingTEC
+from multiprocessing.pool import ThreadPool
+import copy
+import scratch_cache
+import unittest
+import numpy as np
+
+class Evaluate(unittest.TestCase):
+  """
+  evaluate matches the methods of the models and leaves its inputs alone.
+  """
+  def setUp(self):
+    """
+    Set up the parameters of a device.
+    """
+    self.params = {"Emitter":{"temp":1000, "barrier":1, "voltage":0, "position":0,
+                              "richardson":10, "emissivity":0.5},
+                   "Collector":{"temp":300, "barrier":0.8, "voltage":0.1, "position":10,
+                                "richardson":10, "emissivity":0.5, "nea":0.2}}
+
+  def test_matches_methods(self):
+    """
+    Results match those of the methods of a model object.
+    """
+    quantities = ["calc_output_power_density", "calc_total_efficiency", \
+      ("calc_output_power_density", "voltage")]
+    for model in [TECBase, Langmuir, NEAC]:
+      results = evaluate(model, self.params, quantities)
+      tec = model(copy.deepcopy(self.params))
+      self.assertEqual(results["calc_output_power_density"], tec.calc_output_power_density())
+      self.assertEqual(results["calc_total_efficiency"], tec.calc_total_efficiency())
+      self.assertEqual(results[("calc_output_power_density", "voltage")], \
+        tec.calc_output_power_density("voltage"))
+
+  def test_params_unchanged(self):
+    """
+    The input dict is not modified.
+    """
+    saved = copy.deepcopy(self.params)
+    evaluate(Langmuir, self.params, [("calc_output_power_density", "voltage", True)])
+    self.assertEqual(self.params, saved)
+
+  def test_cache(self):
+    """
+    Results found in the cache are not evaluated again.
+    """
+    cache = {}
+    CountingTEC.instances = 0
+    first = evaluate(CountingTEC, self.params, ["calc_output_current_density"], cache)
+    second = evaluate(CountingTEC, copy.deepcopy(self.params), ["calc_output_current_density"], cache)
+    self.assertEqual(first, second)
+    self.assertEqual(CountingTEC.instances, 1)
+    evaluate(CountingTEC, self.params, ["calc_output_current_density", "calc_total_efficiency"], cache)
+    self.assertEqual(CountingTEC.instances, 2)
+    self.params["Collector"]["voltage"] = 0.2
+    evaluate(CountingTEC, self.params, ["calc_output_current_density"], cache)
+    self.assertEqual(CountingTEC.instances, 3)
+
+  def test_threads(self):
+    """
+    Concurrent evaluations in threads match serial ones.
+    """
+    param_list = []
+    for voltage in np.linspace(0, 1, 40):
+      params = copy.deepcopy(self.params)
+      params["Collector"]["voltage"] = voltage
+      param_list.append(params)
+    quantities = ["calc_output_current_density", ("calc_output_power_density", "max")]
+    func = lambda params: evaluate(NEAC, params, quantities)
+
+    pool = ThreadPool(4)
+    try:
+      concurrent = pool.map(func, param_list)
+    finally:
+      pool.close()
+    self.assertEqual(concurrent, [func(params) for params in param_list])
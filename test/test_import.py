@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the cost of importing tec and the plotting module it loads when first needed.
+"""
+
+from tec import TECBase
+import os
+import subprocess
+import sys
+import unittest
+
+# The modules tec itself needs at import time.
+dependencies = "numpy, scipy.interpolate, scipy.optimize, scipy.special, scipy.integrate"
+
+# Imports the given modules and prints the time it took and the top level packages loaded.
+script = """
+import sys, time
+start = time.time()
+import %s
+end = time.time()
+print end - start, " ".join(sorted(set(name.split(".")[0] for name, module in sys.modules.items() \\
+  if module is not None)))
+"""
+
+# Top level packages importing tec may load besides those loaded by its dependencies.
+allowed_packages = set(["tec", "json", "_json"])
+
+def run_import(modules):
+  """
+  Import modules in a fresh interpreter from the root of the package.
+
+  :returns: Tuple of the time taken in s and the set of top level packages loaded.
+  """
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  output = subprocess.check_output([sys.executable, "-c", script % modules], cwd=root).split()
+  return float(output[0]), set(output[1:])
+
+class RecordingTEC(TECBase):
+  """
+  TECBase which records the calls to its plotting helpers instead of drawing.
+  """
+  def __init__(self, input_params):
+    self.calls = []
+    TECBase.__init__(self, input_params)
+
+  def barrier_artist(self, ax, el):
+    self.calls.append(("barrier_artist", el))
+
+  def dimension_line(self, label, x, y_lo, y_hi, label_loc = "mi", label_pos = "left"):
+    self.calls.append(("dimension_line", label))
+
+
+class Import(unittest.TestCase):
+  """
+  Importing tec costs little more than importing its dependencies.
+  """
+  def test_no_matplotlib(self):
+    """
+    Importing tec does not load matplotlib.
+    """
+    self.assertNotIn("matplotlib", run_import("tec")[1])
+
+  def test_loaded_packages(self):
+    """
+    Importing tec loads no packages beyond its dependencies and an allowed few.
+    """
+    extra = run_import("tec")[1] - run_import(dependencies)[1]
+    self.assertTrue(extra.issubset(allowed_packages), extra - allowed_packages)
+
+  def test_import_time(self):
+    """
+    Importing tec takes at most 1.5 times as long as importing its dependencies.
+
+    Both are the best of five runs in fresh interpreters, so the comparison does not depend on the speed of the machine. tec itself adds about a quarter; an eager import of matplotlib alone would more than double the time.
+    """
+    tec_time = min(run_import("tec")[0] for i in range(5))
+    dependencies_time = min(run_import(dependencies)[0] for i in range(5))
+    self.assertLess(tec_time, 1.5 * dependencies_time)
+
+
+class Plotting(unittest.TestCase):
+  """
+  plot_motive draws with the methods of the object.
+  """
+  def test_overridden_helpers(self):
+    """
+    plot_motive calls the barrier_artist and dimension_line of a subclass.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    em = {"temp":1000, "barrier":1, "voltage":0, "position":0,
+          "richardson":10, "emissivity":0.5}
+    co = {"temp":300, "barrier":0.8, "voltage":0.1, "position":10,
+          "richardson":10, "emissivity":0.5}
+    tec = RecordingTEC({"Emitter":em, "Collector":co})
+    tec.plot_motive(output_voltage = True)
+    plt.close("all")
+    self.assertEqual(tec.calls, [("dimension_line", "$\phi_{E}$"), ("dimension_line", "$\phi_{C}$"),
+      ("dimension_line", "eV"), ("barrier_artist", "Emitter"), ("barrier_artist", "Collector")])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the characteristic curves of the Langmuir and NEAC models.
+"""
+
+from tec.models import Langmuir, NEAC
+import scratch_cache
+import unittest
+import numpy as np
+
+class CurveTestBase(unittest.TestCase):
+  """
+  Base class providing Langmuir and NEAC objects.
+  """
+  def setUp(self):
+    """
+    Set up a Langmuir object and NEAC objects inside and outside the spclmbs.
+    """
+    em = {"temp":1000,"barrier":1.0,"voltage":0,"position":0,\
+          "richardson":10,"emissivity":0.5}
+    co = {"temp":300,"barrier":0.8,"voltage":0,"position":10,\
+          "richardson":10,"emissivity":0.5}
+    self.tecs = [Langmuir({"Emitter":em, "Collector":co}),
+                 NEAC({"Emitter":dict(em, nea=0.5), "Collector":dict(co, nea=0.5)}),
+                 NEAC({"Emitter":dict(em, nea=0.5), \
+                       "Collector":dict(co, nea=0.5, position=0.1)})]
+
+
+class JVCurve(CurveTestBase):
+  """
+  Functionality of method calc_jv_curve.
+  """
+  def test_matches_rootfinder(self):
+    """
+    calc_jv_curve current densities match calc_output_current_density.
+    """
+    for tec in self.tecs:
+      jv = tec.calc_jv_curve(num_points=20)
+      for voltage, current in zip(jv["output_voltage"], jv["output_current_density"]):
+        tec["Collector"]["voltage"] = voltage + tec["Emitter"]["voltage"]
+        self.assertAlmostEqual(tec.calc_output_current_density()/current, 1, places=6)
+
+  def test_voltage_increasing(self):
+    """
+    calc_jv_curve output_voltage is strictly increasing.
+    """
+    for tec in self.tecs:
+      jv = tec.calc_jv_curve()
+      self.assertTrue(np.all(np.diff(jv["output_voltage"]) > 0))
+
+  def test_voltage_limits(self):
+    """
+    calc_jv_curve respects lo_voltage and hi_voltage.
+    """
+    for tec in self.tecs:
+      jv = tec.calc_jv_curve(lo_voltage=-12, hi_voltage=2)
+      self.assertEqual(jv["output_voltage"][0], -12)
+      self.assertEqual(jv["output_voltage"][-1], 2)
+
+  def test_object_unchanged(self):
+    """
+    calc_jv_curve does not change the object's voltages.
+    """
+    tec = self.tecs[0]
+    max_motive_ht = tec["motive_data"]["max_motive_ht"]
+    tec.calc_jv_curve()
+    self.assertEqual(tec["Collector"]["voltage"], 0)
+    self.assertEqual(tec["motive_data"]["max_motive_ht"], max_motive_ht)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the upkeep of motive_data in the Langmuir and NEAC models.
+"""
+
+from tec.models import Langmuir, NEAC
+import scratch_cache
+import unittest
+import numpy as np
+
+class MotiveDataTestBase(unittest.TestCase):
+  """
+  Base class providing space charge limited Langmuir and NEAC objects.
+  """
+  def setUp(self):
+    """
+    Set up input parameters for a device in space charge limited mode.
+    """
+    self.em = {"temp":1000,"barrier":1.0,"voltage":0,"position":0,\
+               "richardson":10,"emissivity":0.5}
+    self.co = {"temp":300,"barrier":0.8,"voltage":0,"position":10,\
+               "richardson":10,"emissivity":0.5}
+    self.neac_em = dict(self.em, nea=0.5)
+    self.neac_co = dict(self.co, nea=0.5)
+
+
+class VoltageOnlyUpdate(MotiveDataTestBase):
+  """
+  Voltage changes only recalculate the operating mode and max motive.
+  """
+  def test_langmuir_reuses_points(self):
+    """
+    Langmuir keeps saturation_pt and critical_pt after a voltage change.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    sat_pt = TECL["motive_data"]["saturation_pt"]
+    crit_pt = TECL["motive_data"]["critical_pt"]
+    TECL["Collector"]["voltage"] = 0.2
+    self.assertIs(TECL["motive_data"]["saturation_pt"], sat_pt)
+    self.assertIs(TECL["motive_data"]["critical_pt"], crit_pt)
+
+  def test_neac_reuses_points(self):
+    """
+    NEAC keeps spclmbs_max_dist, saturation_pt and virt_critical_pt after a voltage change.
+    """
+    TECN = NEAC({"Emitter":self.neac_em, "Collector":self.neac_co})
+    sat_pt = TECN["motive_data"]["saturation_pt"]
+    crit_pt = TECN["motive_data"]["virt_critical_pt"]
+    TECN["Emitter"]["voltage"] = 0.2
+    self.assertIs(TECN["motive_data"]["saturation_pt"], sat_pt)
+    self.assertIs(TECN["motive_data"]["virt_critical_pt"], crit_pt)
+
+  def test_other_change_recalculates(self):
+    """
+    Langmuir recalculates saturation_pt when the emitter temp changes.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    sat_pt = TECL["motive_data"]["saturation_pt"]
+    TECL["Emitter"]["temp"] = 1100
+    self.assertIsNot(TECL["motive_data"]["saturation_pt"], sat_pt)
+
+  def test_langmuir_matches_fresh_object(self):
+    """
+    Langmuir max_motive_ht after voltage changes matches a fresh object in every mode.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    for voltage in [-1.0, 0.2, 1.0]:
+      TECL["Collector"]["voltage"] = voltage
+      fresh = Langmuir({"Emitter":self.em, "Collector":dict(self.co, voltage=voltage)})
+      self.assertEqual(TECL["motive_data"]["max_motive_ht"], \
+                       fresh["motive_data"]["max_motive_ht"])
+
+  def test_langmuir_strips_new_nea(self):
+    """
+    An nea set before a voltage change is removed as in a fresh object.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    TECL["motive_data"]["max_motive_ht"]
+    TECL["Collector"]["nea"] = 0.3
+    TECL["Collector"]["voltage"] = 1.0
+    fresh = Langmuir({"Emitter":self.em, "Collector":dict(self.co, voltage=1.0)})
+    self.assertNotIn("nea", TECL["Collector"])
+    self.assertEqual(TECL["motive_data"]["max_motive_ht"], \
+                     fresh["motive_data"]["max_motive_ht"])
+    self.assertEqual(TECL.calc_output_current_density(), \
+                     fresh.calc_output_current_density())
+
+  def test_neac_matches_fresh_object(self):
+    """
+    NEAC max_motive_ht after voltage changes matches a fresh object in every mode.
+    """
+    TECN = NEAC({"Emitter":self.neac_em, "Collector":self.neac_co})
+    for voltage in [-1.0, 0.2, 1.0]:
+      TECN["Collector"]["voltage"] = voltage
+      fresh = NEAC({"Emitter":self.neac_em, \
+                    "Collector":dict(self.neac_co, voltage=voltage)})
+      self.assertEqual(TECN["motive_data"]["max_motive_ht"], \
+                       fresh["motive_data"]["max_motive_ht"])
+
+
+class LazyItems(MotiveDataTestBase):
+  """
+  Items of motive_data are calculated when first read.
+  """
+  def test_nothing_calculated_on_construction(self):
+    """
+    Constructing a Langmuir object calculates no motive_data items.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    self.assertEqual(len(TECL["motive_data"]), 0)
+
+  def test_contact_potential_needs_no_motive_data(self):
+    """
+    calc_contact_potential calculates no motive_data items.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    TECL.calc_contact_potential()
+    self.assertEqual(len(TECL["motive_data"]), 0)
+
+  def test_accelerating_mode_skips_critical_pt(self):
+    """
+    max_motive_ht in accelerating mode does not calculate critical_pt.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":dict(self.co, voltage=-20)})
+    TECL["motive_data"]["max_motive_ht"]
+    self.assertIn("saturation_pt", TECL["motive_data"])
+    self.assertNotIn("critical_pt", TECL["motive_data"])
+
+  def test_voltage_change_discards_max_motive_ht(self):
+    """
+    A voltage change discards only max_motive_ht.
+    """
+    TECN = NEAC({"Emitter":self.neac_em, "Collector":self.neac_co})
+    TECN["motive_data"]["max_motive_ht"]
+    TECN["Collector"]["voltage"] = 0.2
+    self.assertNotIn("max_motive_ht", TECN["motive_data"])
+    self.assertIn("saturation_pt", TECN["motive_data"])
+
+  def test_unknown_key(self):
+    """
+    Keys without a calculator raise KeyError.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    self.assertRaises(KeyError, TECL["motive_data"].__getitem__, "spam")
+
+
+class MotiveProfile(MotiveDataTestBase):
+  """
+  Functionality of get_motive and the motive_profile entry of motive_data.
+  """
+  def test_shapes(self):
+    """
+    get_motive returns a float for float input and an array shaped like array input.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    self.assertIsInstance(TECL.get_motive(1e-6), float)
+    self.assertEqual(TECL.get_motive(np.zeros((3, 4))).shape, (3, 4))
+
+  def test_array_matches_scalar(self):
+    """
+    get_motive of an array matches get_motive of its elements.
+    """
+    TECN = NEAC({"Emitter":self.neac_em, "Collector":self.neac_co})
+    pos = np.linspace(0, 10e-6, 5)
+    motive = TECN.get_motive(pos)
+    for indx in range(pos.size):
+      self.assertEqual(motive[indx], TECN.get_motive(pos[indx]))
+
+  def test_boundary_values(self):
+    """
+    get_motive matches the electrode motive boundary conditions.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":dict(self.co, voltage=0.2)})
+    self.assertAlmostEqual(TECL.get_motive(0)/TECL["Emitter"].calc_motive_bc(), 1, places=5)
+    self.assertAlmostEqual(TECL.get_motive(10e-6)/TECL["Collector"].calc_motive_bc(), 1, places=5)
+
+  def test_voltage_change_updates_profile(self):
+    """
+    A voltage change recalculates motive_profile.
+    """
+    TECL = Langmuir({"Emitter":self.em, "Collector":self.co})
+    TECL.get_motive(1e-6)
+    TECL["Collector"]["voltage"] = 0.2
+    self.assertNotIn("motive_profile", TECL["motive_data"])
+    fresh = Langmuir({"Emitter":self.em, "Collector":dict(self.co, voltage=0.2)})
+    self.assertEqual(TECL.get_motive(1e-6), fresh.get_motive(1e-6))
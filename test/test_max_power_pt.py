@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the maximum power point solvers.
+"""
+
+from tec import TECBase, max_power_pt, physical_constants
+from tec.models import Langmuir, NEAC
+from counting import CountingDPS
+import scratch_cache
+import unittest
+import numpy as np
+
+class MaxPowerPtTestBase(unittest.TestCase):
+  """
+  Base class providing electrode input parameters.
+  """
+  def setUp(self):
+    """
+    Set up emitter and collector input parameters.
+    """
+    self.em = {"temp":1000,"barrier":1.0,"voltage":0,"position":0,\
+               "richardson":10,"emissivity":0.5}
+    self.co = {"temp":300,"barrier":0.8,"voltage":0,"position":10,\
+               "richardson":10,"emissivity":0.5}
+
+
+class TECBaseMaxPowerPt(MaxPowerPtTestBase):
+  """
+  Functionality of TECBase.calc_max_power_pt.
+  """
+  def test_matches_max_value(self):
+    """
+    calc_max_power_pt matches calc_output_power_density("max").
+    """
+    for co_barrier in [0.4, 0.8, 1.1]:
+      tec = TECBase({"Emitter":self.em, "Collector":dict(self.co, barrier=co_barrier)})
+      max_power_pt = tec.calc_max_power_pt()
+      self.assertGreaterEqual(max_power_pt["output_power_density"]/ \
+        tec.calc_output_power_density("max"), 1 - 1e-6)
+
+  def test_consistent_with_object(self):
+    """
+    calc_max_power_pt values are those of the object at that voltage.
+    """
+    tec = TECBase({"Emitter":dict(self.em, voltage=0.3), "Collector":dict(self.co, voltage=0.3)})
+    max_power_pt = tec.calc_max_power_pt()
+    tec["Collector"]["voltage"] = 0.3 + max_power_pt["output_voltage"]
+    self.assertAlmostEqual(max_power_pt["output_current_density"]/ \
+      tec.calc_output_current_density(), 1)
+    self.assertAlmostEqual(max_power_pt["total_efficiency"], tec.calc_total_efficiency())
+
+  def test_object_unchanged(self):
+    """
+    calc_max_power_pt leaves the collector voltage alone.
+    """
+    tec = TECBase({"Emitter":self.em, "Collector":self.co})
+    tec.calc_max_power_pt()
+    self.assertEqual(tec["Collector"]["voltage"], 0)
+
+  def test_voltage_restored_on_error(self):
+    """
+    calc_max_power_pt puts the collector voltage back if the efficiency raises.
+    """
+    tec = TECBase({"Emitter":self.em, "Collector":self.co})
+    def fail():
+      raise ArithmeticError
+    tec.calc_total_efficiency = fail
+    self.assertRaises(ArithmeticError, tec.calc_max_power_pt)
+    self.assertEqual(tec["Collector"]["voltage"], 0)
+
+
+class VectorizedMaxPowerPt(unittest.TestCase):
+  """
+  Functionality of max_power_pt.
+  """
+  def setUp(self):
+    """
+    Set up arrays of random devices in SI units, some with NEA or a cold collector.
+    """
+    rng = np.random.RandomState(0)
+    num = 40
+    self.em = {"temp":rng.uniform(500, 2000, num),
+               "barrier":rng.uniform(0.5, 3, num) * physical_constants["electron_charge"],
+               "richardson":1e5,
+               "nea":rng.uniform(0, 0.5, num) * physical_constants["electron_charge"] * (rng.rand(num) < 0.5)}
+    self.co = {"temp":np.where(rng.rand(num) < 0.1, 0, rng.uniform(20, 900, num)),
+               "barrier":rng.uniform(0.2, 2.5, num) * physical_constants["electron_charge"],
+               "richardson":1e5,
+               "nea":rng.uniform(0, 0.8, num) * physical_constants["electron_charge"] * (rng.rand(num) < 0.5)}
+
+  def test_matches_numeric(self):
+    """
+    max_power_pt closed form power is at least that found numerically.
+    """
+    analytic = max_power_pt(self.em, self.co)
+    numeric = max_power_pt(self.em, self.co, numeric=True)
+    self.assertTrue(np.all(analytic["output_power_density"] >= \
+      numeric["output_power_density"] * (1 - 1e-9)))
+
+  def test_matches_tecbase(self):
+    """
+    max_power_pt matches TECBase.calc_max_power_pt device by device.
+    """
+    del self.em["nea"], self.co["nea"]
+    analytic = max_power_pt(self.em, self.co)
+    for indx in range(5):
+      em = {"temp":self.em["temp"][indx], "voltage":0, "position":0, "emissivity":0.5,
+            "barrier":self.em["barrier"][indx]/physical_constants["electron_charge"],
+            "richardson":10}
+      co = {"temp":self.co["temp"][indx], "voltage":0, "position":10, "emissivity":0.5,
+            "barrier":self.co["barrier"][indx]/physical_constants["electron_charge"],
+            "richardson":10}
+      tec = TECBase({"Emitter":em, "Collector":co})
+      # Electrode converts eV with a slightly different charge than physical_constants.
+      self.assertAlmostEqual(tec.calc_max_power_pt()["output_voltage"], \
+        analytic["output_voltage"][indx], places=5)
+
+  def test_shape(self):
+    """
+    max_power_pt broadcasts its inputs.
+    """
+    em = dict(self.em, temp=self.em["temp"] * np.ones((3,1)))
+    result = max_power_pt(em, self.co)
+    self.assertEqual(result["output_voltage"].shape, (3, 40))
+
+
+class SpaceChargeMaxPowerPt(MaxPowerPtTestBase):
+  """
+  Functionality of Langmuir.calc_max_power_pt and NEAC.calc_max_power_pt.
+  """
+  def test_matches_jv_curve(self):
+    """
+    calc_max_power_pt is at least the maximum power of a dense J-V curve.
+    """
+    tecs = [Langmuir({"Emitter":self.em, "Collector":self.co}),
+            Langmuir({"Emitter":self.em, "Collector":dict(self.co, position=1)}),
+            NEAC({"Emitter":dict(self.em, nea=0.5), "Collector":dict(self.co, nea=0.5)}),
+            NEAC({"Emitter":dict(self.em, nea=0.5), \
+                  "Collector":dict(self.co, nea=0.5, position=0.1)})]
+    for tec in tecs:
+      jv = tec.calc_jv_curve(num_points=2000)
+      power = jv["output_voltage"] * jv["output_current_density"]
+      max_power_pt = tec.calc_max_power_pt()
+      self.assertGreaterEqual(max_power_pt["output_power_density"]/power.max(), 1 - 1e-6)
+      self.assertAlmostEqual(max_power_pt["output_voltage"], \
+        jv["output_voltage"][power.argmax()], places=3)
+
+  def test_efficiency(self):
+    """
+    calc_max_power_pt total_efficiency is that of the object at that voltage.
+    """
+    tec = Langmuir({"Emitter":self.em, "Collector":self.co})
+    max_power_pt = tec.calc_max_power_pt()
+    tec["Collector"]["voltage"] = max_power_pt["output_voltage"]
+    self.assertAlmostEqual(max_power_pt["total_efficiency"], tec.calc_total_efficiency())
+
+  def test_lookups(self):
+    """
+    locate_max_power_pt needs at most 24 lookups of the Poisson solution in space charge limited mode.
+    """
+    for position in [10, 1]:
+      tec = Langmuir({"Emitter":self.em, "Collector":dict(self.co, position=position)})
+      tec.get_mode_boundaries()
+      dps = CountingDPS(tec["motive_data"]["dps"])
+      tec["motive_data"]["dps"] = dps
+      tec.locate_max_power_pt()
+      self.assertTrue(0 < dps.lookups <= 24)
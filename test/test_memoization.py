@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the memoization of derived quantities and how changes reach it.
+"""
+
+from tec import TECBase, Electrode
+from tec.models import Langmuir
+from counting import CountingTEC, CountingLangmuir
+import scratch_cache
+import unittest
+import numpy as np
+
+class MemoizationTestBase(unittest.TestCase):
+  """
+  Base class providing device parameters.
+  """
+  def setUp(self):
+    """
+    Set up parameters of a device with positive output power.
+    """
+    self.em = {"temp":1000, "barrier":1, "voltage":0, "position":0,
+               "richardson":10, "emissivity":0.5}
+    self.co = {"temp":300, "barrier":0.8, "voltage":0.1, "position":10,
+               "richardson":10, "emissivity":0.5}
+
+  def fresh(self, tec_class=TECBase):
+    """
+    Return a newly instantiated object with the current parameters.
+    """
+    return tec_class({"Emitter":dict(self.em), "Collector":dict(self.co)})
+
+
+class CalculatedOnce(MemoizationTestBase):
+  """
+  Each quantity is calculated once per state.
+  """
+  def test_total_efficiency(self):
+    """
+    A second efficiency query does no calculation.
+    """
+    tec = self.fresh(CountingTEC)
+    efficiency = tec.calc_total_efficiency()
+    # At most twice each for the forward and back current densities and the electronic heat transport.
+    self.assertTrue(0 < tec.calls <= 6)
+    tec.calls = 0
+    self.assertEqual(tec.calc_total_efficiency(), efficiency)
+    tec.calc_output_power_density()
+    tec.calc_electronic_efficiency()
+    self.assertEqual(tec.calls, 0)
+
+  def test_emissivity(self):
+    """
+    Setting emissivity keeps the current densities but not the efficiency.
+    """
+    tec = self.fresh(CountingTEC)
+    tec.calc_total_efficiency()
+    tec.calls = 0
+    tec["Collector"]["emissivity"] = 0.2
+    self.co["emissivity"] = 0.2
+    self.assertEqual(tec.calc_total_efficiency(), self.fresh().calc_total_efficiency())
+    self.assertEqual(tec.calls, 0)
+
+  def test_saturation_current_density(self):
+    """
+    Electrode memoizes its saturation current density until it changes.
+    """
+    El = Electrode(dict(self.em))
+    El.calc_saturation_current_density()
+    self.assertTrue("calc_saturation_current_density" in El.derived)
+    El["voltage"] = 1
+    self.assertTrue("calc_saturation_current_density" in El.derived)
+    El["temp"] = 1200
+    self.assertFalse("calc_saturation_current_density" in El.derived)
+    self.em["temp"] = 1200
+    self.assertEqual(El.calc_saturation_current_density(), \
+      Electrode(dict(self.em)).calc_saturation_current_density())
+
+
+class Invalidation(MemoizationTestBase):
+  """
+  Memoized values follow parameter changes.
+  """
+  def compare(self, tec_class):
+    """
+    Change parameters one at a time and compare against a fresh object.
+    """
+    tec = self.fresh(tec_class)
+    methods = ["calc_forward_current_density", "calc_back_current_density",
+               "calc_output_current_density", "calc_output_power_density",
+               "calc_radiation_efficiency", "calc_electronic_efficiency",
+               "calc_total_efficiency"]
+    changes = [("Collector", "voltage", 0.3), ("Emitter", "temp", 1200),
+               ("Collector", "barrier", 0.9), ("Emitter", "emissivity", 0.8),
+               ("Collector", "position", 20)]
+    for el, key, value in changes:
+      for method in methods:
+        getattr(tec, method)()
+      tec[el][key] = value
+      (self.em if el == "Emitter" else self.co)[key] = value
+      expected = self.fresh(tec_class)
+      for method in methods:
+        self.assertEqual(getattr(tec, method)(), getattr(expected, method)())
+
+  def test_tecbase(self):
+    """
+    TECBase values match those of a fresh object after each change.
+    """
+    self.compare(TECBase)
+
+  def test_langmuir(self):
+    """
+    Langmuir values match those of a fresh object after each change.
+    """
+    self.compare(Langmuir)
+
+  def test_sweep(self):
+    """
+    The values after a sweep are those of the restored parameters.
+    """
+    tec = self.fresh()
+    expected = tec.calc_output_power_density()
+    tec.calc_sweep({"Collector":{"voltage":np.linspace(0, 0.5, 5)}})
+    self.assertEqual(tec.calc_output_power_density(), expected)
+
+  def test_max_value(self):
+    """
+    Maximizing with max_value leaves the memoized value of the restored state.
+    """
+    tec = self.fresh()
+    expected = tec.calc_output_power_density()
+    tec.calc_output_power_density("max")
+    self.assertEqual(tec.calc_output_power_density(), expected)
+
+  def test_replace_electrode(self):
+    """
+    Replacing an Electrode discards the memoized values.
+    """
+    tec = self.fresh()
+    tec.calc_forward_current_density()
+    tec["Emitter"] = dict(self.em, temp=1200)
+    self.assertEqual(len(tec.derived), 0)
+
+  def test_other_electrode_kept(self):
+    """
+    A Collector voltage change keeps the values memoized by the Emitter.
+    """
+    for tec_class in [TECBase, Langmuir]:
+      tec = self.fresh(tec_class)
+      tec.calc_total_efficiency()
+      saturation_current_density = tec["Emitter"].derived["calc_saturation_current_density"]
+      tec["Collector"]["voltage"] = 0.3
+      tec.calc_total_efficiency()
+      self.assertIs(tec["Emitter"].derived["calc_saturation_current_density"], \
+        saturation_current_density)
+      self.assertIn("calc_motive_bc", tec["Emitter"].derived)
+
+  def test_removed_nea(self):
+    """
+    Removing an nea set on a Langmuir Electrode discards the values memoized with it.
+    """
+    self.co["voltage"] = 1.0
+    tec = self.fresh(Langmuir)
+    tec["Collector"]["nea"] = 0.3
+    tec["Collector"].calc_motive_bc()
+    tec["Collector"]["temp"] = 310
+    self.co["temp"] = 310
+    self.assertEqual(tec.calc_output_current_density(), \
+      self.fresh(Langmuir).calc_output_current_density())
+
+  def test_calc_motive(self):
+    """
+    calc_motive discards the values memoized with the previous backend.
+    """
+    tec = self.fresh(Langmuir)
+    tec.calc_output_power_density()
+    tec.dps_backend = "kleynen"
+    tec.calc_motive()
+    expected = self.fresh(Langmuir)
+    expected.dps_backend = "kleynen"
+    expected.calc_motive()
+    self.assertEqual(tec.calc_output_power_density(), expected.calc_output_power_density())
+
+
+class PushedChanges(MemoizationTestBase):
+  """
+  Electrodes tell their owner about changes instead of being polled.
+  """
+  def test_owner(self):
+    """
+    The Electrodes of an object have it as their owner.
+    """
+    tec = self.fresh()
+    self.assertTrue(tec["Emitter"].owner is tec)
+    self.assertTrue(tec["Collector"].owner is tec)
+    self.assertTrue(Electrode(dict(self.em)).owner is None)
+
+  def test_flag(self):
+    """
+    Setting a parameter sets params_changed until the change is collected.
+    """
+    tec = self.fresh()
+    self.assertFalse(tec.params_changed)
+    tec["Collector"]["voltage"] = 0.3
+    self.assertTrue(tec.params_changed)
+    tec["motive_data"]
+    self.assertFalse(tec.params_changed)
+    tec["Emitter"]["emissivity"] = 0.3
+    self.assertTrue(tec.params_changed)
+
+  def test_clean_reads_do_not_poll(self):
+    """
+    Reads of a clean object do not ask the Electrodes for their changes.
+    """
+    tec = self.fresh(Langmuir)
+    calls = []
+    for el in ["Emitter", "Collector"]:
+      El = tec[el]
+      El.changed_params_and_reset = lambda params=Electrode.motive_params, El=El: \
+        calls.append(El) or Electrode.changed_params_and_reset(El, params)
+    tec.calc_total_efficiency()
+    self.assertEqual(calls, [])
+    tec["Collector"]["voltage"] = 0.3
+    tec.calc_total_efficiency()
+    self.assertEqual(len(calls), 2)
+
+
+class AtomicUpdate(MemoizationTestBase):
+  """
+  Several parameters are updated at once.
+  """
+  def test_single_update_motive(self):
+    """
+    An update of several parameters calls update_motive once.
+    """
+    tec = self.fresh(CountingLangmuir)
+    tec.update({"Emitter":{"temp":1200}, "Collector":{"voltage":0.3, "position":5}})
+    self.em["temp"] = 1200
+    self.co.update({"voltage":0.3, "position":5})
+    self.assertEqual(tec.calc_output_current_density(), \
+      self.fresh(Langmuir).calc_output_current_density())
+    self.assertEqual(tec.calls, 1)
+
+  def test_rollback(self):
+    """
+    If any value fails its constraints nothing is set.
+    """
+    tec = self.fresh()
+    saved = dict((el, dict(tec[el])) for el in ["Emitter", "Collector"])
+    self.assertRaises(ValueError, tec.update, \
+      {"Emitter":{"temp":1200}, "Collector":{"voltage":0.3, "emissivity":2}})
+    self.assertRaises(TypeError, tec.update, {"Collector":{"voltage":"a"}})
+    self.assertRaises(KeyError, tec.update, {"motive_data":{}})
+    for el in ["Emitter", "Collector"]:
+      self.assertEqual(dict(tec[el]), saved[el])
+    self.assertFalse(tec.params_changed)
+
+  def test_electrode(self):
+    """
+    Electrode.update checks every value before setting any.
+    """
+    El = Electrode(dict(self.em))
+    self.assertRaises(ValueError, El.update, {"voltage":1, "temp":-1})
+    self.assertEqual(El["voltage"], 0)
+    El.update({"voltage":1, "barrier":2})
+    self.assertEqual(El.changed_params_and_reset(), set(["voltage", "barrier"]))
+    self.assertEqual(El["barrier"], Electrode(dict(self.em, barrier=2))["barrier"])
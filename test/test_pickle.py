@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests pickling of Electrode and TEC objects.
+"""
+
+from tec import TECBase, Electrode
+from tec.models import Langmuir, NEAC, get_shared_dps
+import scratch_cache
+import unittest
+import pickle
+
+class PickleTestBase(unittest.TestCase):
+  """
+  Base class providing device parameters.
+  """
+  def setUp(self):
+    """
+    Set up the parameters of a device.
+    """
+    self.em = {"temp":1000, "barrier":1, "voltage":0, "position":0,
+               "richardson":10, "emissivity":0.5}
+    self.co = {"temp":300, "barrier":0.8, "voltage":0.1, "position":10,
+               "richardson":10, "emissivity":0.5, "nea":0.2}
+
+  def roundtrip(self, obj, protocol):
+    """
+    Return the pickled size of obj and the unpickled copy.
+    """
+    data = pickle.dumps(obj, protocol)
+    return len(data), pickle.loads(data)
+
+
+class RoundTrip(PickleTestBase):
+  """
+  Unpickled objects behave like the originals.
+  """
+  def test_electrode(self):
+    """
+    An Electrode keeps its parameters and drops its owner.
+    """
+    tec = TECBase({"Emitter":self.em, "Collector":self.co})
+    for protocol in [0, 2]:
+      size, El = self.roundtrip(tec["Collector"], protocol)
+      self.assertEqual(dict(El), dict(tec["Collector"]))
+      self.assertTrue(El.owner is None)
+      El["voltage"] = 0.3
+      self.assertEqual(El.changed_params_and_reset(), set(["voltage"]))
+
+  def test_models(self):
+    """
+    TECBase, Langmuir and NEAC objects give the same results after unpickling.
+    """
+    for model in [TECBase, Langmuir, NEAC]:
+      tec = model({"Emitter":dict(self.em), "Collector":dict(self.co)})
+      tec.calc_total_efficiency()
+      for protocol in [0, 2]:
+        size, copy = self.roundtrip(tec, protocol)
+        self.assertTrue(isinstance(copy, model))
+        self.assertEqual(dict(copy["Emitter"]), dict(tec["Emitter"]))
+        self.assertEqual(dict(copy["Collector"]), dict(tec["Collector"]))
+        self.assertEqual(copy.calc_total_efficiency(), tec.calc_total_efficiency())
+        self.assertTrue(copy["Emitter"].owner is copy)
+        copy["Collector"]["voltage"] = 0.3
+        tec["Collector"]["voltage"] = 0.3
+        self.assertEqual(copy.calc_output_current_density(), tec.calc_output_current_density())
+        tec["Collector"]["voltage"] = 0.1
+
+  def test_pending_change(self):
+    """
+    A change made just before pickling is reflected in the copy.
+    """
+    tec = Langmuir({"Emitter":self.em, "Collector":self.co})
+    tec.get_max_motive_ht()
+    tec["Collector"]["voltage"] = 0.3
+    size, copy = self.roundtrip(tec, 2)
+    self.assertEqual(copy.get_max_motive_ht(), tec.get_max_motive_ht())
+
+  def test_settings(self):
+    """
+    Settings made on the object are kept and the rootfinder bookkeeping starts afresh.
+    """
+    tec = NEAC({"Emitter":self.em, "Collector":self.co})
+    tec.root_finder = "newton"
+    tec.dps_backend = "quad"
+    tec.calc_motive()
+    tec.calc_sweep({"Collector":{"voltage":[0.2, 0.3]}})
+    size, copy = self.roundtrip(tec, 2)
+    self.assertEqual(copy.root_finder, "newton")
+    self.assertEqual(copy.dps_backend, "quad")
+    self.assertEqual(copy.root_guesses, {})
+    self.assertEqual(copy.root_history, {})
+    self.assertEqual(copy.sweep_step, 0)
+    self.assertEqual(copy.get_max_motive_ht(), tec.get_max_motive_ht())
+
+
+class Compact(PickleTestBase):
+  """
+  Pickles hold little more than the Electrode parameters.
+  """
+  def test_size(self):
+    """
+    A pickled NEAC object takes less than 2 kB.
+    """
+    tec = NEAC({"Emitter":self.em, "Collector":self.co})
+    tec.calc_total_efficiency()
+    tec.get_motive(1e-6)
+    size, copy = self.roundtrip(tec, 2)
+    self.assertTrue(size < 2000)
+
+  def test_state(self):
+    """
+    Only the settings made on the object are pickled besides the Electrode parameters.
+    """
+    tec = Langmuir({"Emitter":self.em, "Collector":self.co})
+    tec.calc_total_efficiency()
+    self.assertEqual(tec.__reduce__()[2], {})
+    tec.root_finder = "newton"
+    self.assertEqual(tec.__reduce__()[2], {"root_finder":"newton"})
+
+  def test_shared_dps(self):
+    """
+    No motive_data is pickled; the copy recalculates it and uses the shared Poisson solution.
+    """
+    tec = Langmuir({"Emitter":self.em, "Collector":self.co})
+    tec.calc_output_current_density()
+    size, copy = self.roundtrip(tec, 2)
+    self.assertEqual(dict(copy["motive_data"]), {})
+    self.assertEqual(copy.calc_output_current_density(), tec.calc_output_current_density())
+    self.assertTrue(copy["motive_data"]["dps"] is get_shared_dps())
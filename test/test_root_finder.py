@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the derivative based rootfinding of the Langmuir and NEAC models.
+"""
+
+from tec.models import Langmuir, NEAC
+from tec.models.langmuir import get_shared_dps
+from tec.models.roots import newton
+import scratch_cache
+import unittest
+import numpy as np
+
+class RootFinderTestBase(unittest.TestCase):
+  """
+  Base class providing Langmuir and NEAC objects in space charge limited mode.
+  """
+  def setUp(self):
+    """
+    Set up input parameters of a Langmuir device and a NEAC device outside the spclmbs.
+    """
+    em = {"temp":1000,"barrier":1.0,"voltage":0,"position":0,\
+          "richardson":10,"emissivity":0.5}
+    co = {"temp":300,"barrier":0.8,"voltage":0,"position":10,\
+          "richardson":10,"emissivity":0.5}
+    self.params = [(Langmuir, {"Emitter":em, "Collector":co}, "critical_pt"),
+                   (NEAC, {"Emitter":dict(em, nea=0.5), "Collector":dict(co, nea=0.5)}, \
+                    "virt_critical_pt")]
+
+  def make(self, cls, params, root_finder):
+    """
+    Return an object using the given rootfinder.
+    """
+    tec = cls(params)
+    tec.root_finder = root_finder
+    return tec
+
+
+class NewtonMatchesBrentq(RootFinderTestBase):
+  """
+  root_finder "newton" gives the same results as "brentq".
+  """
+  def test_motive_data(self):
+    """
+    Mode boundaries and max motive agree.
+    """
+    for cls, params, crit_key in self.params:
+      brentq_tec = self.make(cls, params, "brentq")
+      newton_tec = self.make(cls, params, "newton")
+      self.assertAlmostEqual(newton_tec["motive_data"][crit_key]["output_current_density"]/ \
+        brentq_tec["motive_data"][crit_key]["output_current_density"], 1, places=10)
+      self.assertAlmostEqual(newton_tec["motive_data"]["max_motive_ht"]/ \
+        brentq_tec["motive_data"]["max_motive_ht"], 1, places=12)
+
+  def test_iterations_recorded(self):
+    """
+    Both rootfinders record their iteration counts.
+    """
+    for root_finder in ["brentq", "newton"]:
+      for cls, params, crit_key in self.params:
+        tec = self.make(cls, params, root_finder)
+        tec.get_max_motive_ht()
+        self.assertGreater(tec.root_iterations[crit_key], 0)
+        self.assertGreater(tec.root_iterations["max_motive_ht"], 0)
+
+  def test_bad_root_finder(self):
+    """
+    An unknown root_finder raises ValueError.
+    """
+    cls, params, crit_key = self.params[0]
+    tec = self.make(cls, params, "secant")
+    self.assertRaises(ValueError, tec.get_max_motive_ht)
+
+
+class WarmStart(RootFinderTestBase):
+  """
+  Newton's method starts from the previous solution.
+  """
+  def test_fewer_iterations(self):
+    """
+    A small voltage step takes fewer iterations than a cold start.
+    """
+    for cls, params, crit_key in self.params:
+      tec = self.make(cls, params, "newton")
+      tec.get_max_motive_ht()
+      cold = tec.root_iterations["max_motive_ht"]
+      tec["Collector"]["voltage"] = 0.01
+      tec.get_max_motive_ht()
+      self.assertLess(tec.root_iterations["max_motive_ht"], cold)
+      self.assertLessEqual(tec.root_iterations["max_motive_ht"], 4)
+
+  def test_guess_outside_bracket(self):
+    """
+    A guess outside the bracket is ignored.
+    """
+    for cls, params, crit_key in self.params:
+      tec = self.make(cls, params, "newton")
+      tec.root_guesses["max_motive_ht"] = 1e3
+      expected = self.make(cls, params, "brentq")["motive_data"]["max_motive_ht"]
+      self.assertAlmostEqual(tec.get_max_motive_ht()/expected, 1, places=12)
+
+
+class Newton(unittest.TestCase):
+  """
+  Functionality of the safeguarded Newton's method.
+  """
+  def test_root(self):
+    """
+    newton finds the root of an increasing function.
+    """
+    root, iterations = newton(lambda x: (x**3 - 2, 3*x**2), 0, 10)
+    self.assertAlmostEqual(root, 2**(1./3), places=12)
+
+  def test_decreasing_infinite_bracket(self):
+    """
+    newton finds the root of a decreasing function with an infinite end of the bracket.
+    """
+    root, iterations = newton(lambda x: (np.exp(-x) - 1e-6, -np.exp(-x)), 0, np.inf)
+    self.assertAlmostEqual(root, np.log(1e6), places=10)
+
+  def test_safeguard(self):
+    """
+    newton converges where the unguarded iteration would cycle.
+    """
+    root, iterations = newton(lambda x: (np.arctan(x), 1/(1 + x**2)), -2, 20, x0=10)
+    self.assertAlmostEqual(root, 0, places=12)
+
+
+class Derivatives(unittest.TestCase):
+  """
+  The field and position slope of the dimensionless Poisson's equation solution.
+  """
+  def setUp(self):
+    self.dps = get_shared_dps()
+
+  def test_field(self):
+    """
+    get_field matches the finite difference derivative of get_motive.
+    """
+    for branch in ["lhs", "rhs"]:
+      for motive in [0.5, 3.0]:
+        position = self.dps.get_position(motive, branch)
+        diff = (self.dps.get_motive(position + 1e-6) - self.dps.get_motive(position - 1e-6))/2e-6
+        self.assertAlmostEqual(self.dps.get_field(motive, branch)/diff, 1, places=3)
+
+  def test_slope_at_origin(self):
+    """
+    get_position_slope is -2 on the lhs and 2 on the rhs at the origin.
+    """
+    self.assertEqual(self.dps.get_position_slope(0, "lhs"), -2)
+    self.assertEqual(self.dps.get_position_slope(0, "rhs"), 2)
+
+  def test_series_continuous(self):
+    """
+    get_field is continuous where it switches to the series.
+    """
+    motive = np.array([1e-4 * (1 - 1e-9), 1e-4])
+    for branch in ["lhs", "rhs"]:
+      field = self.dps.get_field(motive, branch)
+      self.assertAlmostEqual(field[0]/field[1], 1, places=8)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests the parameter sweep helper calc_sweep.
+"""
+
+from tec import TECBase
+from tec.models import Langmuir, NEAC
+import scratch_cache
+import unittest
+import numpy as np
+
+class SweepTestBase(unittest.TestCase):
+  """
+  Base class providing electrode input parameters.
+  """
+  def setUp(self):
+    """
+    Set up emitter and collector input parameters.
+    """
+    self.em = {"temp":1400,"barrier":2.0,"voltage":0,"position":0,\
+               "richardson":60,"emissivity":0.5}
+    self.co = {"temp":400,"barrier":0.8,"voltage":0,"position":20,\
+               "richardson":10,"emissivity":0.3}
+
+
+class TECBaseSweep(SweepTestBase):
+  """
+  Functionality of TECBase.calc_sweep.
+  """
+  def test_matches_pointwise(self):
+    """
+    calc_sweep matches setting each point by hand.
+    """
+    tec = TECBase({"Emitter":self.em, "Collector":self.co})
+    voltages = np.linspace(-0.5, 1.5, 7)
+    sweep = tec.calc_sweep({"Collector":{"voltage":voltages}}, ["calc_total_efficiency"])
+    for voltage, efficiency in zip(voltages, sweep["calc_total_efficiency"]):
+      point = TECBase({"Emitter":self.em, "Collector":dict(self.co, voltage=voltage)})
+      expected = point.calc_total_efficiency()
+      if np.isnan(expected):
+        self.assertTrue(np.isnan(efficiency))
+      else:
+        self.assertAlmostEqual(efficiency, expected)
+
+  def test_object_unchanged(self):
+    """
+    calc_sweep puts the swept parameters back.
+    """
+    tec = TECBase({"Emitter":self.em, "Collector":self.co})
+    saved = dict(tec["Emitter"])
+    current = tec.calc_output_current_density()
+    tec.calc_sweep({"Emitter":{"barrier":[1.5, 1.7], "temp":1200}})
+    self.assertEqual(dict(tec["Emitter"]), saved)
+    self.assertEqual(tec.calc_output_current_density(), current)
+
+  def test_shape(self):
+    """
+    calc_sweep broadcasts the path.
+    """
+    tec = TECBase({"Emitter":self.em, "Collector":self.co})
+    sweep = tec.calc_sweep({"Emitter":{"temp":[[1000], [1200]]}, "Collector":{"voltage":[0, 0.5, 1]}})
+    self.assertEqual(sweep["calc_output_current_density"].shape, (2, 3))
+
+
+class ContinuationSweep(SweepTestBase):
+  """
+  Functionality of Langmuir.calc_sweep and NEAC.calc_sweep.
+  """
+  def make_tecs(self):
+    """
+    Return a Langmuir object and a NEAC object.
+    """
+    return [Langmuir({"Emitter":self.em, "Collector":self.co}),
+            NEAC({"Emitter":dict(self.em, nea=0.1), "Collector":dict(self.co, nea=0.3)})]
+
+  def test_matches_brentq(self):
+    """
+    Continuation matches sweeping without it, across all three modes.
+    """
+    paths = [{"Collector":{"voltage":np.linspace(-4, 3, 40)}},
+             {"Collector":{"position":np.linspace(1, 50, 40), "voltage":0.5}}]
+    for tec in self.make_tecs():
+      for path in paths:
+        quantities = ["calc_output_current_density", "get_max_motive_ht"]
+        continued = tec.calc_sweep(path, quantities)
+        cold = tec.calc_sweep(path, quantities, continuation=False)
+        for name in quantities:
+          self.assertTrue(np.allclose(continued[name], cold[name], rtol=1e-10, atol=0))
+
+  def test_few_iterations(self):
+    """
+    Continuation takes few iterations per step of a smooth sweep.
+    """
+    for tec in self.make_tecs():
+      sat_pt, crit_pt = tec.get_mode_boundaries()
+      voltages = np.linspace(sat_pt["output_voltage"], crit_pt["output_voltage"], 50)[10:40]
+      tec.calc_sweep({"Collector":{"voltage":voltages}})
+      continued = tec.root_iterations["max_motive_ht"]
+
+      tec["Collector"]["voltage"] = voltages[-1]
+      tec.root_finder = "newton"
+      tec.root_guesses = {}
+      tec.get_max_motive_ht()
+      self.assertLess(continued, tec.root_iterations["max_motive_ht"])
+      self.assertLessEqual(continued, 4)
+
+  def test_disjoint_sweeps(self):
+    """
+    A second sweep over a disjoint range matches the same sweep on a fresh object.
+    """
+    quantities = ["calc_output_current_density", "get_max_motive_ht"]
+    for tec, fresh in zip(self.make_tecs(), self.make_tecs()):
+      tec.calc_sweep({"Collector":{"voltage":np.linspace(-4, -1, 20)}}, quantities)
+      path = {"Collector":{"voltage":np.linspace(0, 3, 20)}}
+      second = tec.calc_sweep(path, quantities)
+      expected = fresh.calc_sweep(path, quantities)
+      for name in quantities:
+        self.assertTrue(np.array_equal(second[name], expected[name]))
+      self.assertEqual(tec.root_iterations, fresh.root_iterations)
+
+  def test_root_finder_restored(self):
+    """
+    calc_sweep leaves the root_finder attribute as it was.
+    """
+    tec = self.make_tecs()[0]
+    tec.calc_sweep({"Collector":{"voltage":[0, 0.1]}})
+    self.assertEqual(tec.root_finder, "brentq")
+    self.assertNotIn("root_finder", tec.__dict__)
@@ -17,6 +17,7 @@ __license__ = ""
 
 from tec import TEC_Langmuir
 from scipy import interpolate
+import scratch_cache
 import unittest
 
 class CalculatorsReturnType(unittest.TestCase):
@@ -12,6 +12,7 @@ __copyright__ = "Copyright (c) 2013 Joshua Ryan Smith"
 __license__ = ""
 
 from tec import TEC_Langmuir
+import scratch_cache
 import unittest
 import pickle
 import copy